@@ -1,7 +1,16 @@
+from functools import partial
+
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from nba_api.stats.endpoints import leaguegamefinder, leaguestandings, playercareerstats, playergamelog
+from utils.api import get_data_frames
+from utils.sync import get_player_game_log
+from utils.players import hornets_players
+from utils import games as games_store
+from utils import form, standings
+from utils.fetch import fetch_all
+from utils.debug_panel import show_debug_panel
+from utils.instrumentation import instrument
 
 # Configuração da página
 st.set_page_config(
@@ -23,17 +32,17 @@ with st.expander("Saiba mais"):
              Os Hornets competem na National Basketball Association (NBA) como um membro da Divisão Sudeste da Conferência Leste.''')
 
 # Função para buscar estatísticas de jogos por temporada
-def get_team_stats(team_id, season):
+@instrument()
+def get_team_stats(team_abbreviation, season):
     try:
-        gamefinder = leaguegamefinder.LeagueGameFinder(team_id_nullable=team_id, season_nullable=season)
-        games = gamefinder.get_data_frames()[0]
+        games = games_store.get_team_games(team_abbreviation, season)
         
         total_wins = (games['WL'] == 'W').sum()
         total_losses = (games['WL'] == 'L').sum()
-        home_wins = ((games['WL'] == 'W') & (games['MATCHUP'].str.contains('vs'))).sum()
-        away_wins = ((games['WL'] == 'W') & (games['MATCHUP'].str.contains('@'))).sum()
-        home_losses = ((games['WL'] == 'L') & (games['MATCHUP'].str.contains('vs'))).sum()
-        away_losses = ((games['WL'] == 'L') & (games['MATCHUP'].str.contains('@'))).sum()
+        home_wins = ((games['WL'] == 'W') & games['IS_HOME']).sum()
+        away_wins = ((games['WL'] == 'W') & ~games['IS_HOME']).sum()
+        home_losses = ((games['WL'] == 'L') & games['IS_HOME']).sum()
+        away_losses = ((games['WL'] == 'L') & ~games['IS_HOME']).sum()
         
         return {
             "Total Vitórias": total_wins,
@@ -48,26 +57,51 @@ def get_team_stats(team_id, season):
         return {}
 
 # Função para obter a classificação atual do Charlotte Hornets
-def get_team_standings(team_id):
+@instrument()
+def get_team_standings(team_abbreviation, season):
     try:
-        standings = leaguestandings.LeagueStandings().get_data_frames()[0]
-        team_standings = standings[standings['TeamID'] == team_id]
+        team_standings = standings.get_team_standings(team_abbreviation, season)
 
-        if team_standings.empty:
+        if team_standings is None:
             st.warning("Dados de classificação não encontrados para o Charlotte Hornets.")
             return None
 
-        return team_standings.iloc[0]
+        return team_standings
     except Exception as e:
         st.error(f"Erro ao buscar a classificação: {e}")
         return None
 
-# ID do Charlotte Hornets (Corrigido para inteiro)
-charlotte_hornets_id = 1610612766
+# Função para obter a forma recente (sequências e últimos 10 jogos) do Charlotte Hornets
+@instrument()
+def get_team_form_summary(team_abbreviation, season):
+    try:
+        summary = form.get_form_summary(season)
+        if team_abbreviation not in summary.index:
+            return None
+        return summary.loc[team_abbreviation]
+    except Exception as e:
+        st.error(f"Erro ao calcular a forma recente: {e}")
+        return None
+
+# Sigla do Charlotte Hornets
+charlotte_hornets_abbreviation = "CHA"
+
+# Dicionário associando IDs aos nomes (em ordem de ID)
+player_info = {player_id: name for name, player_id in sorted(hornets_players.items(), key=lambda item: item[1])}
 
 # Coletar dados da temporada 2024-25
 season = "2024-25"
-stats = get_team_stats(charlotte_hornets_id, season)
+
+# Buscar em paralelo todos os dados independentes da página; os jogos da
+# temporada (e a classificação calculada a partir deles) ficam em memória
+# e são lidos pelas funções abaixo
+fetched = fetch_all({
+    "games": partial(standings.get_standings, season),
+    **{("career", player_id): partial(get_data_frames, "playercareerstats", player_id=player_id) for player_id in player_info},
+    **{("log", player_id): partial(get_player_game_log, player_id, "2023-24") for player_id in player_info},
+}, return_exceptions=True)
+
+stats = get_team_stats(charlotte_hornets_abbreviation, season)
 
 # Exibir métricas
 st.subheader("📊 Desempenho na Temporada 2024-25")
@@ -86,36 +120,43 @@ else:
 
 # Exibir a classificação atual do Charlotte Hornets
 st.subheader("🏆 Classificação Atual")
-team_standings = get_team_standings(charlotte_hornets_id)
+team_standings = get_team_standings(charlotte_hornets_abbreviation, season)
+team_form = get_team_form_summary(charlotte_hornets_abbreviation, season)
 
 if team_standings is not None:
     col1, col2 = st.columns([3, 1])
     with col1:
-        st.write(f"**Posição na Conferência Leste:** {team_standings.get('ConferenceRank', 'N/A')}")
+        st.write(f"**Posição na Conferência Leste:** {team_standings.get('Conference_Rank', 'N/A')}")
     with col2:
-        st.write(f"**Recorde:** {team_standings.get('WINS', 0)}-{team_standings.get('LOSSES', 0)}")
+        st.write(f"**Recorde:** {team_standings.get('Wins', 0)}-{team_standings.get('Losses', 0)}")
     
     col1, col2 = st.columns([3, 1])
     with col1:
-        st.write(f"**Porcentagem de Vitórias:** {team_standings.get('WinPCT', 0.0):.3f}")
+        st.write(f"**Porcentagem de Vitórias:** {team_standings.get('Win_Percentage', 0.0):.3f}")
     with col2:
-        st.write(f"**Últimos 10 Jogos:** {team_standings.get('L10', 'N/A')}")
+        st.write(f"**Últimos 10 Jogos:** {team_form['Last_10'] if team_form is not None else 'N/A'}")
+
+    if team_form is not None:
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            st.write(f"**Maiores Sequências:** {team_form['Longest_Win_Streak']} vitórias / {team_form['Longest_Loss_Streak']} derrotas")
+        with col2:
+            st.write(f"**Sequência Atual:** {team_form['Current_Streak']}")
 else:
     st.warning("Não foi possível obter a classificação atual do Charlotte Hornets.")
 
-# Dicionário associando IDs aos nomes
-player_info = {
-    1630163: "LaMelo Ball",
-    1631217: "Moussa Diabate",
-    1641706: "Brandon Miller"
-}
-
 # Lista para armazenar as estatísticas
 career_stats_list = []
 
 for player_id in player_info.keys():
-    # Obtendo estatísticas totais da carreira
-    career_stats = playercareerstats.PlayerCareerStats(player_id=player_id).get_data_frames()[0]
+    # Obtendo estatísticas totais da carreira (já buscadas em paralelo acima)
+    career_stats = fetched[("career", player_id)]
+    game_log = fetched[("log", player_id)]
+    if isinstance(career_stats, Exception) or isinstance(game_log, Exception):
+        error = career_stats if isinstance(career_stats, Exception) else game_log
+        st.error(f"Erro ao buscar dados de {player_info[player_id]}: {error}")
+        continue
+    career_stats = career_stats[0]
     career_totals = career_stats[career_stats["SEASON_ID"] == "Career"]
 
     if career_totals.empty:
@@ -123,14 +164,9 @@ for player_id in player_info.keys():
     else:
         career_totals = career_totals.iloc[0]
 
-    # Obtendo o log de jogos da temporada atual
-    game_log = playergamelog.PlayerGameLog(player_id=player_id, season="2023-24").get_data_frames()[0]
-
-    game_log["HOME"] = game_log["MATCHUP"].apply(lambda x: "Casa" if "vs." in x else "Fora")
-
     # Estatísticas separadas para casa e fora
-    casa_stats = game_log[game_log["HOME"] == "Casa"]
-    fora_stats = game_log[game_log["HOME"] == "Fora"]
+    casa_stats = game_log[game_log["IS_HOME"]]
+    fora_stats = game_log[~game_log["IS_HOME"]]
 
     # Calcular médias
     pts_casa_media = casa_stats["PTS"].mean() if len(casa_stats) > 0 else 0
@@ -178,4 +214,7 @@ fig = px.bar(df_career_stats,
              color="Jogador",  # Definir a variável de cor
              color_discrete_sequence=new_color_palette)  # Aplicando a nova paleta de cores
 
-st.plotly_chart(fig)
\ No newline at end of file
+st.plotly_chart(fig)
+
+# Painel de desempenho (com NBA_DEBUG_PANEL=1 ou ?debug=1 na URL)
+show_debug_panel()
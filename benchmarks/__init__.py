@@ -0,0 +1,4 @@
+"""Benchmarks das funções de dados e de modelos das páginas.
+
+Veja `benchmarks/run.py` para o uso.
+"""
@@ -0,0 +1,66 @@
+"""Dados dos benchmarks: os CSVs de `EDA/` e versões sintéticas ampliadas.
+
+As versões ampliadas repetem as linhas `scale` vezes, com `GAME_ID` novos
+(cada cópia vira um conjunto de jogos diferente) e as estatísticas de contagem
+perturbadas com um gerador de semente fixa, então os dados são sempre os
+mesmos entre execuções. As tabelas passam pela mesma normalização e pelo
+mesmo enriquecimento que a aplicação aplica aos dados do nba_api.
+"""
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from utils.enrich import enrich_games
+from utils.schema import normalize_games
+
+EDA_DIR = Path(__file__).resolve().parent.parent / "EDA"
+LEAGUE_GAMES_CSV = EDA_DIR / "all_nba_games_2023_2025.csv"
+PLAYER_GAMES_CSV = EDA_DIR / "jogos_charlotte_hornets.csv"
+
+SEED = 42
+
+# Colunas de contagem perturbadas nas cópias sintéticas
+JITTER_COLUMNS = ["PTS", "AST", "REB", "FGA", "TOV", "FG3M"]
+
+
+def _scale(frame, scale, game_id_column):
+    """Repete as linhas `scale` vezes com ids de jogo novos e contagens perturbadas."""
+    if scale == 1:
+        return frame
+    rng = np.random.default_rng(SEED)
+    copies = []
+    for copy in range(scale):
+        scaled = frame.copy()
+        # As duas linhas de um jogo continuam com o mesmo GAME_ID dentro de cada cópia
+        scaled[game_id_column] = f"{copy:03d}" + frame[game_id_column].astype(str)
+        if copy:
+            for column in JITTER_COLUMNS:
+                if column in scaled:
+                    noise = rng.integers(-2, 3, size=len(scaled))
+                    scaled[column] = (scaled[column] + noise).clip(lower=0)
+        copies.append(scaled)
+    return pd.concat(copies, ignore_index=True)
+
+
+@lru_cache(maxsize=None)
+def league_games(scale=1):
+    """Jogos da liga (um registro por time × jogo), normalizados e enriquecidos."""
+    games = pd.read_csv(LEAGUE_GAMES_CSV, dtype={"GAME_ID": str, "SEASON_ID": str})
+    games = _scale(games, scale, "GAME_ID")
+    return enrich_games(normalize_games(games))
+
+
+@lru_cache(maxsize=None)
+def player_games(scale=1):
+    """Logs de jogos dos jogadores do Charlotte Hornets, normalizados e enriquecidos."""
+    games = pd.read_csv(PLAYER_GAMES_CSV, dtype={"Game_ID": str, "SEASON_ID": str})
+    games = _scale(games, scale, "Game_ID")
+    return enrich_games(normalize_games(games), points_allowed=False)
+
+
+def team_games(scale=1, team_abbreviation="CHA"):
+    """Jogos de um time na tabela da liga."""
+    games = league_games(scale)
+    return games[games["TEAM_ABBREVIATION"] == team_abbreviation]
@@ -0,0 +1,191 @@
+"""Tempo de renderização de ponta a ponta de cada página, sem navegador.
+
+Cada página (`Charlotte❤️Hornets.py` e os arquivos de `pages/`) é executada
+com o `AppTest` do Streamlit, que roda o script inteiro e serializa os
+elementos como o servidor faria: a montagem das figuras do Plotly, a
+conversão dos DataFrames e das tabelas entram na medição, não só o pandas.
+O nba_api é trocado pelas cópias locais em CSV de `EDA/`
+(`NBA_DATA_SOURCE=snapshot`), então nenhuma requisição sai da máquina.
+
+Cada página roda em um interpretador novo, com os caches em um diretório
+temporário vazio:
+
+- **fria**: primeira execução, com importações, leitura dos CSVs e ajustes
+  dos modelos;
+- **quente**: novas execuções da mesma seleção, com tudo em cache;
+- **varredura**: cada opção das caixas de seleção de `SWEEP_LABELS` (todos
+  os times de `nba_teams`, todos os jogadores, temporadas e estatísticas)
+  é selecionada duas vezes: a primeira passada (fria para aquela opção) e a
+  segunda (quente) são reportadas separadamente.
+
+Uso:
+
+    python -m benchmarks.pages ["Jogos" ...] [--warm-runs 3] [--max-options N] [--no-sweep]
+
+Sem argumentos, mede todas as páginas; com argumentos, só as páginas cujo
+nome contém algum deles. O comando termina com erro se alguma execução
+levantar exceção.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+PAGES = [ROOT / "Charlotte❤️Hornets.py", *sorted((ROOT / "pages").glob("*.py"))]
+
+# Caixas de seleção varridas (pelo rótulo); as demais ficam no valor padrão
+SWEEP_LABELS = [
+    "Selecione um time:",
+    "Escolha um jogador",
+    "Selecione a Temporada",
+    "Selecione a temporada:",
+    "Selecione a estatística:",
+]
+
+
+def _option_values(selectbox):
+    """Valores das opções da caixa de seleção (o AppTest só conhece os textos exibidos)."""
+    from utils.teams import nba_teams
+
+    # As caixas de times exibem o nome e guardam a sigla
+    if selectbox.label == "Selecione um time:":
+        return list(nba_teams)
+    return list(selectbox.options)
+
+
+def _find_selectbox(app, label):
+    return next((selectbox for selectbox in app.selectbox if selectbox.label == label), None)
+
+
+def _timed_run(app, timeout):
+    """Executa a página; retorna `(segundos, exceções)`."""
+    start = time.perf_counter()
+    app.run(timeout=timeout)
+    return time.perf_counter() - start, [str(e.value) for e in app.exception]
+
+
+def render_page(page, warm_runs=3, sweep=True, max_options=None, timeout=600):
+    """Mede a página no interpretador atual; os caches devem estar vazios para a execução fria valer."""
+    from streamlit.testing.v1 import AppTest
+
+    sys.path.insert(0, str(ROOT))
+    app = AppTest.from_file(str(page), default_timeout=timeout)
+    report = {"page": page.name, "errors": []}
+
+    report["cold"], errors = _timed_run(app, timeout)
+    report["errors"] += errors
+    report["warm"] = []
+    for _ in range(warm_runs):
+        seconds, errors = _timed_run(app, timeout)
+        report["warm"].append(seconds)
+        report["errors"] += errors
+
+    report["sweeps"] = {}
+    labels = [label for label in SWEEP_LABELS if sweep and _find_selectbox(app, label) is not None]
+    for label in labels:
+        default = _find_selectbox(app, label).value
+        values = _option_values(_find_selectbox(app, label))[:max_options]
+        passes = {"cold": [], "warm": []}
+        for name in passes:
+            for value in values:
+                selectbox = _find_selectbox(app, label)
+                if selectbox is None:
+                    # Uma exceção na execução anterior interrompeu a página antes da caixa de seleção
+                    selectbox = _find_selectbox(app.run(timeout=timeout), label)
+                selectbox.set_value(value)
+                seconds, errors = _timed_run(app, timeout)
+                passes[name].append(seconds)
+                report["errors"] += [f"{label} = {value}: {error}" for error in errors]
+        report["sweeps"][label] = {"options": len(values), **passes}
+
+        # Volta ao valor padrão antes de varrer a próxima caixa de seleção
+        selectbox = _find_selectbox(app, label) or _find_selectbox(app.run(timeout=timeout), label)
+        if selectbox is not None:
+            selectbox.set_value(default).run(timeout=timeout)
+    return report
+
+
+def measure(page, warm_runs=3, sweep=True, max_options=None, timeout=600):
+    """Mede a página em um interpretador novo, com caches temporários e o nba_api trocado pelos CSVs."""
+    with tempfile.TemporaryDirectory(prefix="nba-pages-") as tmp:
+        env = {
+            **os.environ,
+            "NBA_DATA_SOURCE": "snapshot",
+            "NBA_CACHE_DIR": str(Path(tmp) / "nba_api"),
+            "NBA_STORE_DIR": str(Path(tmp) / "store"),
+            "NBA_MODELS_DIR": str(Path(tmp) / "models"),
+        }
+        args = [sys.executable, "-m", "benchmarks.pages", "--worker", str(page), "--warm-runs", str(warm_runs), "--timeout", str(timeout)]
+        if not sweep:
+            args.append("--no-sweep")
+        if max_options is not None:
+            args += ["--max-options", str(max_options)]
+        result = subprocess.run(args, cwd=ROOT, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "falha ao executar a página")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def _describe(seconds):
+    """Mediana e máximo, em texto (`-` se não houver medições)."""
+    if not seconds:
+        return "-"
+    return f"{np.median(seconds):6.2f}s / {max(seconds):6.2f}s"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mede o tempo de renderização de cada página.")
+    parser.add_argument("pages", nargs="*", help="trechos do nome das páginas a medir (padrão: todas)")
+    parser.add_argument("--warm-runs", type=int, default=3, help="execuções quentes da seleção padrão")
+    parser.add_argument("--max-options", type=int, help="máximo de opções varridas por caixa de seleção")
+    parser.add_argument("--no-sweep", dest="sweep", action="store_false", help="não varre as caixas de seleção")
+    parser.add_argument("--timeout", type=float, default=600, help="tempo máximo de cada execução da página")
+    parser.add_argument("--output", help="grava os resultados em JSON neste arquivo")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        report = render_page(Path(args.worker), args.warm_runs, args.sweep, args.max_options, args.timeout)
+        print(json.dumps(report))
+        return 0
+
+    pages = [page for page in PAGES if not args.pages or any(name in page.name for name in args.pages)]
+    if not pages:
+        print(f"Nenhuma página corresponde a: {', '.join(args.pages)}")
+        return 1
+    width = max(len(page.stem) for page in pages)
+    print(f"{'página':<{width}}  {'fria':>7}  {'quente (mediana / máx.)':>23}  varreduras (opções: fria / quente, mediana / máx.)")
+    reports = []
+    failures = 0
+    for page in pages:
+        try:
+            report = measure(page, args.warm_runs, args.sweep, args.max_options, args.timeout)
+        except Exception as e:
+            failures += 1
+            print(f"{page.stem:<{width}}  erro: {e}")
+            continue
+        reports.append(report)
+        failures += bool(report["errors"])
+        sweeps = "; ".join(
+            f"{label} {sweep['options']}: {_describe(sweep['cold'])} | {_describe(sweep['warm'])}"
+            for label, sweep in report["sweeps"].items()
+        )
+        print(f"{page.stem:<{width}}  {report['cold']:6.2f}s  {_describe(report['warm']):>23}  {sweeps or '-'}")
+        for error in report["errors"][:5]:
+            print(f"    exceção: {error[:300]}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(reports, indent=2) + "\n", encoding="utf-8")
+    print(f"{len(pages)} páginas ({failures} com exceções)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,255 @@
+"""Benchmarks das computações centrais das páginas sobre os dados de `EDA/`.
+
+Cada caso é medido com os dados originais e com as versões sintéticas
+ampliadas 10× e 100× (`benchmarks.datasets`). Para cada caso × escala são
+reportados os percentis de latência (p50, p90, p99) e o pico de memória
+alocada durante uma execução (`tracemalloc`), como a mediana de `--rounds`
+rodadas de medição. A preparação dos dados fica fora da medição.
+
+As funções decoradas com `@instrument()` são medidas sem o decorador (pelo
+`__wrapped__`), então o custo da instrumentação não entra nos tempos; as
+chamadas internas a outras funções instrumentadas continuam incluídas.
+
+Uso:
+
+    python -m benchmarks.run [--scales 1 10 100] [--repeat 20] [caso ...]
+    python -m benchmarks.run --save-baseline   # grava a linha de base local
+    python -m benchmarks.run --save-reference  # regrava benchmarks/baselines.json
+
+Os resultados são comparados com uma linha de base: um caso cujo p50 ou pico
+de memória passe a linha de base em mais da tolerância e em mais de
+`MIN_REGRESSION_SECONDS` (ou `MIN_REGRESSION_BYTES`) é marcado como regressão
+e o comando termina com erro. A linha de base local, gravada em
+`.cache/benchmarks/baselines.json` (ou em `NBA_BENCHMARK_BASELINES`), vale
+para a máquina em que foi gravada e usa `--tolerance` (50% por padrão). Sem
+ela, a comparação usa a linha de base de referência versionada em
+`benchmarks/baselines.json`, com a tolerância folgada `REFERENCE_TOLERANCE`,
+já que ela foi gravada em outra máquina: só pega regressões grosseiras.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from benchmarks import datasets
+from utils import extremes, form, regression, summaries, tables
+from utils.standings import calculate_standings
+
+BASELINES_PATH = Path(os.environ.get(
+    "NBA_BENCHMARK_BASELINES", Path(__file__).resolve().parent.parent / ".cache" / "benchmarks" / "baselines.json",
+))
+
+# Linha de base de referência, versionada, usada quando não há uma local
+REFERENCE_BASELINES_PATH = Path(__file__).resolve().parent / "baselines.json"
+# Piora aceita em relação à referência (4×), que foi medida em outra máquina
+REFERENCE_TOLERANCE = 3.0
+
+SCALES = [1, 10, 100]
+PERCENTILES = [50, 90, 99]
+
+# Diferenças de tempo menores que isso são ruído, mesmo acima da tolerância
+MIN_REGRESSION_SECONDS = 0.005
+# O mesmo para a memória: picos de poucos KB variam com alocações internas do pandas
+MIN_REGRESSION_BYTES = 256 * 1024
+# Rodadas de medição de cada caso; o resultado é a mediana delas
+ROUNDS = 3
+
+# Limiar X usado no caso do Gumbel, como o valor padrão da página
+GUMBEL_THRESHOLD = 100
+
+
+def _unwrapped(func):
+    """A função sem o decorador `@instrument()` (que guarda a original em `__wrapped__`)."""
+    return getattr(func, "__wrapped__", func)
+
+
+def _player_statistics_input(scale):
+    # Mesmas colunas que a página 🔃 Performances dos Jogadores passa para calculate_statistics
+    return datasets.player_games(scale).rename(columns={"PTS": "Pontos", "REB": "Rebotes", "AST": "Assistências"})
+
+
+def _aplicar_gumbel(values):
+    # O que a página 📈 Modelos Estatísticos faz quando o ajuste ainda não está no registro
+    fit = extremes.fit_gumbel(values)
+    return extremes.summarize(fit, GUMBEL_THRESHOLD)
+
+
+def _page_games(games):
+    # O que a tabela de 🏀 Times NBA faz ao filtrar as vitórias e ordenar por pontos
+    filtered = _unwrapped(tables.filter_games)(games, WL=["W"])
+    rows, _, _ = _unwrapped(tables.page_rows)(filtered, "PTS", descending=True, page=2)
+    return rows
+
+
+# Caso -> (preparação dos argumentos para a escala, função medida)
+CASES = {
+    "calculate_standings": (lambda scale: (datasets.league_games(scale),), calculate_standings),
+    "build_form": (lambda scale: (datasets.league_games(scale),), form.build_form),
+    "calculate_team_totals": (lambda scale: (datasets.team_games(scale),), summaries.calculate_team_totals),
+    "calculate_team_stats": (lambda scale: (datasets.team_games(scale),), summaries.calculate_team_stats),
+    "calculate_team_points_averages": (
+        lambda scale: (datasets.league_games(scale),), summaries.calculate_team_points_averages,
+    ),
+    "calculate_statistics": (lambda scale: (_player_statistics_input(scale),), summaries.calculate_statistics),
+    "page_games": (lambda scale: (datasets.league_games(scale),), _page_games),
+    "train_linear": (
+        lambda scale: (datasets.player_games(scale), regression.FEATURES, regression.TARGETS),
+        regression.train_linear,
+    ),
+    "train_logistic": (
+        lambda scale: (datasets.player_games(scale), regression.FEATURES, "PTS"),
+        regression.train_logistic,
+    ),
+    "aplicar_gumbel": (
+        lambda scale: (datasets.team_games(scale)["PTS"].to_numpy(),), _aplicar_gumbel,
+    ),
+}
+
+
+def measure(func, args, repeat, max_seconds):
+    """Executa `func(*args)` até `repeat` vezes (ou até `max_seconds`); retorna as durações e o pico de memória."""
+    func(*args)  # Aquecimento: importações tardias e caches internos ficam fora da medição
+
+    durations = []
+    started = time.perf_counter()
+    while len(durations) < repeat:
+        start = time.perf_counter()
+        func(*args)
+        durations.append(time.perf_counter() - start)
+        if len(durations) >= 3 and time.perf_counter() - started > max_seconds:
+            break
+
+    # O tracemalloc deixa a execução mais lenta, então a memória é medida em uma execução à parte
+    tracemalloc.start()
+    try:
+        func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return np.array(durations), peak
+
+
+def run(cases, scales, repeat, max_seconds, rounds=ROUNDS):
+    """Mede os casos em cada escala; retorna `{"caso@escala": resultado}` com a mediana das rodadas."""
+    results = {}
+    for scale in scales:
+        for name in cases:
+            setup, func = CASES[name]
+            func = _unwrapped(func)
+            args = setup(scale)
+            measured = []
+            for _ in range(rounds):
+                durations, peak = measure(func, args, repeat, max_seconds)
+                measured.append([*np.percentile(durations, PERCENTILES), peak, len(durations)])
+            medians = np.median(np.array(measured), axis=0)
+            result = {"case": name, "scale": scale, "rounds": rounds, "runs": int(sum(row[-1] for row in measured))}
+            for q, value in zip(PERCENTILES, medians):
+                result[f"p{q}"] = value
+            result["peak_bytes"] = int(medians[len(PERCENTILES)])
+            results[f"{name}@{scale}"] = result
+    return results
+
+
+def environment():
+    """Versões e máquina em que os resultados foram obtidos."""
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+    }
+
+
+def load_baselines(path=BASELINES_PATH):
+    """Resultados da linha de base, ou `{}` se ela ainda não foi gravada."""
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8"))["results"]
+    except (OSError, ValueError, KeyError):
+        return {}
+
+
+def save_baselines(results, path=BASELINES_PATH):
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    payload = {"environment": environment(), "results": results}
+    Path(path).write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def compare(result, baseline, tolerance):
+    """Regressões do resultado em relação à linha de base (lista vazia se não houver)."""
+    problems = []
+    if baseline is None:
+        return problems
+    limit = baseline["p50"] * (1 + tolerance)
+    if result["p50"] > limit and result["p50"] - baseline["p50"] > MIN_REGRESSION_SECONDS:
+        problems.append(f"p50 {result['p50'] / baseline['p50']:.2f}× a linha de base")
+    memory_limit = baseline["peak_bytes"] * (1 + tolerance)
+    if result["peak_bytes"] > memory_limit and result["peak_bytes"] - baseline["peak_bytes"] > MIN_REGRESSION_BYTES:
+        problems.append(f"memória {result['peak_bytes'] / baseline['peak_bytes']:.2f}× a linha de base")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks das computações das páginas.")
+    parser.add_argument("cases", nargs="*", help=f"casos a medir (padrão: todos): {', '.join(CASES)}")
+    parser.add_argument("--scales", nargs="+", type=int, default=SCALES, help="escalas dos dados (1 = CSV original)")
+    parser.add_argument("--repeat", type=int, default=20, help="execuções medidas de cada caso")
+    parser.add_argument("--max-seconds", type=float, default=10.0, help="tempo máximo medindo cada caso")
+    parser.add_argument("--rounds", type=int, default=ROUNDS, help="rodadas de medição (o resultado é a mediana)")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="piora aceita em relação à linha de base")
+    parser.add_argument("--save-baseline", action="store_true", help="grava os resultados como nova linha de base local")
+    parser.add_argument(
+        "--save-reference", action="store_true", help=f"grava os resultados como linha de base de referência ({REFERENCE_BASELINES_PATH.name})",
+    )
+    parser.add_argument("--output", help="grava os resultados em JSON neste arquivo")
+    args = parser.parse_args(argv)
+
+    unknown = [name for name in args.cases if name not in CASES]
+    if unknown:
+        parser.error(f"casos desconhecidos: {', '.join(unknown)}")
+    cases = args.cases or list(CASES)
+
+    results = run(cases, args.scales, args.repeat, args.max_seconds, args.rounds)
+    saving = args.save_baseline or args.save_reference
+    baselines = {} if saving else load_baselines()
+    tolerance = args.tolerance
+    if not baselines and not saving:
+        baselines = load_baselines(REFERENCE_BASELINES_PATH)
+        tolerance = max(args.tolerance, REFERENCE_TOLERANCE)
+        if baselines:
+            print(f"Sem linha de base local: comparando com a referência ({tolerance:.0%} de tolerância)")
+
+    width = max(len(key) for key in results)
+    print(f"{'caso@escala':<{width}}  {'p50':>9}  {'p90':>9}  {'p99':>9}  {'memória':>10}  execuções")
+    regressions = 0
+    for key, result in results.items():
+        problems = compare(result, baselines.get(key), tolerance)
+        regressions += bool(problems)
+        print(
+            f"{key:<{width}}  {result['p50'] * 1e3:7.2f}ms  {result['p90'] * 1e3:7.2f}ms  {result['p99'] * 1e3:7.2f}ms"
+            f"  {result['peak_bytes'] / 1e6:8.2f}MB  {result['runs']:>9}  {'; '.join(problems) or ''}"
+        )
+
+    if args.output:
+        Path(args.output).write_text(json.dumps({"environment": environment(), "results": results}, indent=2) + "\n", encoding="utf-8")
+    if args.save_baseline:
+        # Casos e escalas não medidos agora continuam com a linha de base anterior
+        save_baselines({**load_baselines(), **results})
+        print(f"Linha de base gravada em {BASELINES_PATH}")
+    if args.save_reference:
+        save_baselines({**load_baselines(REFERENCE_BASELINES_PATH), **results}, REFERENCE_BASELINES_PATH)
+        print(f"Linha de base de referência gravada em {REFERENCE_BASELINES_PATH}")
+    if baselines:
+        print(f"{regressions} regressão(ões) em relação à linha de base")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,27 +1,21 @@
 import streamlit as st
 import pandas as pd
-from nba_api.stats.endpoints import leaguegamefinder
+import numpy as np
+from utils import games as games_store
+from utils.seasons import DEFAULT_SEASONS, available_seasons, season_range
+from utils.figures import downsample
+from utils.tables import show_paginated_table
+from utils.teams import nba_teams
+from utils.debug_panel import show_debug_panel
+from utils.instrumentation import instrument
 
-# Lista de times da NBA
-nba_teams = {
-    "ATL": "Atlanta Hawks", "BOS": "Boston Celtics", "BKN": "Brooklyn Nets", "CHA": "Charlotte Hornets",
-    "CHI": "Chicago Bulls", "CLE": "Cleveland Cavaliers", "DAL": "Dallas Mavericks", "DEN": "Denver Nuggets",
-    "DET": "Detroit Pistons", "GSW": "Golden State Warriors", "HOU": "Houston Rockets", "IND": "Indiana Pacers",
-    "LAC": "Los Angeles Clippers", "LAL": "Los Angeles Lakers", "MEM": "Memphis Grizzlies", "MIA": "Miami Heat",
-    "MIL": "Milwaukee Bucks", "MIN": "Minnesota Timberwolves", "NOP": "New Orleans Pelicans", "NYK": "New York Knicks",
-    "OKC": "Oklahoma City Thunder", "ORL": "Orlando Magic", "PHI": "Philadelphia 76ers", "PHX": "Phoenix Suns",
-    "POR": "Portland Trail Blazers", "SAC": "Sacramento Kings", "SAS": "San Antonio Spurs", "TOR": "Toronto Raptors",
-    "UTA": "Utah Jazz", "WAS": "Washington Wizards"
-}
-
-# Função para buscar jogos por temporada de um time específico
-def get_team_games(team_abbreviation, season):
+# Função para buscar os jogos de um time específico em um período de temporadas
+@instrument()
+def get_team_games(team_abbreviation, seasons):
     try:
-        gamefinder = leaguegamefinder.LeagueGameFinder(season_nullable=season)
-        games = gamefinder.get_data_frames()[0]
-        return games[games['TEAM_ABBREVIATION'] == team_abbreviation]
+        return games_store.get_team_games_range(team_abbreviation, seasons)
     except Exception as e:
-        st.error(f"Erro ao buscar jogos para {team_abbreviation} na temporada {season}: {e}")
+        st.error(f"Erro ao buscar jogos para {team_abbreviation} nas temporadas {seasons[0]} a {seasons[-1]}: {e}")
         return pd.DataFrame()
 
 # Função para formatar e exibir os jogos com as informações solicitadas
@@ -29,39 +23,50 @@ def display_team_games(team_games):
     if team_games.empty:
         return pd.DataFrame()
 
-    team_games['GAME_DATE'] = pd.to_datetime(team_games['GAME_DATE'])
-    team_games['OPPONENT'] = team_games['MATCHUP'].apply(lambda x: x.split(' ')[2] if len(x.split(' ')) > 2 else x.split(' ')[0])
-    team_games['LOCATION'] = team_games['MATCHUP'].apply(lambda x: 'Casa' if 'vs' in x else 'Fora')
-    team_games['RESULT'] = team_games['WL'].apply(lambda x: 'Vitória' if x == 'W' else 'Derrota')
+    # OPPONENT, IS_HOME e WIN já vêm calculados na tabela da temporada
+    team_games = team_games.assign(
+        GAME_DATE=pd.to_datetime(team_games['GAME_DATE']),
+        RESULT=np.where(team_games['WIN'], 'Vitória', 'Derrota'),
+        LOCATION=np.where(team_games['IS_HOME'], 'Casa', 'Fora'),
+    )
     
     # Selecionar as colunas relevantes
-    relevant_columns = ['GAME_DATE', 'OPPONENT', 'RESULT', 'LOCATION', 'PTS']
+    relevant_columns = ['SEASON', 'GAME_DATE', 'OPPONENT', 'RESULT', 'LOCATION', 'PTS']
     team_games = team_games[relevant_columns]
     return team_games
 
 # Configuração do Streamlit
-st.title("🏀 Informações dos Jogos da NBA - Temporadas 2023-24 e 2024-25")
+st.title("🏀 Informações dos Jogos da NBA")
 
 # Seleção do time
 team_abbreviation = st.selectbox("Selecione um time:", options=list(nba_teams.keys()), format_func=lambda x: nba_teams[x])
 
-# Buscar jogos das temporadas 2023-24 e 2024-25
-games_2023_24 = get_team_games(team_abbreviation, "2023-24")
-games_2024_25 = get_team_games(team_abbreviation, "2024-25")
+# Seleção do período (primeira e última temporada)
+first_season, last_season = st.select_slider("Selecione as temporadas:", options=available_seasons(), value=DEFAULT_SEASONS)
+seasons = season_range(first_season, last_season)
 
-# Concatenar os jogos das duas temporadas
-all_games = pd.concat([games_2023_24, games_2024_25])
+# Buscar os jogos do time no período (só as linhas do time são lidas do armazenamento)
+all_games = get_team_games(team_abbreviation, seasons)
 
 # Formatar os dados dos jogos
 team_games_display = display_team_games(all_games)
 
 # Exibir os dados no Streamlit
 if not team_games_display.empty:
-    st.subheader(f"📊 Jogos do {nba_teams[team_abbreviation]} (2023-24 e 2024-25)")
-    st.dataframe(team_games_display, use_container_width=True)
+    st.subheader(f"📊 Jogos do {nba_teams[team_abbreviation]} ({first_season} a {last_season})")
+    # Tabela filtrada, ordenada e paginada no servidor; só a página visível vai para o navegador
+    show_paginated_table(
+        team_games_display,
+        key=f"jogos_{team_abbreviation}",
+        filters={"RESULT": "Resultado", "LOCATION": "Local", "OPPONENT": "Adversário"},
+        date_column="GAME_DATE",
+    )
 
-    # Gráfico de Pontos por Jogo
+    # Gráfico de Pontos por Jogo (períodos longos são reduzidos com o LTTB)
     st.subheader("Gráfico de Pontuação por Jogo")
-    st.line_chart(data=team_games_display.set_index('GAME_DATE')['PTS'])
+    st.line_chart(data=downsample(team_games_display, 'GAME_DATE', 'PTS').set_index('GAME_DATE')['PTS'])
 else:
     st.warning(f"Nenhum dado encontrado para o {nba_teams[team_abbreviation]} nas temporadas selecionadas.")
+
+# Painel de desempenho (com NBA_DEBUG_PANEL=1 ou ?debug=1 na URL)
+show_debug_panel()
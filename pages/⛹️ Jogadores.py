@@ -1,9 +1,19 @@
 import os
+from functools import partial
+
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
-from nba_api.stats.endpoints import playergamelog, commonplayerinfo
+from utils.api import get_data_frames
+from utils.sync import get_player_game_log
+from utils.enrich import ENRICHED_COLUMNS
+from utils.players import hornets_players
+from utils.fetch import fetch_all
+from utils.figures import cached_figure, downsample
 from datetime import datetime
+from utils.debug_panel import show_debug_panel
+from utils.instrumentation import instrument
 
 def convert_height_inches_to_meters(height_inches):
     return round(height_inches * 0.0254, 2)
@@ -11,9 +21,10 @@ def convert_height_inches_to_meters(height_inches):
 def convert_weight_pounds_to_kg(weight_pounds):
     return round(weight_pounds * 0.453592, 1)
 
+@instrument()
 def get_player_data(player_id):
     """Obtém os dados básicos do jogador."""
-    player_info = commonplayerinfo.CommonPlayerInfo(player_id=player_id).get_data_frames()[0]
+    player_info = get_data_frames("commonplayerinfo", player_id=player_id)[0]
     birth_date = datetime.strptime(player_info.loc[0, "BIRTHDATE"], "%Y-%m-%dT%H:%M:%S")
     today = datetime.today()
     idade = today.year - birth_date.year - ((today.month, today.day) < (birth_date.month, birth_date.day))
@@ -33,9 +44,10 @@ def get_player_data(player_id):
         "Salário": "Não disponível na API"
     }
 
+@instrument()
 def get_game_log(player_id, season='2024-25'):
     """Obtém o log de jogos do jogador para a temporada especificada."""
-    log = playergamelog.PlayerGameLog(player_id=player_id, season=season).get_data_frames()[0]
+    log = get_player_game_log(player_id, season)
     log = log.rename(columns={
         "GAME_DATE": "Data do Jogo",
         "MATCHUP": "Adversário",
@@ -47,16 +59,17 @@ def get_game_log(player_id, season='2024-25'):
         "FG3M": "Cestas de 3PTS",
         "MIN": "Minutos em Quadra"
     })
-    log["Casa/Fora"] = log["Adversário"].apply(lambda x: "Casa" if "vs." in x else "Fora")
-    log["Adversário"] = log["Adversário"].str.split().str[-1]
-    return log
+    log["Casa/Fora"] = np.where(log["IS_HOME"], "Casa", "Fora")
+    log["Adversário"] = log["OPPONENT"]
+    # A tabela de jogos mostra só as colunas do log original
+    return log.drop(columns=ENRICHED_COLUMNS, errors="ignore")
 
 # Configuração da página
 st.set_page_config(page_title="Charlotte Hornets Dashboard", layout="wide")
 st.title("\U0001F3C0 Charlotte Hornets - Jogadores")
 
 # Seleção de jogador dentro da aba
-player_ids = {"LaMelo Ball": 1630163, "Brandon Miller": 1641706, "Moussa Diabate": 1631217}
+player_ids = hornets_players
 player_images = {"LaMelo Ball": "img/lamello.png", "Brandon Miller": "img/brandon.png", "Moussa Diabate": "img/moussa.png"}
 
 st.subheader("\U0001F4CC Selecione um jogador para análise")
@@ -71,16 +84,26 @@ if image_path:
     else:
         st.image(image_path, caption=player_name)  # Ocupa toda a largura da coluna
 
-dados_jogador = get_player_data(player_id)
+# Informações e log de jogos do jogador são buscados em paralelo
+fetched = fetch_all({"info": partial(get_player_data, player_id), "log": partial(get_game_log, player_id)}, return_exceptions=True)
+dados_jogador = fetched["info"]
 st.subheader(f"\U0001F4CC Informações de {player_name}")
-st.table(pd.DataFrame([dados_jogador]))
+if isinstance(dados_jogador, Exception):
+    st.warning(f"Informações de {player_name} indisponíveis: {dados_jogador}")
+else:
+    st.table(pd.DataFrame([dados_jogador]))
 
-df_jogos = get_game_log(player_id)
+df_jogos = fetched["log"]
+if isinstance(df_jogos, Exception):
+    raise df_jogos
 st.subheader("\U0001F4CA Estatísticas da Temporada Atual")
 st.dataframe(df_jogos)
 
-# Gráficos interativos
-fig_pts = px.line(df_jogos, x="Data do Jogo", y="Pontos", title="Pontos por Jogo", markers=True)
+# Gráficos interativos (séries longas são reduzidas com o LTTB; a figura só é montada de novo quando o log muda)
+def build_points_figure(jogos):
+    return px.line(downsample(jogos, "Data do Jogo", "Pontos"), x="Data do Jogo", y="Pontos", title="Pontos por Jogo", markers=True)
+
+fig_pts = cached_figure("pontos_por_jogo", build_points_figure, df_jogos[["Data do Jogo", "Pontos"]])
 st.plotly_chart(fig_pts, use_container_width=True)
 
 # Definir as colunas específicas para o confronto
@@ -94,4 +117,7 @@ adversario_selecionado = st.selectbox("Escolha um adversário", df_jogos["Advers
 df_partida = df_jogos[df_jogos["Adversário"] == adversario_selecionado][colunas_especificas]
 
 st.subheader(f"\U0001F4CC Jogos contra {adversario_selecionado}")
-st.dataframe(df_partida)
\ No newline at end of file
+st.dataframe(df_partida)
+
+# Painel de desempenho (com NBA_DEBUG_PANEL=1 ou ?debug=1 na URL)
+show_debug_panel()
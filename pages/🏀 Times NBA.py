@@ -1,18 +1,12 @@
 import streamlit as st
 import pandas as pd
 from nba_api.stats.static import teams
-from nba_api.stats.endpoints import leaguegamefinder
-
-# Definição das conferências
-eastern_conference_teams = {
-    "ATL", "BOS", "BKN", "CHA", "CHI", "CLE", "DET", "IND", "MIA", "MIL",
-    "NYK", "ORL", "PHI", "TOR", "WAS"
-}
-
-western_conference_teams = {
-    "DAL", "DEN", "GSW", "HOU", "LAC", "LAL", "MEM", "MIN", "NOP", "OKC",
-    "PHX", "POR", "SAC", "SAS", "UTA"
-}
+from utils import games as games_store
+from utils.seasons import DEFAULT_SEASONS, available_seasons
+from utils.tables import show_paginated_table
+from utils.teams import eastern_conference_teams, western_conference_teams
+from utils.debug_panel import show_debug_panel
+from utils.instrumentation import instrument
 
 # Função para listar todos os times agrupados por conferência
 def get_teams_by_conference():
@@ -31,11 +25,10 @@ def get_teams_by_conference():
     return eastern_conference, western_conference
 
 # Função para buscar jogos por temporada
+@instrument()
 def get_games_by_season(season):
     try:
-        gamefinder = leaguegamefinder.LeagueGameFinder(season_nullable=season)
-        games = gamefinder.get_data_frames()[0]
-        return games
+        return games_store.get_season_games(season)
     except Exception as e:
         st.error(f"Erro ao buscar jogos da temporada {season}: {e}")
         return pd.DataFrame()  # Retorna um DataFrame vazio se houver erro
@@ -57,20 +50,25 @@ df_western = pd.DataFrame(western)
 st.dataframe(df_western, use_container_width=True)
 
 # Buscar e exibir os jogos das temporadas
-st.subheader("📊 Jogos das Temporadas 2023-24 e 2024-25")
+st.subheader("📊 Jogos por Temporada")
 
 # Selecionar temporada
-season_selected = st.selectbox("Selecione a Temporada", ["2023-24", "2024-25"])
+season_options = available_seasons()
+season_selected = st.selectbox("Selecione a Temporada", season_options, index=season_options.index(DEFAULT_SEASONS[0]))
 
-if season_selected == "2023-24":
-    games_df = get_games_by_season("2023-24")
-else:
-    games_df = get_games_by_season("2024-25")
+games_df = get_games_by_season(season_selected)
 
-# Exibir os jogos em formato de tabela
+# Exibir os jogos em formato de tabela (filtrada, ordenada e paginada no servidor; só a página visível vai para o navegador)
 if not games_df.empty:
     st.write(f"### Jogos da Temporada {season_selected}")
-    st.dataframe(games_df, use_container_width=True)
+    show_paginated_table(
+        games_df,
+        key="jogos_temporada",
+        filters={"TEAM_ABBREVIATION": "Time", "WL": "Resultado", "OPPONENT": "Adversário"},
+        date_column="GAME_DATE",
+    )
 else:
     st.warning("Nenhum dado encontrado para esta temporada.")
 
+# Painel de desempenho (com NBA_DEBUG_PANEL=1 ou ?debug=1 na URL)
+show_debug_panel()
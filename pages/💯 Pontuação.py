@@ -2,76 +2,48 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from nba_api.stats.endpoints import leaguegamefinder
-
-# Lista de times da NBA
-nba_teams = {
-    "ATL": "Atlanta Hawks", "BOS": "Boston Celtics", "BKN": "Brooklyn Nets", "CHA": "Charlotte Hornets",
-    "CHI": "Chicago Bulls", "CLE": "Cleveland Cavaliers", "DAL": "Dallas Mavericks", "DEN": "Denver Nuggets",
-    "DET": "Detroit Pistons", "GSW": "Golden State Warriors", "HOU": "Houston Rockets", "IND": "Indiana Pacers",
-    "LAC": "Los Angeles Clippers", "LAL": "Los Angeles Lakers", "MEM": "Memphis Grizzlies", "MIA": "Miami Heat",
-    "MIL": "Milwaukee Bucks", "MIN": "Minnesota Timberwolves", "NOP": "New Orleans Pelicans", "NYK": "New York Knicks",
-    "OKC": "Oklahoma City Thunder", "ORL": "Orlando Magic", "PHI": "Philadelphia 76ers", "PHX": "Phoenix Suns",
-    "POR": "Portland Trail Blazers", "SAC": "Sacramento Kings", "SAS": "San Antonio Spurs", "TOR": "Toronto Raptors",
-    "UTA": "Utah Jazz", "WAS": "Washington Wizards"
-}
+from utils import games as games_store
+from utils import summaries
+from utils.seasons import DEFAULT_SEASONS, available_seasons
+from utils.teams import nba_teams
+from utils.debug_panel import show_debug_panel
+from utils.instrumentation import instrument
 
 # Função para buscar jogos por temporada de um time específico
+@instrument()
 def get_team_games(team_abbreviation, season):
     try:
-        gamefinder = leaguegamefinder.LeagueGameFinder(season_nullable=season)
-        games = gamefinder.get_data_frames()[0]
-        return games[games['TEAM_ABBREVIATION'] == team_abbreviation]
+        return games_store.get_team_games(team_abbreviation, season)
     except Exception as e:
         # st.error(f"Erro ao buscar jogos para {team_abbreviation} na temporada {season}: {e}")
         return pd.DataFrame()
 
-# Função para calcular estatísticas do time
-def calculate_team_stats(team_games):
-    if team_games.empty:
-        return {}
-
-    team_games['Home/Away'] = team_games['MATCHUP'].apply(lambda x: 'Home' if 'vs.' in x else 'Away')
-
-    stats = {
-        "Points per Game": team_games['PTS'].mean(),
-        "Assists per Game": team_games['AST'].mean(),
-        "Rebounds per Game": team_games['REB'].mean(),
-        "3-Point Field Goals Made": team_games['FG3M'].sum(),
-        "Total Home Losses": ((team_games['WL'] == 'L') & (team_games['Home/Away'] == 'Home')).sum(),
-        "Total Away Losses": ((team_games['WL'] == 'L') & (team_games['Home/Away'] == 'Away')).sum()
-    }
-    return stats
-
 # Função para calcular a média de pontos marcados e sofridos por time
+@instrument()
 def calculate_team_points_averages(season):
-    team_averages = [
-        {
-            "Team": team_name,
-            "Avg Points Scored": games['PTS'].mean(),
-            "Avg Points Allowed": (games['PTS'] - games['PLUS_MINUS']).mean()
-        }
-        for team_abbreviation, team_name in nba_teams.items()
-        if not (games := get_team_games(team_abbreviation, season)).empty
-    ]
-    return pd.DataFrame(team_averages)
+    try:
+        games = games_store.get_season_games(season)
+    except Exception:
+        return pd.DataFrame()
+
+    return summaries.calculate_team_points_averages(games)
 
 
 # Configuração do Streamlit
-st.title("🏀 Estatísticas de Times da NBA - Temporadas 2023-24 e 2024-25")
+st.title("🏀 Estatísticas de Times da NBA")
 
 # Seleção do time
 team_abbreviation = st.selectbox("Selecione um time:", options=list(nba_teams.keys()), format_func=lambda x: nba_teams[x])
 
 # Seleção da temporada
-season_options = ["2023-24", "2024-25"]
-selected_season = st.selectbox("Selecione a temporada:", season_options)
+season_options = available_seasons()
+selected_season = st.selectbox("Selecione a temporada:", season_options, index=season_options.index(DEFAULT_SEASONS[0]))
 
 # Buscar jogos da temporada selecionada
 games = get_team_games(team_abbreviation, selected_season)
 
 # Calcular estatísticas
-team_stats = calculate_team_stats(games)
+team_stats = summaries.calculate_team_stats(games)
 
 # Exibir os resultados
 if team_stats:
@@ -82,24 +54,23 @@ if team_stats:
     stats_df['Valor'] = stats_df['Valor'].round(2)
     st.dataframe(stats_df, use_container_width=True)
 
-    # Exibir gráfico de barras
-    st.bar_chart(stats_df.set_index("Categoria"))
+    # Exibir gráfico de barras (com o Plotly, que a página já usa; o st.bar_chart carregaria o Altair)
+    st.plotly_chart(go.Figure(go.Bar(x=stats_df["Categoria"], y=stats_df["Valor"], name="Valor")))
 else:
     st.warning(f"Nenhum dado encontrado para o {nba_teams[team_abbreviation]} na temporada {selected_season}.")
 
 # Processamento dos dados para o gráfico de radar
 if not games.empty:
-    games["Home"] = games["MATCHUP"].apply(lambda x: "Home" if "vs." in x else "Away")
-    games["Points_Scored"] = games["PTS"]
-    games["Points_Allowed"] = games["PTS"] - games["PLUS_MINUS"]
+    home_games = games[games["IS_HOME"]]
+    away_games = games[~games["IS_HOME"]]
 
     # Gráfico 5: Radar (Média de Pontos Marcados/Sofridos)
     st.subheader("Média de Pontos Marcados e Sofridos")
     stats = [
-        games[games["Home"] == "Home"]["Points_Scored"].mean(),
-        games[games["Home"] == "Home"]["Points_Allowed"].mean(),
-        games[games["Home"] == "Away"]["Points_Scored"].mean(),
-        games[games["Home"] == "Away"]["Points_Allowed"].mean()
+        home_games["PTS"].mean(),
+        home_games["POINTS_ALLOWED"].mean(),
+        away_games["PTS"].mean(),
+        away_games["POINTS_ALLOWED"].mean()
     ]
     labels = ["Pontos Marcados (Casa)", "Pontos Sofridos (Casa)", "Pontos Marcados (Fora)", "Pontos Sofridos (Fora)"]
     fig5 = go.Figure(data=go.Scatterpolar(
@@ -144,3 +115,6 @@ if not team_averages_df.empty:
     st.plotly_chart(fig6)
 else:
     st.warning("Nenhum dado encontrado para exibir o gráfico de dispersão.")
+
+# Painel de desempenho (com NBA_DEBUG_PANEL=1 ou ?debug=1 na URL)
+show_debug_panel()
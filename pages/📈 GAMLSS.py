@@ -0,0 +1,64 @@
+import streamlit as st
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from utils.gam import fit_gam_bundles, load_player_stats, player_stat_series
+from utils.players import gamlss_players
+from utils.debug_panel import show_debug_panel
+
+# IDs dos jogadores usados na seção GAMLSS
+players = gamlss_players
+seasons = ["2023-24", "2024-25"]
+
+st.title("GAMLSS: Generalized Additive Models for Location Scale and Shape - Charlotte Hornets")
+
+# Coletar dados
+data, errors = load_player_stats(players, seasons)
+for player_id, season, e in errors:
+    st.error(f"Erro ao buscar dados do jogador {player_id} para a temporada {season}: {e}")
+
+# Previsão usando GAMLSS (PoissonGAM e LinearGAM). Os modelos de cada
+# jogador × estatística são ajustados uma única vez (em paralelo) e todos os
+# gráficos abaixo leem do mesmo resultado
+bundles = fit_gam_bundles(player_stat_series(data))
+
+# Criar DataFrame de previsões
+pred_df = pd.DataFrame({key: bundle["prediction"] for key, bundle in bundles.items()}).T
+st.dataframe(pred_df)
+
+# Gráficos de probabilidade predita e coeficientes
+st.subheader("Gráficos de Probabilidade Predita")
+fig_prob_pred = go.Figure()
+for (player, stat), bundle in bundles.items():
+    games_index = np.arange(len(bundle["y_pred_poisson"]))
+    fig_prob_pred.add_trace(go.Scatter(x=games_index, y=bundle["y_pred_poisson"], mode='lines', name=f"{player} - {stat} (Poisson)"))
+    fig_prob_pred.add_trace(go.Scatter(x=games_index, y=bundle["y_pred_linear"], mode='lines', name=f"{player} - {stat} (Linear)"))
+st.plotly_chart(fig_prob_pred)
+
+# Gráficos de Coeficientes
+st.subheader("Gráficos de Coeficientes do Modelo")
+fig_coef = go.Figure()
+for (player, stat), bundle in bundles.items():
+    coef_poisson = bundle["coef_poisson"]
+    coef_linear = bundle["coef_linear"]
+
+    fig_coef.add_trace(go.Scatter(x=np.arange(len(coef_poisson)), y=coef_poisson, mode='lines', name=f"{player} - {stat} (Poisson Coefficients)"))
+    fig_coef.add_trace(go.Scatter(x=np.arange(len(coef_linear)), y=coef_linear, mode='lines', name=f"{player} - {stat} (Linear Coefficients)"))
+st.plotly_chart(fig_coef)
+
+# Matriz de Confusão
+st.subheader("Matriz de Confusão")
+fig_confusion = go.Figure()
+for (player, stat), bundle in bundles.items():
+    fig_confusion.add_trace(go.Heatmap(z=bundle["confusion_matrix"], x=['Below', 'Above'], y=['Below', 'Above'], colorscale='Blues', name=f"{player} - {stat}"))
+st.plotly_chart(fig_confusion)
+
+# Curva ROC e AUC
+st.subheader("Curva ROC e AUC")
+fig_roc = go.Figure()
+for (player, stat), bundle in bundles.items():
+    fig_roc.add_trace(go.Scatter(x=bundle["fpr"], y=bundle["tpr"], mode='lines', name=f"{player} - {stat} (AUC={bundle['auc']:.2f})"))
+st.plotly_chart(fig_roc)
+
+# Painel de desempenho (com NBA_DEBUG_PANEL=1 ou ?debug=1 na URL)
+show_debug_panel()
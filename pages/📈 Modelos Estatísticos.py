@@ -1,41 +1,43 @@
+from functools import partial
+
 import streamlit as st
 import numpy as np
 import pandas as pd
-import plotly.figure_factory as ff
-from scipy.stats import gumbel_r
-from nba_api.stats.endpoints import teamgamelog
+from utils.api import get_data_frames
+from utils.fetch import fetch_all
 from nba_api.stats.static import teams
-from pygam import PoissonGAM, LinearGAM
-from nba_api.stats.endpoints import playergamelog
 import plotly.graph_objects as go
-from sklearn.metrics import confusion_matrix, roc_curve, auc
-from sklearn.model_selection import train_test_split
+from utils import extremes
+from utils.figures import cached_figure, histogram_figure, lttb_indices
+from utils.debug_panel import show_debug_panel
+from utils.instrumentation import instrument
+
+# A seção GAMLSS fica na página 📈 GAMLSS, para que quem só usa a
+# distribuição de Gumbel não pague pela importação do pygam nem pelos
+# logs dos jogadores
 
 # Encontrar o ID do Charlotte Hornets
 hornets = teams.find_team_by_abbreviation('CHA')
 hornets_id = hornets['id']
 
-# Extrair os dados dos jogos para as temporadas 23-24 e 24-25
-game_logs_23_24 = teamgamelog.TeamGameLog(team_id=hornets_id, season='2023-24').get_data_frames()[0]
-game_logs_24_25 = teamgamelog.TeamGameLog(team_id=hornets_id, season='2024-25').get_data_frames()[0]
+seasons = ["2023-24", "2024-25"]
+
+# Extrair os dados dos jogos para as temporadas 23-24 e 24-25 (em paralelo)
+fetched = fetch_all({
+    season: partial(get_data_frames, "teamgamelog", team_id=hornets_id, season=season)
+    for season in seasons
+})
+game_logs_23_24 = fetched["2023-24"][0]
+game_logs_24_25 = fetched["2024-25"][0]
 
 # Combinar os dados das duas temporadas
 all_game_logs = pd.concat([game_logs_23_24, game_logs_24_25])
 
-# Função para aplicar o Método de Gumbel
+# Função para aplicar o Método de Gumbel (o ajuste é feito uma vez por estatística; mudar X não reajusta)
+@instrument()
 def aplicar_gumbel(dados, coluna, X):
-    params = gumbel_r.fit(dados[coluna])
-    mu, beta = params
-
-    resultados = {
-        "Probabilidade de marcar acima de X": 1 - gumbel_r.cdf(X, loc=mu, scale=beta),
-        "Probabilidade de atingir ou exceder X": 1 - gumbel_r.cdf(X, loc=mu, scale=beta),
-        "Probabilidade de atingir ou ficar abaixo de X": gumbel_r.cdf(X, loc=mu, scale=beta),
-        "Proporção de valores menores ou iguais a X": gumbel_r.cdf(X, loc=mu, scale=beta),
-        "Valores menores que X": np.sum(dados[coluna] < X),
-        "Proporção de valores menores que X": np.mean(dados[coluna] < X)
-    }
-    return resultados, mu, beta
+    fit = extremes.get_gumbel_fit("CHA", coluna, seasons, dados[coluna].to_numpy())
+    return extremes.summarize(fit, X), fit["mu"], fit["beta"]
 
 # Interface Streamlit
 st.title("Análise de Eventos Extremos na NBA - Charlotte Hornets")
@@ -53,167 +55,48 @@ st.subheader(f"Resultados para {estatistica} com X = {X}")
 for pergunta, resposta in resultados.items():
     st.write(f"**{pergunta}:** {resposta:.4f}")
 
-# Gráfico da Distribuição de Gumbel
-x = np.linspace(min(all_game_logs[estatistica]), max(all_game_logs[estatistica]), 1000)
-y = gumbel_r.pdf(x, loc=mu, scale=beta)
-
-# Criar histograma dos dados
-hist_data = [all_game_logs[estatistica]]
-group_labels = [estatistica]
+# Gráfico da Distribuição de Gumbel: histograma (densidade) com as faixas calculadas no servidor e a curva
+# reduzida com o LTTB; a figura só é montada de novo quando a estatística, os parâmetros ou X mudam
+def build_gumbel_figure(valores, estatistica, mu, beta, X):
+    fig = histogram_figure(valores, nbins=20, x_title=estatistica, histnorm="probability density", name=estatistica)
 
-# Criar figura com histograma e curva de Gumbel
-fig = ff.create_distplot(hist_data, group_labels, show_hist=True, show_curve=False)
-fig.add_scatter(x=x, y=y, mode='lines', name=f"Gumbel (μ={mu:.2f}, β={beta:.2f})")
-fig.add_vline(x=X, line=dict(color="red", dash="dash"), annotation_text=f"X = {X}")
+    x = np.linspace(valores.min(), valores.max(), 1000)
+    y = extremes.pdf(x, mu, beta)
+    pontos = lttb_indices(x, y)
+    fig.add_scatter(x=x[pontos], y=y[pontos], mode='lines', name=f"Gumbel (μ={mu:.2f}, β={beta:.2f})")
+    fig.add_vline(x=X, line=dict(color="red", dash="dash"), annotation_text=f"X = {X}")
+    return fig
 
+fig = cached_figure("gumbel", build_gumbel_figure, all_game_logs[estatistica].to_numpy(), estatistica, mu, beta, X)
 st.plotly_chart(fig)
 
-
-st.title("GAMLSS: Generalized Additive Models for Location Scale and Shape - Charlotte Hornets")
-
-# Função para coletar dados da NBA
-def get_player_stats(player_id, season):
+# Comparação entre os 30 times: os parâmetros de todos os times × estatísticas × temporadas
+# são ajustados uma vez (em paralelo) e ficam gravados; aqui só se calcula P(> X). Os
+# jogos da liga só são carregados quando a comparação é pedida
+st.subheader(f"Comparação entre os times - Probabilidade de {estatistica} acima de {X}")
+if st.checkbox("Comparar com os outros times"):
+    temporada_comparacao = st.selectbox("Temporada da comparação:", seasons, index=len(seasons) - 1)
     try:
-        log = playergamelog.PlayerGameLog(player_id=player_id, season=season)
-        games = log.get_data_frames()[0]
-        return games[['PTS', 'REB', 'AST']]
+        parametros = extremes.fit_league(seasons)
     except Exception as e:
-        st.error(f"Erro ao buscar dados do jogador {player_id} para a temporada {season}: {e}")
-        return pd.DataFrame()
-
-# IDs dos jogadores
-players = {
-    "LaMelo Ball": 1630163,
-    "Moussa Diabate": 1631217,
-    "Brandon Miller": 1641705
-}
-
-# Coletar dados
-seasons = ["2023-24", "2024-25"]
-data = {player: pd.concat([get_player_stats(pid, season) for season in seasons], ignore_index=True) for player, pid in players.items()}
-
-# Previsão usando GAMLSS (PoissonGAM e LinearGAM)
-predictions = {}
-for player, df in data.items():
-    if df.empty:
-        continue
-    
-    X = np.arange(len(df)).reshape(-1, 1)  # Índice do jogo como variável preditora
-    
-    for stat in ['PTS', 'REB', 'AST']:
-        y = df[stat]
-        
-        # Dividir dados em treino e teste
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-        
-        # Modelos
-        gam_poisson = PoissonGAM().fit(X_train, y_train)
-        gam_linear = LinearGAM().fit(X_train, y_train)
-        
-        # Previsão do próximo jogo
-        x_next = np.array([[len(df)]])
-        pred_poisson = gam_poisson.predict(x_next)[0]
-        pred_linear = gam_linear.predict(x_next)[0]
-        
-        # Estatísticas
-        mean = y.mean()
-        median = y.median()
-        mode = y.mode()[0]
-        min_val = y.min()
-        max_val = y.max()
-        
-        # Probabilidades acima/abaixo da média
-        prob_above_mean = (y > mean).mean()
-        prob_below_mean = 1 - prob_above_mean
-        
-        predictions[(player, stat)] = {
-            "Poisson Prediction": pred_poisson,
-            "Linear Prediction": pred_linear,
-            "Mean": mean,
-            "Median": median,
-            "Mode": mode,
-            "Min": min_val,
-            "Max": max_val,
-            "P(Above Mean)": prob_above_mean,
-            "P(Below Mean)": prob_below_mean
-        }
-
-# Criar DataFrame de previsões
-pred_df = pd.DataFrame(predictions).T
-st.dataframe(pred_df)
-
-# Gráficos de probabilidade predita e coeficientes
-st.subheader("Gráficos de Probabilidade Predita")
-fig_prob_pred = go.Figure()
-for player, df in data.items():
-    if df.empty:
-        continue
-    
-    for stat in ['PTS', 'REB', 'AST']:
-        y = df[stat]
-        X = np.arange(len(df)).reshape(-1, 1)
-        
-        # Modelos
-        gam_poisson = PoissonGAM().fit(X, y)
-        gam_linear = LinearGAM().fit(X, y)
-        
-        # Probabilidade predita
-        y_pred_poisson = gam_poisson.predict(X)
-        y_pred_linear = gam_linear.predict(X)
-        
-        fig_prob_pred.add_trace(go.Scatter(x=np.arange(len(df)), y=y_pred_poisson, mode='lines', name=f"{player} - {stat} (Poisson)"))
-        fig_prob_pred.add_trace(go.Scatter(x=np.arange(len(df)), y=y_pred_linear, mode='lines', name=f"{player} - {stat} (Linear)"))
-st.plotly_chart(fig_prob_pred)
-
-# Gráficos de Coeficientes
-st.subheader("Gráficos de Coeficientes do Modelo")
-fig_coef = go.Figure()
-for player, df in data.items():
-    if df.empty:
-        continue
-    
-    for stat in ['PTS', 'REB', 'AST']:
-        X = np.arange(len(df)).reshape(-1, 1)
-        
-        # Modelos
-        gam_poisson = PoissonGAM().fit(X, df[stat])
-        gam_linear = LinearGAM().fit(X, df[stat])
-        
-        # Coeficientes
-        coef_poisson = gam_poisson.coef_
-        coef_linear = gam_linear.coef_
-        
-        fig_coef.add_trace(go.Scatter(x=np.arange(len(coef_poisson)), y=coef_poisson, mode='lines', name=f"{player} - {stat} (Poisson Coefficients)"))
-        fig_coef.add_trace(go.Scatter(x=np.arange(len(coef_linear)), y=coef_linear, mode='lines', name=f"{player} - {stat} (Linear Coefficients)"))
-st.plotly_chart(fig_coef)
-
-# Matriz de Confusão
-st.subheader("Matriz de Confusão")
-fig_confusion = go.Figure()
-for player, df in data.items():
-    if df.empty:
-        continue
-    
-    for stat in ['PTS', 'REB', 'AST']:
-        y_true = (df[stat] > df[stat].mean()).astype(int)  # 1 se acima da média, 0 caso contrário
-        y_pred = (PoissonGAM().fit(np.arange(len(df)).reshape(-1, 1), df[stat]).predict(np.arange(len(df)).reshape(-1, 1)) > df[stat].mean()).astype(int)
-        cm = confusion_matrix(y_true, y_pred)
-        
-        fig_confusion.add_trace(go.Heatmap(z=cm, x=['Below', 'Above'], y=['Below', 'Above'], colorscale='Blues', name=f"{player} - {stat}"))
-st.plotly_chart(fig_confusion)
-
-# Curva ROC e AUC
-st.subheader("Curva ROC e AUC")
-fig_roc = go.Figure()
-for player, df in data.items():
-    if df.empty:
-        continue
-    
-    for stat in ['PTS', 'REB', 'AST']:
-        y_true = (df[stat] > df[stat].mean()).astype(int)
-        y_scores = PoissonGAM().fit(np.arange(len(df)).reshape(-1, 1), df[stat]).predict(np.arange(len(df)).reshape(-1, 1))
-        fpr, tpr, _ = roc_curve(y_true, y_scores)
-        auc_score = auc(fpr, tpr)
-        
-        fig_roc.add_trace(go.Scatter(x=fpr, y=tpr, mode='lines', name=f"{player} - {stat} (AUC={auc_score:.2f})"))
-st.plotly_chart(fig_roc)
+        st.error(f"Erro ao ajustar a distribuição de Gumbel para os times: {e}")
+        parametros = pd.DataFrame(columns=["SEASON", "STAT"])
+
+    parametros = parametros[(parametros["SEASON"] == temporada_comparacao) & (parametros["STAT"] == estatistica)]
+    if not parametros.empty:
+        comparacao = parametros.assign(
+            **{"P(> X)": extremes.exceedance_probability(X, parametros["MU"].to_numpy(), parametros["BETA"].to_numpy())}
+        ).sort_values("P(> X)", ascending=False)
+        fig_times = go.Figure(go.Bar(
+            x=comparacao["TEAM_ABBREVIATION"],
+            y=comparacao["P(> X)"],
+            marker_color=["teal" if team == "CHA" else "gray" for team in comparacao["TEAM_ABBREVIATION"]],
+        ))
+        fig_times.update_layout(xaxis_title="Time", yaxis_title=f"P({estatistica} > {X})")
+        st.plotly_chart(fig_times)
+        st.dataframe(comparacao[["TEAM_ABBREVIATION", "GAMES", "MU", "BETA", "P(> X)"]], use_container_width=True)
+    else:
+        st.warning(f"Nenhum dado encontrado para a temporada {temporada_comparacao}.")
+
+# Painel de desempenho (com NBA_DEBUG_PANEL=1 ou ?debug=1 na URL)
+show_debug_panel()
@@ -3,64 +3,38 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from nba_api.stats.endpoints import playergamelog
-from sklearn.model_selection import train_test_split
-from sklearn.linear_model import LinearRegression
-from sklearn.metrics import mean_absolute_error, r2_score, confusion_matrix, roc_curve, auc
+from utils import projections
+from utils import regression
+from utils.players import hornets_players
+from utils.debug_panel import show_debug_panel
+from utils.instrumentation import instrument
 
 # 📌 Dicionário de jogadores e IDs na NBA API
-players = {
-    "LaMelo Ball": 1630163,
-    "Brandon Miller": 1641706,
-    "Moussa Diabate": 1631217
-}
+players = hornets_players
 
 # 📌 Variáveis independentes (features) e dependentes (target)
-features = ["MIN", "FGA", "TOV"]  # Tempo de quadra, arremessos tentados e turnovers
-targets = ["PTS", "AST", "REB"]   # Pontos, assistências e rebotes
+features = regression.FEATURES  # Tempo de quadra, arremessos tentados e turnovers
+targets = regression.TARGETS    # Pontos, assistências e rebotes
 
 # 📌 Função para coletar dados dos jogos dos jogadores
+@instrument()
 def get_player_data(player_id, seasons):
-    all_data = []
-    for season in seasons:
-        try:
-            log = playergamelog.PlayerGameLog(player_id=player_id, season=season).get_data_frames()[0]
-            log = log[["MIN", "FGA", "TOV", "PTS", "AST", "REB"]]
-            all_data.append(log)
-        except Exception as e:
-            st.warning(f"Erro ao buscar dados para o jogador {player_id} na temporada {season}: {e}")
-    
-    if all_data:
-        return pd.concat(all_data, ignore_index=True)
-    return pd.DataFrame()
+    player_df, errors = regression.load_player_data(player_id, seasons)
+    for season, error in errors.items():
+        st.warning(f"Erro ao buscar dados para o jogador {player_id} na temporada {season}: {error}")
+    return player_df
 
-# 📌 Coletar dados para os jogadores
+# 📌 Temporadas usadas no treino
 seasons = ["2023-24", "2024-25"]
-player_data = {name: get_player_data(pid, seasons) for name, pid in players.items()}
-
-# 📌 Função para treinar o modelo de regressão linear
-def train_model(df, feature_cols, target_col):
-    X = df[feature_cols]
-    y = df[target_col]
-    
-    # Divisão treino/teste
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-    
-    model = LinearRegression()
-    model.fit(X_train, y_train)
-    
-    y_pred = model.predict(X_test)
-    mae = mean_absolute_error(y_test, y_pred)
-    r2 = r2_score(y_test, y_pred)
-    
-    return model, X_test, y_test, y_pred, mae, r2
 
 # 📌 Criar interface no Streamlit
 st.title("📊 Previsão de Desempenho dos Jogadores do Charlotte Hornets")
 
 # Seleção de jogador
 player_name = st.selectbox("Escolha um jogador", list(players.keys()))
-player_df = player_data[player_name]
+
+# 📌 Coletar dados apenas do jogador selecionado
+player_df = get_player_data(players[player_name], seasons)
 
 if player_df.empty:
     st.warning("Nenhum dado disponível para este jogador.")
@@ -69,23 +43,33 @@ else:
     st.dataframe(player_df.head())
 
     # 📌 Treinar modelos para Pontos, Assistências e Rebotes
-    models = {}
+    # Modelos já treinados com os mesmos dados são reaproveitados entre reruns
+    fit = regression.get_linear_fit(player_name, seasons, player_df, features, targets)
+
+    coefs = {}
     metrics = {}
     predictions = {}
-
-    for target in targets:
-        model, X_test, y_test, y_pred, mae, r2 = train_model(player_df, features, target)
-        models[target] = model
-        metrics[target] = {"MAE": mae, "R² Score": r2}
-        predictions[target] = model.predict([[30, 15, 2]])[0]  # Exemplo: 30 min, 15 FGA, 2 TOV
+    y_tests = {}
+    y_preds = {}
+    example = np.array([30, 15, 2])  # Exemplo: 30 min, 15 FGA, 2 TOV
+    for i, target in enumerate(targets):
+        coefs[target] = fit["coef"][:, i]
+        metrics[target] = {"MAE": fit["mae"][i], "R² Score": fit["r2"][i]}
+        predictions[target] = fit["intercept"][i] + example @ fit["coef"][:, i]
+        y_tests[target] = fit["Y_test"][:, i]
+        y_preds[target] = fit["Y_pred"][:, i]
 
     # 📌 Exibir métricas do modelo
     st.subheader("📌 Métricas do Modelo")
     st.write(pd.DataFrame(metrics).T)
 
+    # 📌 As métricas do scikit-learn só são importadas quando há um modelo para avaliar
+    from sklearn.metrics import confusion_matrix, roc_curve, auc
+
     # 📌 Matriz de Confusão
     st.subheader("📊 Matriz de Confusão")
     for target in targets:
+        y_test, y_pred = y_tests[target], y_preds[target]
         y_true = (y_test > y_test.mean()).astype(int)  # 1 se acima da média, 0 caso contrário
         y_pred_class = (y_pred > y_test.mean()).astype(int)
         cm = confusion_matrix(y_true, y_pred_class)
@@ -105,8 +89,9 @@ else:
     st.subheader("📊 Curva ROC e AUC")
     fig_roc = go.Figure()
     for target in targets:
+        y_test = y_tests[target]
         y_true = (y_test > y_test.mean()).astype(int)
-        y_scores = y_pred
+        y_scores = y_preds[target]
         fpr, tpr, _ = roc_curve(y_true, y_scores)
         auc_score = auc(fpr, tpr)
 
@@ -118,7 +103,7 @@ else:
     # 📌 Gráfico de Probabilidade Predita
     st.subheader("📊 Gráficos de Probabilidade Predita")
     for target in targets:
-        fig_prob = px.histogram(y_pred, nbins=10, title=f"Distribuição de Probabilidade Predita - {target}")
+        fig_prob = px.histogram(y_preds[target], nbins=10, title=f"Distribuição de Probabilidade Predita - {target}")
         st.plotly_chart(fig_prob)
 
     # 📌 Gráficos de Coeficientes do Modelo
@@ -126,8 +111,50 @@ else:
     for target in targets:
         coef_df = pd.DataFrame({
             "Variável": features,
-            "Coeficiente": models[target].coef_
+            "Coeficiente": coefs[target]
         })
 
         fig_coef = px.bar(coef_df, x="Variável", y="Coeficiente", title=f"Coeficientes do Modelo - {target}")
         st.plotly_chart(fig_coef)
+
+# 📌 Projeções em lote (todos os jogadores do elenco ou da liga)
+st.title("📊 Projeções em Lote")
+st.write("Treina os modelos de MIN, FGA e TOV → PTS, AST e REB para vários jogadores de uma vez e calcula as previsões para uma grade de valores.")
+
+scope = st.radio("Jogadores", ["Elenco do Charlotte Hornets", "Liga inteira"], horizontal=True)
+min_range = st.slider("Minutos (MIN)", 0, 48, (20, 36), step=2)
+fga_range = st.slider("Arremessos tentados (FGA)", 0, 40, (5, 25))
+tov_range = st.slider("Turnovers (TOV)", 0, 10, (0, 4))
+
+if st.checkbox("Calcular projeções em lote"):
+    team_abbreviations = ["CHA"] if scope == "Elenco do Charlotte Hornets" else None
+    try:
+        league_games = projections.get_league_player_games(seasons, team_abbreviations=team_abbreviations)
+    except Exception as e:
+        st.error(f"Erro ao buscar os jogos dos jogadores: {e}")
+        league_games = pd.DataFrame()
+
+    batch_models = projections.fit_player_models(league_games) if not league_games.empty else pd.DataFrame()
+    if batch_models.empty:
+        st.warning(f"Nenhum jogador com pelo menos {projections.MIN_GAMES} jogos nas temporadas selecionadas.")
+    else:
+        grid = projections.make_grid(
+            MIN=range(min_range[0], min_range[1] + 1, 2),
+            FGA=range(fga_range[0], fga_range[1] + 1),
+            TOV=range(tov_range[0], tov_range[1] + 1),
+        )
+        batch_projections = projections.score_grid(batch_models, grid)
+
+        st.subheader("📌 Métricas dos Modelos")
+        st.dataframe(batch_models[["PLAYER_NAME", "TARGET", "GAMES", "MAE", "R2"]], use_container_width=True)
+
+        st.subheader(f"📌 Projeções ({len(batch_projections):,} previsões)")
+        batch_player = st.selectbox("Jogador", sorted(batch_models["PLAYER_NAME"].unique()))
+        batch_target = st.selectbox("Alvo", targets)
+        st.dataframe(
+            projections.query_projections(batch_projections, player_name=batch_player, target=batch_target),
+            use_container_width=True,
+        )
+
+# Painel de desempenho (com NBA_DEBUG_PANEL=1 ou ?debug=1 na URL)
+show_debug_panel()
@@ -3,63 +3,37 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from nba_api.stats.endpoints import playergamelog
-from sklearn.model_selection import train_test_split
-from sklearn.linear_model import LogisticRegression
-from sklearn.metrics import confusion_matrix, roc_curve, auc
+from utils import regression
+from utils.players import hornets_players
+from utils.debug_panel import show_debug_panel
+from utils.instrumentation import instrument
 
 # 📌 Dicionário de jogadores e IDs na NBA API
-players = {
-    "LaMelo Ball": 1630163,
-    "Brandon Miller": 1641706,
-    "Moussa Diabate": 1631217
-}
+players = hornets_players
 
 # 📌 Variáveis independentes (features) e dependentes (target)
-features = ["MIN", "FGA", "TOV"]  # Tempo de quadra, arremessos tentados e turnovers
-targets = ["PTS", "AST", "REB"]   # Pontos, assistências e rebotes
+features = regression.FEATURES  # Tempo de quadra, arremessos tentados e turnovers
+targets = regression.TARGETS    # Pontos, assistências e rebotes
 
 # 📌 Função para coletar dados dos jogos dos jogadores
+@instrument()
 def get_player_data(player_id, seasons):
-    all_data = []
-    for season in seasons:
-        try:
-            log = playergamelog.PlayerGameLog(player_id=player_id, season=season).get_data_frames()[0]
-            log = log[["MIN", "FGA", "TOV", "PTS", "AST", "REB"]]
-            all_data.append(log)
-        except Exception as e:
-            st.warning(f"Erro ao buscar dados para o jogador {player_id} na temporada {season}: {e}")
-    
-    if all_data:
-        return pd.concat(all_data, ignore_index=True)
-    return pd.DataFrame()
+    player_df, errors = regression.load_player_data(player_id, seasons)
+    for season, error in errors.items():
+        st.warning(f"Erro ao buscar dados para o jogador {player_id} na temporada {season}: {error}")
+    return player_df
 
-# 📌 Coletar dados para os jogadores
+# 📌 Temporadas usadas no treino
 seasons = ["2023-24", "2024-25"]
-player_data = {name: get_player_data(pid, seasons) for name, pid in players.items()}
-
-# 📌 Função para treinar o modelo de regressão logística
-def train_model(df, feature_cols, target_col):
-    X = df[feature_cols]
-    y = (df[target_col] > df[target_col].mean()).astype(int)  # Classificação: 1 se acima da média, 0 se abaixo
-    
-    # Divisão treino/teste
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-    
-    model = LogisticRegression()
-    model.fit(X_train, y_train)
-    
-    y_pred = model.predict(X_test)
-    y_pred_prob = model.predict_proba(X_test)[:, 1]
-    
-    return model, X_test, y_test, y_pred, y_pred_prob
 
 # 📌 Criar interface no Streamlit
 st.title("📊 Previsão de Desempenho dos Jogadores do Charlotte Hornets")
 
 # Seleção de jogador
 player_name = st.selectbox("Escolha um jogador", list(players.keys()))
-player_df = player_data[player_name]
+
+# 📌 Coletar dados apenas do jogador selecionado
+player_df = get_player_data(players[player_name], seasons)
 
 if player_df.empty:
     st.warning("Nenhum dado disponível para este jogador.")
@@ -71,11 +45,16 @@ else:
     models = {}
     predictions = {}
 
+    # Modelos já treinados com os mesmos dados são reaproveitados entre reruns
+    fits = regression.get_logistic_fits(player_name, seasons, player_df, features, targets)
     for target in targets:
-        model, X_test, y_test, y_pred, y_pred_prob = train_model(player_df, features, target)
+        model, X_test, y_test, y_pred, y_pred_prob = fits[target]
         models[target] = model
         predictions[target] = (y_test, y_pred, y_pred_prob)
 
+    # 📌 As métricas do scikit-learn só são importadas quando há um modelo para avaliar
+    from sklearn.metrics import confusion_matrix, roc_curve, auc
+
     # 📌 Matriz de Confusão
     st.subheader("📊 Matriz de Confusão")
     for target in targets:
@@ -123,3 +102,6 @@ else:
 
         fig_coef = px.bar(coef_df, x="Variável", y="Coeficiente", title=f"Coeficientes do Modelo - {target}")
         st.plotly_chart(fig_coef)
+
+# Painel de desempenho (com NBA_DEBUG_PANEL=1 ou ?debug=1 na URL)
+show_debug_panel()
@@ -1,11 +1,19 @@
+from functools import partial
+
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from nba_api.stats.endpoints import playergamelog, commonplayerinfo
+from utils.api import get_data_frames
+from utils.sync import get_player_game_log
+from utils.enrich import ENRICHED_COLUMNS
+from utils.players import hornets_players
+from utils.fetch import fetch_all
+from utils.summaries import calculate_statistics
+from utils.figures import box_figure, cached_figure, histogram_figure
 from datetime import datetime
 import os
+from utils.debug_panel import show_debug_panel
+from utils.instrumentation import instrument
 
 # Funções auxiliares para conversões
 def convert_height_inches_to_meters(height_inches):
@@ -14,9 +22,10 @@ def convert_height_inches_to_meters(height_inches):
 def convert_weight_pounds_to_kg(weight_pounds):
     return round(weight_pounds * 0.453592, 1)
 
+@instrument()
 def get_player_data(player_id):
     """Obtém os dados básicos do jogador."""
-    player_info = commonplayerinfo.CommonPlayerInfo(player_id=player_id).get_data_frames()[0]
+    player_info = get_data_frames("commonplayerinfo", player_id=player_id)[0]
     birth_date = datetime.strptime(player_info.loc[0, "BIRTHDATE"], "%Y-%m-%dT%H:%M:%S")
     today = datetime.today()
     idade = today.year - birth_date.year - ((today.month, today.day) < (birth_date.month, birth_date.day))
@@ -36,9 +45,10 @@ def get_player_data(player_id):
         "Salário": "Não disponível na API"
     }
 
+@instrument()
 def get_game_log(player_id, season='2024-25'):
     """Obtém o log de jogos do jogador para a temporada especificada."""
-    log = playergamelog.PlayerGameLog(player_id=player_id, season=season).get_data_frames()[0]
+    log = get_player_game_log(player_id, season)
     log = log.rename(columns={
         "GAME_DATE": "Data do Jogo",
         "MATCHUP": "Adversário",
@@ -48,29 +58,17 @@ def get_game_log(player_id, season='2024-25'):
         "AST": "Assistências",
         "MIN": "Minutos em Quadra"
     })
-    log["Casa/Fora"] = log["Adversário"].apply(lambda x: "Casa" if "vs." in x else "Fora")
-    log["Adversário"] = log["Adversário"].str.split().str[-1]
-    return log
-
-def calculate_statistics(df):
-    """Calcula estatísticas relevantes a partir do DataFrame."""
-    statistics = []
-    for column in ["Pontos", "Rebotes", "Assistências"]:
-        statistics.append({
-            "Estatística": column,
-            "Média": round(df[column].mean(), 2),
-            "Mediana": round(df[column].median(), 2),
-            "Moda": int(df[column].mode()[0]),
-            "Desvio Padrão": round(df[column].std(), 2)
-        })
-    return pd.DataFrame(statistics)
+    log["Casa/Fora"] = np.where(log["IS_HOME"], "Casa", "Fora")
+    log["Adversário"] = log["OPPONENT"]
+    # A tabela de jogos mostra só as colunas do log original
+    return log.drop(columns=ENRICHED_COLUMNS, errors="ignore")
 
 # Configuração da página
 st.set_page_config(page_title="NBA Player Analysis", layout="wide")
 st.title("🏀 Peformances de Jogadores da NBA")
 
 # Seleção de jogador
-player_ids = {"LaMelo Ball": 1630163, "Brandon Miller": 1641706, "Moussa Diabate": 1631217}
+player_ids = hornets_players
 player_images = {
     "LaMelo Ball": "img/lamello.png",
     "Brandon Miller": "img/brandon.png",
@@ -87,13 +85,19 @@ if image_path and os.path.exists(image_path):
 else:
     st.warning(f"Imagem não encontrada para {player_name}")
 
-# Dados do jogador
-dados_jogador = get_player_data(player_id)
+# Dados do jogador: informações e log de jogos do jogador são buscados em paralelo
+fetched = fetch_all({"info": partial(get_player_data, player_id), "log": partial(get_game_log, player_id)}, return_exceptions=True)
+dados_jogador = fetched["info"]
 st.subheader(f"📌 Informações de {player_name}")
-st.table(pd.DataFrame([dados_jogador]))
+if isinstance(dados_jogador, Exception):
+    st.warning(f"Informações de {player_name} indisponíveis: {dados_jogador}")
+else:
+    st.table(pd.DataFrame([dados_jogador]))
 
 # Log de jogos
-df_jogos = get_game_log(player_id)
+df_jogos = fetched["log"]
+if isinstance(df_jogos, Exception):
+    raise df_jogos
 st.subheader("📊 Estatísticas da Temporada Atual")
 st.dataframe(df_jogos, use_container_width=True)
 
@@ -105,16 +109,17 @@ st.table(estatisticas_df)
 # Gráficos
 st.subheader("📊 Gráficos de Desempenho")
 
-# Gráfico de distribuição de pontos, rebotes e assistências
+# Gráfico de distribuição de pontos, rebotes e assistências (faixas calculadas no servidor; a
+# figura só é montada de novo quando o log do jogador muda)
 for stat in ["Pontos", "Rebotes", "Assistências"]:
-    fig = px.histogram(df_jogos, x=stat, nbins=10, title=f"Distribuição de {stat}")
+    fig = cached_figure("distribuicao", histogram_figure, df_jogos[stat], nbins=10, title=f"Distribuição de {stat}", x_title=stat)
     st.plotly_chart(fig, use_container_width=True)
 
 # Box Plot
-fig_box = go.Figure()
-for stat in ["Pontos", "Rebotes", "Assistências"]:
-    fig_box.add_trace(go.Box(y=df_jogos[stat], name=stat))
-fig_box.update_layout(title="Box Plot - Pontos, Rebotes e Assistências")
+fig_box = cached_figure(
+    "box", box_figure, {stat: df_jogos[stat] for stat in ["Pontos", "Rebotes", "Assistências"]},
+    title="Box Plot - Pontos, Rebotes e Assistências",
+)
 st.plotly_chart(fig_box, use_container_width=True)
 
 # Comparação da carreira
@@ -125,3 +130,6 @@ df_carreira = pd.DataFrame({
     "Carreira": [82, 20, 7, 5, 30]  # Exemplo de valores médios da carreira
 })
 st.table(df_carreira)
+
+# Painel de desempenho (com NBA_DEBUG_PANEL=1 ou ?debug=1 na URL)
+show_debug_panel()
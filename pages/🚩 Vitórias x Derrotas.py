@@ -1,69 +1,90 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from nba_api.stats.endpoints import leaguegamefinder
-
-# Lista de times da NBA
-nba_teams = {
-    "ATL": "Atlanta Hawks", "BOS": "Boston Celtics", "BKN": "Brooklyn Nets", "CHA": "Charlotte Hornets",
-    "CHI": "Chicago Bulls", "CLE": "Cleveland Cavaliers", "DAL": "Dallas Mavericks", "DEN": "Denver Nuggets",
-    "DET": "Detroit Pistons", "GSW": "Golden State Warriors", "HOU": "Houston Rockets", "IND": "Indiana Pacers",
-    "LAC": "Los Angeles Clippers", "LAL": "Los Angeles Lakers", "MEM": "Memphis Grizzlies", "MIA": "Miami Heat",
-    "MIL": "Milwaukee Bucks", "MIN": "Minnesota Timberwolves", "NOP": "New Orleans Pelicans", "NYK": "New York Knicks",
-    "OKC": "Oklahoma City Thunder", "ORL": "Orlando Magic", "PHI": "Philadelphia 76ers", "PHX": "Phoenix Suns",
-    "POR": "Portland Trail Blazers", "SAC": "Sacramento Kings", "SAS": "San Antonio Spurs", "TOR": "Toronto Raptors",
-    "UTA": "Utah Jazz", "WAS": "Washington Wizards"
-}
-
-# Função para buscar jogos por temporada de um time específico
-def get_team_games(team_abbreviation, season):
+from utils import form
+from utils import games as games_store
+from utils.summaries import calculate_team_totals
+from utils.seasons import DEFAULT_SEASONS, available_seasons, season_range
+from utils.teams import nba_teams
+from utils.figures import MAX_LINE_POINTS, cached_figure, downsample
+from utils.debug_panel import show_debug_panel
+from utils.instrumentation import instrument
+
+# Função para buscar os jogos de um time específico em um período de temporadas
+@instrument()
+def get_team_games(team_abbreviation, seasons):
     try:
-        gamefinder = leaguegamefinder.LeagueGameFinder(season_nullable=season)
-        games = gamefinder.get_data_frames()[0]
-        return games[games['TEAM_ABBREVIATION'] == team_abbreviation]
+        return games_store.get_team_games_range(team_abbreviation, seasons)
     except Exception as e:
-        st.error(f"Erro ao buscar jogos para {team_abbreviation} na temporada {season}: {e}")
+        st.error(f"Erro ao buscar jogos para {team_abbreviation} nas temporadas {seasons[0]} a {seasons[-1]}: {e}")
         return pd.DataFrame()
 
-# Função para calcular os totais de vitórias e derrotas
-def calculate_team_totals(team_games):
-    if team_games.empty:
-        return {}
-
-    team_games['Home/Away'] = team_games['MATCHUP'].apply(lambda x: 'Home' if 'vs.' in x else 'Away')
-
-    totals = {
-        "Total Wins": (team_games['WL'] == 'W').sum(),
-        "Total Home Wins": ((team_games['WL'] == 'W') & (team_games['Home/Away'] == 'Home')).sum(),
-        "Total Away Wins": ((team_games['WL'] == 'W') & (team_games['Home/Away'] == 'Away')).sum(),
-        "Total Losses": (team_games['WL'] == 'L').sum(),
-        "Total Home Losses": ((team_games['WL'] == 'L') & (team_games['Home/Away'] == 'Home')).sum(),
-        "Total Away Losses": ((team_games['WL'] == 'L') & (team_games['Home/Away'] == 'Away')).sum(),
-    }
-    return totals
+# Gráfico de barras com a contagem de vitórias e derrotas (contagem feita no servidor, não no navegador)
+def build_results_figure(results):
+    counts = results.value_counts().reindex(["W", "L"], fill_value=0)
+    return px.bar(x=counts.index, y=counts.to_numpy(), color=counts.index, color_discrete_map={"W": "green", "L": "red"},
+                  labels={"x": "WL", "y": "count", "color": "WL"})
+
+# Gráfico da sequência (positiva para vitórias, negativa para derrotas) jogo a jogo
+def build_streak_figure(team_form):
+    if len(team_form) > MAX_LINE_POINTS:
+        # Períodos longos: uma barra por sequência, da data do primeiro ao último jogo dela (nenhuma sequência some)
+        runs = form.streak_runs(team_form)
+        fig = go.Figure(go.Bar(
+            x=runs["START_DATE"],
+            y=runs["STREAK"],
+            width=(runs["END_DATE"] - runs["START_DATE"] + pd.Timedelta(days=1)).dt.total_seconds() * 1000,
+            offset=0,
+            marker_color=np.where(runs["STREAK"] > 0, "green", "red"),
+            customdata=runs[["END_DATE", "GAMES"]],
+            hovertemplate="%{x|%d/%m/%Y} a %{customdata[0]|%d/%m/%Y}<br>Sequência: %{y} (%{customdata[1]} jogos)<extra></extra>",
+        ))
+    else:
+        fig = go.Figure(go.Bar(
+            x=team_form["GAME_DATE"],
+            y=team_form["STREAK"],
+            marker_color=np.where(team_form["STREAK"] > 0, "green", "red"),
+            customdata=team_form[["MATCHUP", "WL", "GAME_NUMBER"]].astype(str),
+            hovertemplate="%{x|%d/%m/%Y} - jogo %{customdata[2]}<br>%{customdata[0]} (%{customdata[1]})<br>Sequência: %{y}<extra></extra>",
+        ))
+    fig.update_layout(
+        title="Sequência de Vitórias (+) e Derrotas (-)",
+        xaxis_title="Data do Jogo",
+        yaxis_title="Sequência",
+    )
+    return fig
+
+# Gráfico da % de vitórias e do saldo de pontos médio na janela móvel
+def build_rolling_figure(team_form):
+    win_pct = downsample(team_form, "GAME_DATE", "ROLLING_WIN_PCT")
+    plus_minus = downsample(team_form, "GAME_DATE", "ROLLING_PLUS_MINUS")
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=win_pct["GAME_DATE"], y=win_pct["ROLLING_WIN_PCT"], mode="lines",
+                             name="% de Vitórias", line=dict(color="green")))
+    fig.add_trace(go.Scatter(x=plus_minus["GAME_DATE"], y=plus_minus["ROLLING_PLUS_MINUS"], mode="lines",
+                             name="Saldo de Pontos", line=dict(color="royalblue"), yaxis="y2"))
+    fig.update_layout(
+        xaxis_title="Data do Jogo",
+        yaxis=dict(title="% de Vitórias", tickformat=".0%", range=[0, 1]),
+        yaxis2=dict(title="Saldo de Pontos por Jogo", overlaying="y", side="right", zeroline=True),
+        hovermode="x unified",
+    )
+    return fig
 
 # Configuração do Streamlit
-st.title("🏀 Estatísticas de Times da NBA - Temporadas 2023-24 e 2024-25")
+st.title("🏀 Estatísticas de Times da NBA")
 
 # Seleção do time
 team_abbreviation = st.selectbox("Selecione um time:", options=list(nba_teams.keys()), format_func=lambda x: nba_teams[x])
 
-# Seleção da temporada
-season_options = ["2023-24", "2024-25", "Todas as Temporadas"]
-selected_season = st.selectbox("Selecione a temporada:", season_options)
-
-# Buscar jogos das temporadas 2023-24 e 2024-25
-games_2023_24 = get_team_games(team_abbreviation, "2023-24")
-games_2024_25 = get_team_games(team_abbreviation, "2024-25")
+# Seleção do período (primeira e última temporada; iguais para uma temporada só)
+first_season, last_season = st.select_slider("Selecione as temporadas:", options=available_seasons(), value=DEFAULT_SEASONS)
+selected_season = first_season if first_season == last_season else f"{first_season} a {last_season}"
 
-# Filtrar os dados com base na temporada selecionada
-if selected_season == "2023-24":
-    all_games = games_2023_24
-elif selected_season == "2024-25":
-    all_games = games_2024_25
-else:
-    all_games = pd.concat([games_2023_24, games_2024_25])
+# Buscar os jogos do time no período (só as linhas do time são lidas do armazenamento)
+all_games = get_team_games(team_abbreviation, season_range(first_season, last_season))
 
 # Calcular os totais
 team_totals = calculate_team_totals(all_games)
@@ -76,26 +97,20 @@ if team_totals:
     totals_df = pd.DataFrame(team_totals.items(), columns=["Categoria", "Valor"])
     st.dataframe(totals_df, use_container_width=True)
 
-    # Exibir gráfico de barras
-    st.bar_chart(totals_df.set_index("Categoria"))
+    # Exibir gráfico de barras (com o Plotly, que a página já usa; o st.bar_chart carregaria o Altair)
+    st.plotly_chart(go.Figure(go.Bar(x=totals_df["Categoria"], y=totals_df["Valor"], name="Valor")))
 else:
     st.warning(f"Nenhum dado encontrado para o {nba_teams[team_abbreviation]} na temporada {selected_season}.")
 
 # Processamento dos dados
 if not all_games.empty:
-    all_games["Home"] = all_games["MATCHUP"].apply(lambda x: "Home" if "vs." in x else "Away")
-    all_games["Win"] = all_games["WL"].apply(lambda x: 1 if x == "W" else 0)
-    all_games["Loss"] = all_games["WL"].apply(lambda x: 1 if x == "L" else 0)
-    all_games["Points_Scored"] = all_games["PTS"]
-    all_games["Points_Allowed"] = all_games["PTS"] - all_games["PLUS_MINUS"]
-
-    # Estatísticas para gráficos
-    wins = all_games["Win"].sum()
-    losses = all_games["Loss"].sum()
-    wins_home = all_games[all_games["Home"] == "Home"]["Win"].sum()
-    wins_away = all_games[all_games["Home"] == "Away"]["Win"].sum()
-    losses_home = all_games[all_games["Home"] == "Home"]["Loss"].sum()
-    losses_away = all_games[all_games["Home"] == "Away"]["Loss"].sum()
+    # Estatísticas para gráficos (os mesmos totais calculados acima)
+    wins = team_totals["Total Wins"]
+    losses = team_totals["Total Losses"]
+    wins_home = team_totals["Total Home Wins"]
+    wins_away = team_totals["Total Away Wins"]
+    losses_home = team_totals["Total Home Losses"]
+    losses_away = team_totals["Total Away Losses"]
 
     # Gráfico 1: Barras Empilhadas de Vitórias e Derrotas
     st.subheader("Vitórias e Derrotas Totais")
@@ -114,7 +129,7 @@ if not all_games.empty:
 
     # Gráfico 3: Histograma de Vitórias e Derrotas
     st.subheader("Frequência de Vitórias e Derrotas")
-    fig3 = px.histogram(all_games, x="WL", nbins=2, color="WL", color_discrete_map={"W": "green", "L": "red"})
+    fig3 = cached_figure("frequencia_resultados", build_results_figure, all_games["WL"].astype(str))
     st.plotly_chart(fig3)
 
     # Gráfico 4: Gráfico de Pizza
@@ -128,55 +143,29 @@ if not all_games.empty:
                   color_discrete_sequence=px.colors.sequential.RdBu)
     st.plotly_chart(fig4)
 
-    # Gráfico 5: Gráfico de Linhas (Sequência de Vitórias e Derrotas)
+    # Sequências e forma recente (temporada regular, em ordem de data; recomeçam a cada temporada)
     st.subheader("Sequência de Vitórias e Derrotas")
-
-    # Adicionar uma coluna para o número do jogo
-    all_games["Game_Number"] = range(1, len(all_games) + 1)
-
-    # Criar uma coluna para o resultado do jogo (Vitória ou Derrota)
-    all_games["Result"] = all_games["WL"].apply(lambda x: "Vitória" if x == "W" else "Derrota")
-
-    # Criar o gráfico de linhas
-    fig5 = go.Figure()
-
-    # Adicionar linha para vitórias
-    fig5.add_trace(
-        go.Scatter(
-            x=all_games["Game_Number"],
-            y=all_games["Win"],
-            mode='lines+markers',
-            name="Vitórias",
-            line=dict(color="green"),
-            marker=dict(symbol="circle", size=8)
-        )
-    )
-
-    # Adicionar linha para derrotas
-    fig5.add_trace(
-        go.Scatter(
-            x=all_games["Game_Number"],
-            y=all_games["Loss"],
-            mode='lines+markers',
-            name="Derrotas",
-            line=dict(color="red"),
-            marker=dict(symbol="x", size=8)
-        )
-    )
-
-    # Configurações do layout
-    fig5.update_layout(
-        title="Sequência de Vitórias e Derrotas",
-        xaxis_title="Número do Jogo",
-        yaxis_title="Resultado",
-        yaxis=dict(
-            tickmode="array",
-            tickvals=[0, 1],
-            ticktext=["Derrota", "Vitória"]
-        ),
-        legend_title="Resultado",
-        hovermode="x unified"
-    )
-
-    # Exibir o gráfico
-    st.plotly_chart(fig5)
\ No newline at end of file
+    window = st.slider("Janela da forma recente (jogos):", min_value=3, max_value=20, value=form.WINDOW)
+    # Calculada a partir dos jogos do time já buscados acima, sem carregar as temporadas da liga
+    team_form = form.team_form(all_games, window)
+
+    if team_form.empty:
+        st.warning(f"Nenhum jogo da temporada regular para o {nba_teams[team_abbreviation]} na temporada {selected_season}.")
+    else:
+        current = team_form["STREAK"].iloc[-1]
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Sequência Atual", f"{abs(current)} {'vitórias' if current > 0 else 'derrotas'}")
+        col2.metric("Maior Sequência de Vitórias", max(int(team_form["STREAK"].max()), 0))
+        col3.metric("Maior Sequência de Derrotas", max(-int(team_form["STREAK"].min()), 0))
+
+        # Gráfico 5: Sequência jogo a jogo (as figuras só são montadas de novo quando a forma do time muda)
+        fig5 = cached_figure("sequencia", build_streak_figure, team_form[["GAME_DATE", "STREAK", "MATCHUP", "WL", "GAME_NUMBER"]])
+        st.plotly_chart(fig5)
+
+        # Gráfico 6: % de vitórias e saldo de pontos médio na janela móvel
+        st.subheader(f"Forma Recente (últimos {window} jogos)")
+        fig6 = cached_figure("forma_recente", build_rolling_figure, team_form[["GAME_DATE", "ROLLING_WIN_PCT", "ROLLING_PLUS_MINUS"]])
+        st.plotly_chart(fig6)
+
+# Painel de desempenho (com NBA_DEBUG_PANEL=1 ou ?debug=1 na URL)
+show_debug_panel()
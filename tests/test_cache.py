@@ -0,0 +1,122 @@
+"""Cache em disco: expiração, resposta antiga quando a API falha, limpeza LRU e a soma dos bytes gravados."""
+import os
+import time
+
+import pandas as pd
+import pytest
+
+from utils import cache
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(cache, "_total_bytes", None)
+    return tmp_path
+
+
+class Clock:
+    """Relógio falso para o `time.time` usado pelo cache (começa na hora atual: `date.today()` também o usa)."""
+
+    def __init__(self):
+        self.now = time.time()
+
+    def __call__(self):
+        return self.now
+
+
+class Fetch:
+    """Busca falsa: conta as chamadas e devolve um DataFrame com o número da chamada."""
+
+    def __init__(self, rows=3):
+        self.calls = 0
+        self.rows = rows
+
+    def __call__(self):
+        self.calls += 1
+        return [pd.DataFrame({"CALL": [self.calls] * self.rows, "PTS": range(self.rows)})]
+
+
+def _fail():
+    raise ConnectionError("API fora do ar")
+
+
+def test_current_season_response_expires_after_ttl(cache_dir, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache.time, "time", clock)
+    params = {"team_id": 1, "season": "2099-00"}
+    fetch = Fetch()
+
+    assert cache.cached_data_frames("teamgamelog", params, fetch)[0]["CALL"].iloc[0] == 1
+    clock.now += cache.CURRENT_SEASON_TTL - 1
+    assert cache.cached_data_frames("teamgamelog", params, fetch)[0]["CALL"].iloc[0] == 1
+    assert fetch.calls == 1
+
+    clock.now += 2
+    assert cache.cached_data_frames("teamgamelog", params, fetch)[0]["CALL"].iloc[0] == 2
+    assert fetch.calls == 2
+
+
+def test_past_season_never_expires(cache_dir, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache.time, "time", clock)
+    params = {"team_id": 1, "season": "2020-21"}
+    fetch = Fetch()
+
+    cache.cached_data_frames("teamgamelog", params, fetch)
+    clock.now += 365 * 24 * 60 * 60
+    cache.cached_data_frames("teamgamelog", params, fetch)
+    assert fetch.calls == 1
+
+
+def test_expired_response_is_served_when_refetch_fails(cache_dir, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache.time, "time", clock)
+    params = {"player_id": 7}
+    expected = cache.cached_data_frames("commonplayerinfo", params, Fetch())[0]
+
+    clock.now += cache.ENDPOINT_TTLS["commonplayerinfo"] + 1
+    pd.testing.assert_frame_equal(cache.cached_data_frames("commonplayerinfo", params, _fail)[0], expected)
+
+    # Sem cópia em disco, o erro da API chega a quem chamou
+    with pytest.raises(ConnectionError):
+        cache.cached_data_frames("commonplayerinfo", {"player_id": 8}, _fail)
+
+
+def _store(key_number, mtime):
+    params = {"player_id": key_number}
+    cache.cached_data_frames("commonplayerinfo", params, Fetch(rows=200))
+    key = cache.make_key("commonplayerinfo", params)
+    os.utime(cache._meta_path(key), (mtime, mtime))
+    return key
+
+
+def test_evict_removes_least_recently_used_first(cache_dir):
+    keys = [_store(number, mtime=1000 + number) for number in range(4)]
+    # Ler a resposta mais antiga a torna a mais recente
+    os.utime(cache._meta_path(keys[0]), (2000, 2000))
+    sizes = {key: sum(path.stat().st_size for path in cache_dir.glob(f"{key}.*")) for key in keys}
+
+    total = cache.evict(max_bytes=sizes[keys[0]] + sizes[keys[3]])
+
+    remaining = {path.stem for path in cache_dir.glob("*.json")}
+    assert remaining == {keys[0], keys[3]}
+    assert total == sizes[keys[0]] + sizes[keys[3]]
+    assert not list(cache_dir.glob(f"{keys[1]}.*"))
+
+
+def test_written_bytes_are_summed_until_the_limit(cache_dir, monkeypatch):
+    monkeypatch.setattr(cache, "MAX_CACHE_BYTES", 10 ** 9)
+    _store(1, mtime=1000)
+    # A primeira gravação mede o diretório inteiro
+    measured = sum(path.stat().st_size for path in cache_dir.iterdir())
+    assert cache._total_bytes == measured
+
+    _store(2, mtime=1001)
+    assert cache._total_bytes == sum(path.stat().st_size for path in cache_dir.iterdir())
+
+    # Passando do limite, a gravação seguinte limpa o cache e a soma volta a ser medida
+    monkeypatch.setattr(cache, "MAX_CACHE_BYTES", measured)
+    _store(3, mtime=1002)
+    assert cache._total_bytes == sum(path.stat().st_size for path in cache_dir.iterdir()) <= measured
+    assert len(list(cache_dir.glob("*.json"))) == 1
@@ -0,0 +1,41 @@
+"""A comparação da liga deve dar o mesmo que uma agregação agrupada feita à mão."""
+import numpy as np
+import pandas as pd
+
+from utils import comparison
+
+
+def _season_games(season):
+    rng = np.random.default_rng(int(season[:4]))
+    teams = ["CHA", "BOS", "ATL", "MIA"]
+    rows = []
+    for number in range(20):
+        for team in teams:
+            fgm = int(rng.integers(30, 50))
+            rows.append({
+                "TEAM_ABBREVIATION": team, "GAME_ID": f"{number:05d}", "PTS": int(rng.integers(90, 130)),
+                "REB": int(rng.integers(30, 60)), "OREB": int(rng.integers(5, 15)), "DREB": int(rng.integers(20, 40)),
+                "FGM": fgm, "FG3M": int(rng.integers(5, 20)), "FTM": int(rng.integers(5, 25)),
+            })
+    games = pd.DataFrame(rows)
+    return games.astype({"TEAM_ABBREVIATION": "category"})
+
+
+def test_compare_league_matches_manual_groupby(monkeypatch):
+    monkeypatch.setattr(comparison.games_store, "get_season_games", _season_games)
+    seasons = ["2022-23", "2023-24"]
+
+    result = comparison.compare_league(seasons, comparison.REBOUNDS_AND_SCORING_METRICS)
+
+    games = pd.concat([_season_games(season).assign(SEASON=season) for season in seasons], ignore_index=True)
+    games["FG2M"] = games["FGM"] - games["FG3M"]
+    expected = games.groupby(["TEAM_ABBREVIATION", "SEASON"], observed=True).agg(
+        **{name: (column, aggregation) for name, (column, aggregation) in comparison.REBOUNDS_AND_SCORING_METRICS.items()}
+    )
+    expected = expected.reset_index().melt(id_vars=["TEAM_ABBREVIATION", "SEASON"], var_name="Categoria", value_name="Valor")
+
+    keys = ["TEAM_ABBREVIATION", "SEASON", "Categoria"]
+    result = result.astype({"TEAM_ABBREVIATION": str}).sort_values(keys).reset_index(drop=True)
+    expected = expected.astype({"TEAM_ABBREVIATION": str}).sort_values(keys).reset_index(drop=True)
+    assert len(result) == 4 * len(seasons) * len(comparison.REBOUNDS_AND_SCORING_METRICS)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
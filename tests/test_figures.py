@@ -0,0 +1,20 @@
+"""O LTTB de `utils.figures` deve manter as pontas e os picos da série com no máximo `max_points` pontos."""
+import numpy as np
+
+from utils.figures import lttb_indices
+
+
+def test_lttb_keeps_ends_and_peaks():
+    x = np.arange(1000)
+    y = np.sin(x / 50.0)
+    y[[137, 612]] = [5.0, -5.0]
+
+    indices = lttb_indices(x, y, max_points=50)
+    assert len(indices) == 50
+    assert indices[0] == 0 and indices[-1] == len(x) - 1
+    assert np.all(np.diff(indices) > 0)
+    assert {137, 612} <= set(indices.tolist())
+
+
+def test_lttb_keeps_short_series():
+    np.testing.assert_array_equal(lttb_indices(np.arange(10), np.arange(10), max_points=50), np.arange(10))
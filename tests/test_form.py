@@ -0,0 +1,50 @@
+"""A forma vetorizada de `utils.form` deve dar o mesmo que as janelas móveis do pandas, time a time."""
+import numpy as np
+import pandas as pd
+
+from utils.form import compute_form, rolling_form, streak_runs
+
+
+def _games(rng):
+    frames = []
+    for team, n_games in [("CHA", 30), ("BOS", 17)]:
+        plus_minus = rng.integers(-20, 21, n_games).astype(float)
+        plus_minus[plus_minus == 0] = 1
+        frames.append(pd.DataFrame({
+            "TEAM_ABBREVIATION": team,
+            "GAME_ID": [f"{team}{i:03d}" for i in range(n_games)],
+            "GAME_DATE": pd.date_range("2024-10-22", periods=n_games, freq="2D"),
+            "MATCHUP": f"{team} vs. ATL",
+            "WL": np.where(plus_minus > 0, "W", "L"),
+            "PTS": rng.integers(90, 130, n_games),
+            "PLUS_MINUS": plus_minus,
+        }))
+    # Times intercalados e datas fora de ordem, como na tabela da liga
+    games = pd.concat(frames, ignore_index=True).sample(frac=1, random_state=0).reset_index(drop=True)
+    return games.assign(WIN=games["WL"] == "W")
+
+
+def test_rolling_form_matches_pandas_rolling():
+    games = _games(np.random.default_rng(0))
+    form = rolling_form(compute_form(games), window=5)
+
+    for team, team_form in form.groupby("TEAM_ABBREVIATION"):
+        team_games = games[games["TEAM_ABBREVIATION"] == team].sort_values("GAME_DATE")
+        expected = team_games["WIN"].astype(float).rolling(5, min_periods=1)
+        np.testing.assert_allclose(team_form["ROLLING_WIN_PCT"], expected.mean())
+        np.testing.assert_allclose(team_form["ROLLING_PLUS_MINUS"], team_games["PLUS_MINUS"].rolling(5, min_periods=1).mean())
+        np.testing.assert_array_equal(team_form["ROLLING_GAMES"], expected.count())
+        np.testing.assert_array_equal(team_form["GAME_NUMBER"], np.arange(1, len(team_games) + 1))
+
+
+def test_streak_runs_cover_every_game():
+    games = _games(np.random.default_rng(1))
+    form = compute_form(games[games["TEAM_ABBREVIATION"] == "CHA"])
+    runs = streak_runs(form)
+
+    assert runs["GAMES"].sum() == len(form)
+    # Cada sequência alterna entre vitórias e derrotas e termina no seu tamanho
+    assert np.all(np.sign(runs["STREAK"].to_numpy()[1:]) != np.sign(runs["STREAK"].to_numpy()[:-1]))
+    np.testing.assert_array_equal(np.abs(runs["STREAK"]), runs["GAMES"])
+    assert runs["START_DATE"].iloc[0] == form["GAME_DATE"].iloc[0]
+    assert runs["END_DATE"].iloc[-1] == form["GAME_DATE"].iloc[-1]
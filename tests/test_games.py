@@ -0,0 +1,41 @@
+"""Os jogos novos intercalados na tabela da temporada devem dar a mesma tabela que reconstruí-la do zero."""
+import numpy as np
+import pandas as pd
+
+from utils import games as games_store
+
+
+def _season(n_games, rng):
+    teams = [("CHA", 1), ("BOS", 2), ("ATL", 3), ("MIA", 4)]
+    rows = []
+    for number in range(n_games):
+        (home, home_id), (away, away_id) = [teams[i] for i in rng.choice(len(teams), 2, replace=False)]
+        home_pts, away_pts = rng.integers(90, 130, 2)
+        for team, team_id, matchup, pts, other in [
+            (home, home_id, f"{home} vs. {away}", home_pts, away_pts),
+            (away, away_id, f"{away} @ {home}", away_pts, home_pts),
+        ]:
+            rows.append({
+                "SEASON_ID": "22024", "TEAM_ID": team_id, "TEAM_ABBREVIATION": team,
+                "GAME_ID": f"00224{number:05d}", "GAME_DATE": f"2024-11-{number % 28 + 1:02d}",
+                "MATCHUP": matchup, "WL": "W" if pts > other else "L", "PTS": pts, "PLUS_MINUS": float(pts - other),
+            })
+    return pd.DataFrame(rows)
+
+
+def _as_objects(games):
+    return games.astype({name: object for name in games.columns if isinstance(games[name].dtype, pd.CategoricalDtype)})
+
+
+def test_new_games_are_merged_like_a_rebuild():
+    raw = _season(40, np.random.default_rng(0))
+    stored, new_games = raw.iloc[:-6], raw.iloc[-6:]
+    # Os dois primeiros jogos novos estavam em andamento na sincronização anterior
+    in_progress = new_games.iloc[:2].assign(WL=None, PTS=np.nan)
+    entry = games_store._build_season(pd.concat([stored, in_progress], ignore_index=True))
+
+    merged = games_store._apply_new_games(entry, new_games)
+    rebuilt = games_store._build_season(raw)
+    pd.testing.assert_frame_equal(_as_objects(merged["games"]), _as_objects(rebuilt["games"]))
+    assert merged["teams"] == rebuilt["teams"]
+    assert merged["game_ids"].equals(rebuilt["game_ids"])
@@ -0,0 +1,28 @@
+"""O ajuste em forma fechada de `utils.linear` deve reproduzir o `LinearRegression` do scikit-learn."""
+import numpy as np
+from sklearn.linear_model import LinearRegression
+from sklearn.metrics import mean_absolute_error, r2_score
+from sklearn.model_selection import train_test_split
+
+from utils.linear import fit_grouped
+
+
+def test_fit_grouped_matches_linear_regression():
+    rng = np.random.default_rng(0)
+    sizes = [23, 41]
+    groups = np.repeat([7, 9], sizes)
+    X = rng.normal(size=(len(groups), 3))
+    Y = X @ rng.normal(size=(3, 2)) + rng.normal(scale=0.5, size=(len(groups), 2)) + groups[:, None]
+
+    keys, counts, intercept, coef, mae, r2 = fit_grouped(groups, X, Y)
+    assert keys.tolist() == [7, 9]
+    assert counts.tolist() == sizes
+
+    for i, key in enumerate(keys):
+        X_train, X_test, Y_train, Y_test = train_test_split(X[groups == key], Y[groups == key], test_size=0.2, random_state=42)
+        model = LinearRegression().fit(X_train, Y_train)
+        Y_pred = model.predict(X_test)
+        np.testing.assert_allclose(intercept[i], model.intercept_)
+        np.testing.assert_allclose(coef[i], model.coef_.T)
+        np.testing.assert_allclose(mae[i], mean_absolute_error(Y_test, Y_pred, multioutput="raw_values"))
+        np.testing.assert_allclose(r2[i], r2_score(Y_test, Y_pred, multioutput="raw_values"))
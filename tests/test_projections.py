@@ -0,0 +1,51 @@
+"""O ajuste em lote de `utils.projections` deve dar os mesmos modelos do ajuste por jogador da página."""
+import numpy as np
+import pandas as pd
+
+from utils import projections
+from utils.linear import train_test_fit
+
+
+def _player_games(player_id, season, n_games, rng):
+    dates = pd.date_range(f"{season[:4]}-10-24", periods=n_games, freq="2D")
+    return pd.DataFrame({
+        "PLAYER_ID": player_id,
+        "PLAYER_NAME": f"Jogador {player_id}",
+        "GAME_ID": [f"002{season[2:4]}{i:05d}" for i in range(n_games)],
+        "GAME_DATE": dates,
+        "SEASON": season,
+        "MIN": rng.integers(10, 40, n_games),
+        "FGA": rng.integers(2, 25, n_games),
+        "TOV": rng.integers(0, 6, n_games),
+        "PTS": rng.integers(0, 40, n_games),
+        "AST": rng.integers(0, 12, n_games),
+        "REB": rng.integers(0, 15, n_games),
+    })
+
+
+def test_batch_fit_matches_player_fit():
+    rng = np.random.default_rng(0)
+    seasons = ["2023-24", "2024-25"]
+    games = pd.concat([
+        _player_games(player_id, season, n_games, rng)
+        for season in seasons
+        for player_id, n_games in [(1, 30), (2, 25)]
+    ], ignore_index=True)
+    # Dentro de cada temporada, as linhas chegam fora de ordem, como depois de várias sincronizações do armazenamento
+    games = games.groupby("SEASON", sort=False).sample(frac=1, random_state=1).reset_index(drop=True)
+    models = projections.fit_player_models(games)
+
+    # A página junta as temporadas na ordem pedida, cada uma do jogo mais recente para o mais antigo
+    player = games[games["PLAYER_ID"] == 1]
+    player = pd.concat([
+        player[player["SEASON"] == season].sort_values("GAME_DATE", ascending=False) for season in seasons
+    ])
+    fit = train_test_fit(
+        player[projections.FEATURES].to_numpy(np.float64),
+        player[projections.TARGETS].to_numpy(np.float64),
+    )
+
+    batch = models[models["PLAYER_ID"] == 1].set_index("TARGET").loc[projections.TARGETS]
+    np.testing.assert_allclose(batch["INTERCEPT"], fit["intercept"])
+    np.testing.assert_allclose(batch[[f"COEF_{feature}" for feature in projections.FEATURES]].to_numpy().T, fit["coef"])
+    np.testing.assert_allclose(batch["MAE"], fit["mae"])
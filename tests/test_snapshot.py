@@ -0,0 +1,94 @@
+"""Respostas derivadas dos CSVs de `EDA/`, comparadas com contas feitas à mão, e o uso dos snapshots quando a API falha."""
+import pandas as pd
+import pytest
+
+from utils import api, cache, snapshot
+
+CHA_TEAM_ID = 1610612766
+
+
+def _regular_season(season_id):
+    games = snapshot.league_games()
+    return games[games["SEASON_ID"] == season_id]
+
+
+def test_team_game_log_matches_the_league_games():
+    log = snapshot.get_data_frames("teamgamelog", team_id=CHA_TEAM_ID, season="2023-24")[0]
+    games = _regular_season("22023")
+    games = games[games["TEAM_ID"] == CHA_TEAM_ID]
+
+    assert list(log.columns) == snapshot.TEAM_GAME_LOG_COLUMNS
+    assert sorted(log["Game_ID"]) == sorted(games["GAME_ID"])
+    # Do mais recente para o mais antigo, com as vitórias e derrotas acumuladas
+    dates = pd.to_datetime(log["GAME_DATE"], format="%b %d, %Y")
+    assert dates.is_monotonic_decreasing
+    assert (log.loc[0, "W"], log.loc[0, "L"]) == ((games["WL"] == "W").sum(), (games["WL"] == "L").sum())
+    assert log.loc[0, "W_PCT"] == round(log.loc[0, "W"] / len(games), 3)
+    assert log["PTS"].sum() == games["PTS"].sum()
+
+
+def test_player_career_stats_sums_the_game_logs():
+    games = snapshot.player_games()
+    player_id = int(games["Player_ID"].iloc[0])
+    career = snapshot.get_data_frames("playercareerstats", player_id=player_id)[0]
+
+    player = games[games["Player_ID"] == player_id]
+    expected = player.groupby("SEASON_ID").agg(GP=("Game_ID", "size"), PTS=("PTS", "sum"), REB=("REB", "sum"), AST=("AST", "sum"))
+    assert list(career["SEASON_ID"]) == ["2023-24"] * len(expected)
+    assert (career["PLAYER_ID"] == player_id).all() and (career["LEAGUE_ID"] == "00").all()
+    assert career[["GP", "PTS", "REB", "AST"]].to_numpy().tolist() == expected.to_numpy().tolist()
+
+    with pytest.raises(snapshot.SnapshotUnavailable):
+        snapshot.get_data_frames("playercareerstats", player_id=1)
+
+
+def test_league_standings_count_the_regular_season():
+    standings = snapshot.get_data_frames("leaguestandings", season="2024-25")[0]
+    games = _regular_season("22024")
+    is_home = games["MATCHUP"].str.contains(" vs. ")
+    wins = games[games["WL"] == "W"].groupby("TEAM_ID").size()
+    losses = games[games["WL"] == "L"].groupby("TEAM_ID").size()
+    home_wins = games[(games["WL"] == "W") & is_home].groupby("TEAM_ID").size()
+    home_losses = games[(games["WL"] == "L") & is_home].groupby("TEAM_ID").size()
+
+    assert len(standings) == 30
+    assert standings.groupby("Conference")["PlayoffRank"].apply(sorted).tolist() == [list(range(1, 16))] * 2
+    standings = standings.set_index("TeamID")
+    assert (standings["WINS"] == wins.reindex(standings.index)).all()
+    assert (standings["LOSSES"] == losses.reindex(standings.index)).all()
+    expected_home = home_wins.reindex(standings.index).astype(str) + "-" + home_losses.reindex(standings.index).astype(str)
+    assert (standings["HOME"] == expected_home).all()
+
+
+def test_unsupported_calls_raise_snapshot_unavailable():
+    with pytest.raises(snapshot.SnapshotUnavailable):
+        snapshot.get_data_frames("commonplayerinfo", player_id=1628970)
+    with pytest.raises(snapshot.SnapshotUnavailable):
+        snapshot.get_data_frames("teamgamelog", team_id=CHA_TEAM_ID, season_type_all_star="Playoffs")
+    with pytest.raises(snapshot.SnapshotUnavailable):
+        snapshot.get_data_frames("boxscoretraditionalv2", game_id="0022300001")
+
+
+@pytest.fixture
+def failing_api(tmp_path, monkeypatch):
+    """API sempre fora do ar e cache vazio."""
+    def fetch(endpoint, params):
+        raise ConnectionError("API fora do ar")
+
+    monkeypatch.setattr(cache, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(api, "DATA_SOURCE", "api")
+    monkeypatch.setattr(api, "_fetch", fetch)
+
+
+def test_snapshot_fallback_answers_when_the_api_fails(failing_api, monkeypatch):
+    params = {"team_id": CHA_TEAM_ID, "season": "2023-24"}
+    with pytest.raises(ConnectionError):
+        api.get_data_frames("teamgamelog", **params)
+
+    monkeypatch.setattr(api, "SNAPSHOT_FALLBACK", True)
+    frames = api.get_data_frames("teamgamelog", **params)
+    pd.testing.assert_frame_equal(frames[0], snapshot.get_data_frames("teamgamelog", **params)[0])
+
+    # Sem snapshot para a chamada, o erro da API é o que chega à página
+    with pytest.raises(ConnectionError):
+        api.get_data_frames("commonplayerinfo", player_id=1628970)
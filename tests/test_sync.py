@@ -0,0 +1,33 @@
+"""A sincronização incremental deve substituir as linhas dos jogos que voltam com outros valores."""
+import pandas as pd
+
+from utils import sync
+
+
+def _rows(*games):
+    return pd.DataFrame(
+        [{"GAME_ID": game_id, "TEAM_ID": 1, "GAME_DATE": date, "WL": wl, "PTS": pts} for game_id, date, wl, pts in games]
+    )
+
+
+def test_sync_replaces_games_in_progress(tmp_path, monkeypatch):
+    responses = [
+        _rows(("001", "2024-11-01", "W", 110), ("002", "2024-11-03", None, 54)),
+        # A partir da última data: o jogo em andamento terminou e o do dia anterior não muda
+        _rows(("002", "2024-11-03", "L", 101)),
+        _rows(("002", "2024-11-03", "L", 101), ("003", "2024-11-05", "W", 99)),
+    ]
+    monkeypatch.setattr(sync, "STORE_DIR", tmp_path)
+    # Temporada em andamento: a partição nunca fica completa
+    monkeypatch.setattr(sync, "is_past_season", lambda season: False)
+    monkeypatch.setattr(sync, "get_data_frames", lambda endpoint, **params: [responses.pop(0)])
+
+    sync.sync("league_games", "2024-25")
+    stored, changed = sync.sync("league_games", "2024-25")
+    assert changed["GAME_ID"].tolist() == ["002"]
+    assert stored.set_index("GAME_ID")["WL"].to_dict() == {"001": "W", "002": "L"}
+
+    stored, changed = sync.sync("league_games", "2024-25")
+    assert changed["GAME_ID"].tolist() == ["003"]
+    stored = sync.read_partition(sync.partition_dir("league_games", "2024-25")).set_index("GAME_ID")
+    assert stored["PTS"].to_dict() == {"001": 110, "002": 101, "003": 99}
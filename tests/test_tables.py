@@ -0,0 +1,77 @@
+"""Filtros e paginação da tabela de jogos, comparados com o pandas direto."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.tables import filter_games, page_rows
+
+
+def _games():
+    rng = np.random.default_rng(1)
+    n = 57
+    return pd.DataFrame({
+        "TEAM_ABBREVIATION": pd.Categorical(rng.choice(["CHA", "BOS", "ATL"], n), categories=["CHA", "BOS", "ATL"]),
+        "WL": rng.choice(["W", "L"], n),
+        # Jogos com horário, para conferir que o último dia entra inteiro
+        "GAME_DATE": pd.Timestamp("2024-11-01") + pd.to_timedelta(np.arange(n) * 10, unit="h"),
+        "PTS": rng.integers(90, 130, n).astype(float),
+    })
+
+
+def test_filter_games_combines_value_masks_and_inclusive_dates():
+    games = _games()
+    filtered = filter_games(
+        games, date_column="GAME_DATE", date_range=(pd.Timestamp("2024-11-05").date(), pd.Timestamp("2024-11-12").date()),
+        TEAM_ABBREVIATION=["CHA", "ATL"], WL=["W"], PTS=[],
+    )
+    expected = games[
+        games["TEAM_ABBREVIATION"].isin(["CHA", "ATL"]) & (games["WL"] == "W")
+        & (games["GAME_DATE"] >= "2024-11-05") & (games["GAME_DATE"].dt.normalize() <= "2024-11-12")
+    ]
+    pd.testing.assert_frame_equal(filtered, expected)
+    assert filtered["GAME_DATE"].max().date() == pd.Timestamp("2024-11-12").date()
+
+
+def test_filter_games_without_filters_returns_the_table():
+    games = _games()
+    assert filter_games(games, date_column="GAME_DATE", date_range=(None, None), WL=[]) is games
+    # Período aberto no fim: só a data inicial foi escolhida
+    started = filter_games(games, date_column="GAME_DATE", date_range=(pd.Timestamp("2024-11-20").date(), None))
+    pd.testing.assert_frame_equal(started, games[games["GAME_DATE"] >= "2024-11-20"])
+
+
+@pytest.mark.parametrize("descending", [False, True])
+def test_page_rows_matches_sort_values(descending):
+    games = _games()
+    games.loc[[3, 10, 40], "PTS"] = np.nan
+    rows, total, pages = page_rows(games, "PTS", descending=descending, page=2, page_size=25)
+
+    expected = games.sort_values("PTS", ascending=not descending, kind="stable", na_position="last")
+    assert (total, pages) == (57, 3)
+    pd.testing.assert_frame_equal(rows, expected.iloc[25:50])
+    # Os ausentes ficam no fim nas duas direções
+    last_page, _, _ = page_rows(games, "PTS", descending=descending, page=3, page_size=25)
+    assert len(last_page) == 7 and last_page["PTS"].iloc[-3:].isna().all()
+
+
+def test_page_rows_sorts_categories_by_text():
+    games = _games()
+    games.loc[[0, 1], "TEAM_ABBREVIATION"] = np.nan
+    rows, _, _ = page_rows(games, "TEAM_ABBREVIATION", page=1, page_size=len(games))
+
+    expected = games.assign(TEAM=games["TEAM_ABBREVIATION"].astype(object)).sort_values(
+        "TEAM", kind="stable", na_position="last",
+    ).drop(columns="TEAM")
+    pd.testing.assert_frame_equal(rows, expected)
+
+
+def test_page_rows_clamps_the_page():
+    games = _games()
+    first, _, _ = page_rows(games, page=0, page_size=25)
+    pd.testing.assert_frame_equal(first, games.iloc[:25])
+    last, total, pages = page_rows(games, page=99, page_size=25)
+    pd.testing.assert_frame_equal(last, games.iloc[50:])
+    assert (total, pages) == (57, 3)
+
+    empty, total, pages = page_rows(games.iloc[:0], "PTS", page=5)
+    assert empty.empty and (total, pages) == (0, 1)
@@ -0,0 +1,80 @@
+"""Ponto único de acesso aos endpoints do nba_api usados pelas páginas.
+
+A fonte dos dados é escolhida pela variável de ambiente `NBA_DATA_SOURCE`:
+
+- `api` (padrão): chama o stats.nba.com, passando pelo cache em disco;
+- `snapshot`: responde a partir dos CSVs em `EDA/`, sem acesso à rede.
+
+Com `NBA_SNAPSHOT_FALLBACK=1`, as chamadas que falharem na API (por exemplo
+por limite de requisições) e não tiverem cópia em cache são respondidas
+pelos snapshots, quando eles cobrem a chamada.
+"""
+import importlib
+import logging
+import os
+
+from utils import snapshot
+from utils.cache import cached_data_frames
+from utils.fetch import with_retry
+from utils.instrumentation import instrument, note
+
+logger = logging.getLogger(__name__)
+
+DATA_SOURCE = os.environ.get("NBA_DATA_SOURCE", "api")
+SNAPSHOT_FALLBACK = os.environ.get("NBA_SNAPSHOT_FALLBACK", "0") == "1"
+
+# Nome do módulo do endpoint -> nome da classe no nba_api
+ENDPOINTS = {
+    "leaguegamefinder": "LeagueGameFinder",
+    "playergamelog": "PlayerGameLog",
+    "commonplayerinfo": "CommonPlayerInfo",
+    "playercareerstats": "PlayerCareerStats",
+    "teamgamelog": "TeamGameLog",
+    "leaguestandings": "LeagueStandings",
+}
+
+
+def _fetch(endpoint, params):
+    module = importlib.import_module(f"nba_api.stats.endpoints.{endpoint}")
+    endpoint_class = getattr(module, ENDPOINTS[endpoint])
+
+    def request():
+        response = endpoint_class(**params)
+        note(bytes_fetched=len(response.nba_response.get_response().encode("utf-8")))
+        return response.get_data_frames()
+
+    return with_retry(request)
+
+
+def _api_data_frames(endpoint, params):
+    try:
+        return cached_data_frames(endpoint, params, lambda: _fetch(endpoint, params))
+    except Exception:
+        if not SNAPSHOT_FALLBACK:
+            raise
+        logger.warning("Falha ao buscar %s na API; usando o snapshot", endpoint, exc_info=True)
+        try:
+            return snapshot.get_data_frames(endpoint, **params)
+        except snapshot.SnapshotUnavailable:
+            pass
+        raise
+
+
+def _snapshot_data_frames(endpoint, params):
+    return snapshot.get_data_frames(endpoint, **params)
+
+
+SOURCES = {
+    "api": _api_data_frames,
+    "snapshot": _snapshot_data_frames,
+}
+
+
+@instrument()
+def get_data_frames(endpoint, **params):
+    """Retorna os DataFrames do endpoint a partir da fonte de dados configurada."""
+    if endpoint not in ENDPOINTS:
+        raise ValueError(f"Endpoint não suportado: {endpoint}")
+    if DATA_SOURCE not in SOURCES:
+        raise ValueError(f"Fonte de dados desconhecida: {DATA_SOURCE}")
+    return SOURCES[DATA_SOURCE](endpoint, params)
@@ -0,0 +1,207 @@
+"""Cache em disco das respostas do nba_api.
+
+Cada resposta é identificada pelo nome do endpoint e pelos parâmetros da
+chamada. Os DataFrames são gravados em Parquet (um arquivo por DataFrame) e
+um arquivo JSON ao lado guarda os metadados: quando a resposta foi buscada,
+quantos DataFrames ela tem e um hash do conteúdo.
+
+- Temporadas encerradas nunca expiram; a temporada atual expira em minutos
+  e os demais endpoints seguem o TTL definido em `ENDPOINT_TTLS`.
+- O tamanho total do cache é limitado; as respostas usadas há mais tempo são
+  removidas primeiro (LRU, usando o mtime do JSON como último acesso). O
+  processo soma o tamanho do que grava e só percorre o diretório quando a
+  soma passa do limite.
+- Quando uma resposta expirada não consegue ser atualizada, a cópia antiga é
+  devolvida em vez de quebrar a página.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from utils.instrumentation import note
+from utils.seasons import is_past_season
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = Path(os.environ.get("NBA_CACHE_DIR", Path(__file__).resolve().parent.parent / ".cache" / "nba_api"))
+MAX_CACHE_BYTES = int(os.environ.get("NBA_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+
+# TTL (em segundos) de respostas da temporada atual
+CURRENT_SEASON_TTL = int(os.environ.get("NBA_CACHE_CURRENT_SEASON_TTL", 10 * 60))
+
+# TTL (em segundos) de endpoints cujos parâmetros não indicam uma temporada encerrada
+ENDPOINT_TTLS = {
+    "commonplayerinfo": 24 * 60 * 60,
+    "playercareerstats": 6 * 60 * 60,
+    "leaguestandings": CURRENT_SEASON_TTL,
+}
+DEFAULT_TTL = 60 * 60
+
+SEASON_PARAMS = ("season", "season_nullable")
+
+_lock = threading.Lock()
+# Tamanho do cache em bytes: medido na primeira limpeza e somado a cada gravação (None até lá)
+_total_bytes = None
+
+
+def make_key(endpoint, params):
+    """Gera a chave do cache a partir do endpoint e dos parâmetros."""
+    payload = json.dumps(params, sort_keys=True, default=str)
+    digest = hashlib.sha1(f"{endpoint}:{payload}".encode("utf-8")).hexdigest()[:20]
+    return f"{endpoint}-{digest}"
+
+
+def get_ttl(endpoint, params):
+    """Retorna o TTL em segundos para a chamada, ou None se ela nunca expira."""
+    season = next((params[name] for name in SEASON_PARAMS if params.get(name)), None)
+    if season is not None:
+        return None if is_past_season(season) else CURRENT_SEASON_TTL
+    return ENDPOINT_TTLS.get(endpoint, DEFAULT_TTL)
+
+
+def hash_frames(frames):
+    """Calcula um hash do conteúdo dos DataFrames."""
+    digest = hashlib.sha1()
+    for frame in frames:
+        digest.update(",".join(map(str, frame.columns)).encode("utf-8"))
+        digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _meta_path(key):
+    return CACHE_DIR / f"{key}.json"
+
+
+def _frame_path(key, index):
+    return CACHE_DIR / f"{key}.{index}.parquet"
+
+
+def _read_meta(key):
+    try:
+        with open(_meta_path(key), encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def unique_tmp_path(path):
+    """Arquivo temporário exclusivo do processo e da thread, para duas gravações do mesmo arquivo não se misturarem."""
+    return path.with_name(f"{path.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+
+
+def _write_meta(key, meta):
+    tmp_path = unique_tmp_path(_meta_path(key))
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump(meta, file)
+    os.replace(tmp_path, _meta_path(key))
+    return _meta_path(key).stat().st_size
+
+
+def _read_frames(key, meta):
+    frames = [pd.read_parquet(_frame_path(key, index)) for index in range(meta["frames"])]
+    # Atualizar o mtime do JSON marca a resposta como usada recentemente (LRU)
+    os.utime(_meta_path(key))
+    return frames
+
+
+def _write_frames(key, frames):
+    size = 0
+    for index, frame in enumerate(frames):
+        tmp_path = unique_tmp_path(_frame_path(key, index))
+        frame.to_parquet(tmp_path, index=False)
+        size += tmp_path.stat().st_size
+        os.replace(tmp_path, _frame_path(key, index))
+    return size
+
+
+def is_expired(meta, now=None):
+    """Indica se a resposta gravada já passou do seu TTL."""
+    if meta.get("ttl") is None:
+        return False
+    return (now or time.time()) - meta["fetched_at"] > meta["ttl"]
+
+
+def evict(max_bytes=None):
+    """Remove as respostas menos usadas até o cache caber em `max_bytes`."""
+    global _total_bytes
+    max_bytes = MAX_CACHE_BYTES if max_bytes is None else max_bytes
+    with _lock:
+        entries = []
+        total = 0
+        for meta_path in CACHE_DIR.glob("*.json"):
+            key = meta_path.stem
+            files = [meta_path, *CACHE_DIR.glob(f"{key}.*.parquet")]
+            size = sum(path.stat().st_size for path in files if path.exists())
+            entries.append((meta_path.stat().st_mtime, size, files))
+            total += size
+
+        for _, size, files in sorted(entries, key=lambda entry: entry[0]):
+            if total <= max_bytes:
+                break
+            for path in files:
+                path.unlink(missing_ok=True)
+            total -= size
+        _total_bytes = total
+    return total
+
+
+def _track(written_bytes):
+    """Soma os bytes gravados e limpa o cache só quando a soma passa do limite."""
+    global _total_bytes
+    with _lock:
+        if _total_bytes is not None:
+            # Regravar uma resposta conta os bytes de novo: a soma só superestima, e a limpeza a corrige
+            _total_bytes += written_bytes
+        needs_eviction = _total_bytes is None or _total_bytes > MAX_CACHE_BYTES
+    if needs_eviction:
+        evict()
+
+
+def cached_data_frames(endpoint, params, fetch):
+    """Retorna os DataFrames da chamada, usando o disco sempre que possível.
+
+    `fetch` é chamado sem argumentos quando não há resposta válida em disco e
+    deve devolver a lista de DataFrames do endpoint.
+    """
+    key = make_key(endpoint, params)
+    meta = _read_meta(key)
+
+    if meta is not None and not is_expired(meta):
+        try:
+            frames = _read_frames(key, meta)
+            note(hits=1)
+            return frames
+        except OSError:
+            meta = None
+
+    note(misses=1)
+    try:
+        frames = fetch()
+    except Exception:
+        if meta is None:
+            raise
+        # Resposta expirada, mas a API falhou: melhor mostrar dados antigos do que nada
+        logger.warning("Falha ao atualizar %s; usando a resposta em cache", key, exc_info=True)
+        return _read_frames(key, meta)
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    content_hash = hash_frames(frames)
+    written = 0
+    if meta is None or meta.get("hash") != content_hash or meta.get("frames") != len(frames):
+        written += _write_frames(key, frames)
+    written += _write_meta(key, {
+        "endpoint": endpoint,
+        "params": params,
+        "fetched_at": time.time(),
+        "ttl": get_ttl(endpoint, params),
+        "frames": len(frames),
+        "hash": content_hash,
+    })
+    _track(written)
+    return frames
@@ -0,0 +1,70 @@
+"""Comparação de métricas de times entre temporadas.
+
+As métricas são descritas como `{nome: (coluna, agregação)}` e calculadas em
+uma única agregação agrupada (por time e temporada, por padrão), então o
+mesmo código serve para um time ou para os 30 times e para qualquer
+quantidade de temporadas. O resultado é uma tabela "tidy", com uma linha por
+grupo × métrica.
+"""
+import pandas as pd
+
+from utils import games as games_store
+from utils.instrumentation import instrument
+
+# Colunas derivadas, calculadas só quando alguma métrica as usa
+DERIVED_COLUMNS = {
+    "FG2M": lambda games: games["FGM"] - games["FG3M"],
+}
+
+DEFENSIVE_METRICS = {
+    "Total Steals": ("STL", "sum"),
+    "Total Defensive Rebounds": ("DREB", "sum"),
+    "Average Blocks per Game": ("BLK", "mean"),
+    "Average Turnovers per Game": ("TOV", "mean"),
+    "Average Personal Fouls per Game": ("PF", "mean"),
+}
+
+REBOUNDS_AND_SCORING_METRICS = {
+    "Total Rebounds": ("REB", "sum"),
+    "Total Offensive Rebounds": ("OREB", "sum"),
+    "Total Defensive Rebounds": ("DREB", "sum"),
+    "Total Points": ("PTS", "sum"),
+    "Total 2-Point Field Goals Made": ("FG2M", "sum"),
+    "Total 3-Point Field Goals Made": ("FG3M", "sum"),
+    "Total Free Throws Made": ("FTM", "sum"),
+}
+
+
+@instrument()
+def compare_seasons(games, metrics, by=("TEAM_ABBREVIATION", "SEASON")):
+    """Calcula as métricas por grupo e retorna as colunas de `by`, `Categoria` e `Valor`."""
+    by = list(by)
+    if games.empty:
+        return pd.DataFrame(columns=by + ["Categoria", "Valor"])
+
+    columns = {column for column, _ in metrics.values()}
+    derived = {name: build(games) for name, build in DERIVED_COLUMNS.items() if name in columns}
+    games = games[by + sorted(columns - derived.keys())].assign(**derived)
+
+    aggregated = games.groupby(by, observed=True, sort=False).agg(
+        **{name: (column, aggregation) for name, (column, aggregation) in metrics.items()}
+    )
+    return aggregated.reset_index().melt(id_vars=by, var_name="Categoria", value_name="Valor")
+
+
+def pivot_comparison(comparison, columns="SEASON"):
+    """Tabela larga (uma linha por métrica, uma coluna por valor de `columns`) para exibição."""
+    table = comparison.pivot(index="Categoria", columns=columns, values="Valor")
+    # Mantém a ordem das métricas e das temporadas em vez da ordem alfabética do pivot
+    table = table.reindex(index=comparison["Categoria"].unique(), columns=comparison[columns].unique())
+    table.columns = table.columns.astype(str)
+    return table.rename_axis(columns=None).reset_index()
+
+
+def compare_league(seasons, metrics):
+    """Métricas de todos os times em cada temporada, a partir das tabelas da liga em memória."""
+    games = pd.concat(
+        [games_store.get_season_games(season).assign(SEASON=season) for season in seasons],
+        ignore_index=True,
+    )
+    return compare_seasons(games, metrics)
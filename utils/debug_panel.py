@@ -0,0 +1,85 @@
+"""Painel de depuração com as medições de `utils.instrumentation`.
+
+O painel aparece na barra lateral quando a variável de ambiente
+`NBA_DEBUG_PANEL=1` está definida ou quando a página é aberta com `?debug=1`
+na URL. Ele mostra as chamadas medidas na última execução da página (tempo,
+acertos e faltas de cache, bytes baixados e linhas), o resumo por função, a
+memória das temporadas carregadas em `utils.games` e um botão para baixar os
+registros em JSON Lines.
+"""
+import os
+
+import pandas as pd
+import streamlit as st
+
+from utils import instrumentation
+
+DEBUG_PANEL = os.environ.get("NBA_DEBUG_PANEL", "0") == "1"
+
+# Maior número de registro já exibido nesta sessão; o painel mostra só os posteriores
+_SINCE_KEY = "_debug_panel_since"
+
+
+def is_enabled():
+    """Indica se o painel deve ser exibido nesta página."""
+    return DEBUG_PANEL or st.query_params.get("debug") == "1"
+
+
+def _show_memory_report():
+    """Memória das tabelas de jogos da liga mantidas pelo processo (antes e depois dos tipos compactos)."""
+    # Importado só com o painel aberto: as páginas que não usam a tabela da liga não pagam a importação
+    from utils import games as games_store
+
+    report = games_store.get_memory_report()
+    if report.empty:
+        return
+    st.write("**Memória das temporadas carregadas**")
+    st.dataframe(
+        pd.DataFrame({
+            "Temporada": report["season"],
+            "Linhas": report["rows"],
+            "Antes (MB)": (report["before_bytes"] / 1e6).round(2),
+            "Depois (MB)": (report["after_bytes"] / 1e6).round(2),
+            "Redução": report["ratio"].round(1),
+        }),
+        hide_index=True,
+    )
+
+
+def show_debug_panel():
+    """Mostra na barra lateral as chamadas medidas desde a execução anterior da página."""
+    since = st.session_state.get(_SINCE_KEY, 0)
+    records = instrumentation.get_records(since=since, session=instrumentation.current_session())
+    st.session_state[_SINCE_KEY] = max([since, *(record["seq"] for record in records)])
+    if not is_enabled():
+        return
+
+    with st.sidebar.expander("⏱️ Desempenho da página", expanded=True):
+        if not records:
+            st.write("Nenhuma chamada medida nesta execução.")
+            return
+
+        # Só as chamadas externas somam o tempo da página; as internas já estão contidas nelas
+        top_level = [record for record in records if record["parent"] is None]
+        st.metric("Tempo nas funções medidas", f"{sum(record['seconds'] for record in top_level):.2f}s")
+        hits = sum(record["hits"] for record in top_level)
+        misses = sum(record["misses"] for record in top_level)
+        st.metric("Cache (acertos / faltas)", f"{hits} / {misses}")
+        st.metric("Baixado do stats.nba.com", f"{sum(record['bytes'] for record in top_level) / 1e6:.2f} MB")
+
+        st.write("**Resumo por função**")
+        st.dataframe(instrumentation.summarize(records), hide_index=True)
+
+        st.write("**Chamadas**")
+        st.dataframe(
+            [{key: record[key] for key in ("seq", "parent", "name", "seconds", "hits", "misses", "bytes", "rows", "error")}
+             for record in records],
+            hide_index=True,
+        )
+        _show_memory_report()
+        st.download_button(
+            "Baixar métricas (JSONL)",
+            instrumentation.to_jsonl(records),
+            file_name="metricas.jsonl",
+            mime="application/jsonl",
+        )
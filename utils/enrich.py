@@ -0,0 +1,51 @@
+"""Colunas derivadas do `MATCHUP` e do resultado, calculadas uma vez por tabela.
+
+O `MATCHUP` tem a forma "CHA vs. BOS" (jogo em casa) ou "CHA @ BOS" (jogo
+fora). Como uma temporada tem poucas centenas de confrontos distintos, cada
+valor distinto é interpretado uma única vez e o resultado é espalhado para
+todas as linhas pelos códigos do `pd.factorize`.
+"""
+import numpy as np
+import pandas as pd
+
+# Colunas acrescentadas por `enrich_games`; as tabelas exibidas nas páginas não as mostram
+ENRICHED_COLUMNS = ["IS_HOME", "OPPONENT", "WIN", "POINTS_ALLOWED"]
+
+
+def parse_matchups(matchups):
+    """Retorna `(IS_HOME, OPPONENT)` a partir de uma série de `MATCHUP`."""
+    codes, uniques = pd.factorize(matchups.astype(object))
+    parts = [str(matchup).split(" ") for matchup in uniques]
+    unique_home = np.array([len(part) > 1 and part[1] == "vs." for part in parts], dtype=bool)
+    unique_opponent = [part[2] if len(part) > 2 else part[0] for part in parts]
+
+    # Códigos -1 (MATCHUP ausente) viram "fora" e adversário nulo
+    valid = codes >= 0
+    is_home = np.zeros(len(codes), dtype=bool)
+    is_home[valid] = unique_home[codes[valid]]
+    opponent_categories = pd.Index(unique_opponent).unique()
+    opponent_codes = np.full(len(codes), -1, dtype=np.int64)
+    opponent_codes[valid] = opponent_categories.get_indexer(unique_opponent)[codes[valid]]
+    opponent = pd.Categorical.from_codes(opponent_codes, categories=opponent_categories)
+
+    return (
+        pd.Series(is_home, index=matchups.index, name="IS_HOME"),
+        pd.Series(opponent, index=matchups.index, name="OPPONENT"),
+    )
+
+
+def enrich_games(games, points_allowed=True):
+    """Retorna uma cópia de `games` com `IS_HOME`, `OPPONENT`, `WIN` e `POINTS_ALLOWED`.
+
+    `POINTS_ALLOWED` (`PTS - PLUS_MINUS`) só faz sentido para jogos de times;
+    use `points_allowed=False` para logs de jogadores.
+    """
+    is_home, opponent = parse_matchups(games["MATCHUP"])
+    columns = {
+        "IS_HOME": is_home,
+        "OPPONENT": opponent,
+        "WIN": (games["WL"] == "W").to_numpy(dtype=bool),
+    }
+    if points_allowed:
+        columns["POINTS_ALLOWED"] = games["PTS"] - games["PLUS_MINUS"]
+    return games.assign(**columns)
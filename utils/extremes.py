@@ -0,0 +1,171 @@
+"""Distribuição de Gumbel para eventos extremos (pontuação, assistências, rebotes).
+
+O ajuste (`mu`, `beta`) de cada time × estatística × conjunto de temporadas é
+feito uma única vez e guardado no registro de modelos, identificado pelo
+hash dos dados; mudar o limiar X na página não reajusta nada. As
+probabilidades são calculadas em forma fechada e aceitam arrays de limiares
+(e de parâmetros), e as proporções empíricas usam busca binária sobre os
+valores ordenados.
+
+`fit_league` ajusta todos os times × estatísticas × temporadas a partir das
+tabelas de jogos da liga, em paralelo (em processos só no aquecimento pela
+linha de comando, como em `utils.gam`), e grava uma
+tabela de parâmetros por temporada em Parquet, reaproveitada enquanto os
+jogos da temporada não mudarem.
+
+O SciPy só é importado para ajustar a distribuição; a densidade, as
+probabilidades e as proporções usadas nos gráficos não dependem dele.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from utils import games as games_store
+from utils import models as model_registry
+from utils.cache import unique_tmp_path
+from utils.instrumentation import instrument
+from utils.sync import STORE_DIR
+
+MAX_PROCESSES = int(os.environ.get("NBA_MAX_PROCESSES", os.cpu_count() or 1))
+# Processos só fora do servidor do Streamlit, como em `utils.gam`
+MP_CONTEXT = multiprocessing.get_context("spawn")
+
+PARAMETERS_DIR = STORE_DIR / "gumbel"
+STATS = ["PTS", "AST", "REB"]
+
+
+def fit_gumbel(values):
+    """Ajusta a distribuição; retorna `mu`, `beta` e os valores observados ordenados."""
+    from scipy.stats import gumbel_r
+
+    values = np.asarray(values, dtype=np.float64)
+    mu, beta = gumbel_r.fit(values)
+    return {"mu": mu, "beta": beta, "sorted_values": np.sort(values)}
+
+
+@instrument()
+def get_gumbel_fit(team, stat, seasons, values):
+    """Retorna o ajuste de `fit_gumbel`, reaproveitando o já calculado para os mesmos dados."""
+    data_hash = model_registry.hash_data(pd.Series(values, name=stat).to_frame())
+    return model_registry.get_or_fit(("gumbel", team, stat, tuple(seasons), data_hash), lambda: fit_gumbel(values))
+
+
+def pdf(x, mu, beta):
+    """Densidade da distribuição nos pontos `x` (como `gumbel_r.pdf(x, loc=mu, scale=beta)`)."""
+    z = (np.asarray(x, dtype=np.float64) - mu) / beta
+    return np.exp(-z - np.exp(-z)) / beta
+
+
+def cdf(thresholds, mu, beta):
+    """P(valor <= X) para cada limiar.
+
+    Com `mu` e `beta` em arrays, retorna uma linha por distribuição e uma
+    coluna por limiar.
+    """
+    thresholds = np.asarray(thresholds, dtype=np.float64)
+    mu = np.asarray(mu, dtype=np.float64)[..., None]
+    beta = np.asarray(beta, dtype=np.float64)[..., None]
+    result = np.exp(-np.exp(-(thresholds - mu) / beta))
+    return result[..., 0] if thresholds.ndim == 0 else result
+
+
+def exceedance_probability(thresholds, mu, beta):
+    """P(valor > X) para cada limiar (mesmo formato de `cdf`)."""
+    thresholds = np.asarray(thresholds, dtype=np.float64)
+    mu = np.asarray(mu, dtype=np.float64)[..., None]
+    beta = np.asarray(beta, dtype=np.float64)[..., None]
+    # -expm1(-t) = 1 - exp(-t), sem perder precisão quando a probabilidade é pequena
+    result = -np.expm1(-np.exp(-(thresholds - mu) / beta))
+    return result[..., 0] if thresholds.ndim == 0 else result
+
+
+def count_below(sorted_values, thresholds):
+    """Quantidade de valores observados menores que cada limiar (busca binária)."""
+    return np.searchsorted(sorted_values, thresholds, side="left")
+
+
+def proportion_below(sorted_values, thresholds):
+    """Proporção de valores observados menores que cada limiar."""
+    return count_below(sorted_values, thresholds) / len(sorted_values)
+
+
+def summarize(fit, threshold):
+    """Probabilidades e proporções exibidas na página para o limiar X."""
+    below = cdf(threshold, fit["mu"], fit["beta"])
+    above = exceedance_probability(threshold, fit["mu"], fit["beta"])
+    return {
+        "Probabilidade de marcar acima de X": above,
+        "Probabilidade de atingir ou exceder X": above,
+        "Probabilidade de atingir ou ficar abaixo de X": below,
+        "Proporção de valores menores ou iguais a X": below,
+        "Valores menores que X": count_below(fit["sorted_values"], threshold),
+        "Proporção de valores menores que X": proportion_below(fit["sorted_values"], threshold),
+    }
+
+
+def _fit_chunk(chunk):
+    from scipy.stats import gumbel_r
+
+    rows = []
+    for (team, stat), values in chunk:
+        mu, beta = gumbel_r.fit(values)
+        rows.append({"TEAM_ABBREVIATION": team, "STAT": stat, "GAMES": len(values), "MU": mu, "BETA": beta})
+    return rows
+
+
+def _fit_season(games, stats, max_workers=None, processes=False):
+    """Ajusta todos os times × estatísticas de uma temporada."""
+    tasks = [
+        ((team, stat), team_games[stat].to_numpy(np.float64))
+        for team, team_games in games.groupby("TEAM_ABBREVIATION", observed=True)
+        for stat in stats
+    ]
+    workers = max(1, min(max_workers or MAX_PROCESSES, len(tasks)))
+    chunks = [tasks[i::workers] for i in range(workers) if tasks[i::workers]]
+    if workers == 1:
+        results = map(_fit_chunk, chunks)
+    else:
+        executor_class = partial(ProcessPoolExecutor, mp_context=MP_CONTEXT) if processes else ThreadPoolExecutor
+        with executor_class(max_workers=workers) as executor:
+            results = list(executor.map(_fit_chunk, chunks))
+    return pd.DataFrame([row for rows in results for row in rows])
+
+
+@instrument()
+def fit_league(seasons, stats=STATS, max_workers=None, processes=False):
+    """Parâmetros de Gumbel de todos os times × estatísticas × temporadas.
+
+    Retorna `SEASON`, `TEAM_ABBREVIATION`, `STAT`, `GAMES`, `MU` e `BETA`. A
+    tabela de cada temporada fica gravada em `PARAMETERS_DIR` junto com o hash
+    dos jogos usados e só é recalculada quando esses jogos mudam. Os ajustes
+    usam um pool de threads, ou de processos com `processes=True` (só fora
+    das páginas).
+    """
+    games_store.prefetch_seasons(seasons)
+    tables = []
+    for season in seasons:
+        games = games_store.regular_season_games(games_store.get_season_games(season))
+        data_hash = model_registry.hash_data(games[["TEAM_ABBREVIATION", *stats]].astype({"TEAM_ABBREVIATION": str}))
+        path = PARAMETERS_DIR / f"season={season}.parquet"
+
+        table = pd.read_parquet(path) if path.exists() else None
+        if table is None or table["DATA_HASH"].iloc[0] != data_hash or set(table["STAT"]) != set(stats):
+            table = _fit_season(games, stats, max_workers, processes)
+            if table.empty:
+                continue
+            table = table.assign(SEASON=season, DATA_HASH=data_hash)
+            PARAMETERS_DIR.mkdir(parents=True, exist_ok=True)
+            # Duas sessões (ou uma página e o aquecimento) podem gravar a mesma temporada ao mesmo tempo
+            tmp_path = unique_tmp_path(path)
+            table.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, path)
+        tables.append(table)
+
+    if not tables:
+        return pd.DataFrame(columns=["SEASON", "TEAM_ABBREVIATION", "STAT", "GAMES", "MU", "BETA"])
+    parameters = pd.concat(tables, ignore_index=True)
+    return parameters[["SEASON", "TEAM_ABBREVIATION", "STAT", "GAMES", "MU", "BETA"]]
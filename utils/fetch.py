@@ -0,0 +1,86 @@
+"""Busca concorrente e limitada das chamadas ao nba_api.
+
+As chamadas independentes de uma página são executadas em um pool de threads
+com limite de concorrência, de forma que o tempo da página fique próximo ao
+da chamada mais lenta em vez da soma de todas. Toda requisição HTTP passa por
+um limitador de taxa compartilhado e é repetida com espera exponencial em
+caso de falha, para não estourar o limite do stats.nba.com.
+"""
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.instrumentation import propagate
+
+logger = logging.getLogger(__name__)
+
+MAX_CONCURRENCY = int(os.environ.get("NBA_MAX_CONCURRENCY", 4))
+REQUESTS_PER_SECOND = float(os.environ.get("NBA_REQUESTS_PER_SECOND", 2))
+RETRIES = int(os.environ.get("NBA_RETRIES", 3))
+BACKOFF_SECONDS = float(os.environ.get("NBA_BACKOFF_SECONDS", 1.0))
+
+
+class RateLimiter:
+    """Garante um intervalo mínimo entre o início de requisições, entre threads."""
+
+    def __init__(self, requests_per_second):
+        self.interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._next_time = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_time)
+            self._next_time = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+rate_limiter = RateLimiter(REQUESTS_PER_SECOND)
+
+
+def with_retry(func, retries=None, backoff=None):
+    """Executa `func` respeitando o limitador de taxa e repetindo em caso de erro."""
+    retries = RETRIES if retries is None else retries
+    backoff = BACKOFF_SECONDS if backoff is None else backoff
+    for attempt in range(retries + 1):
+        rate_limiter.wait()
+        try:
+            return func()
+        except Exception:
+            if attempt == retries:
+                raise
+            delay = backoff * 2 ** attempt * (1 + random.random())
+            logger.warning("Falha na requisição (tentativa %d); repetindo em %.1fs", attempt + 1, delay, exc_info=True)
+            time.sleep(delay)
+
+
+def fetch_all(tasks, max_workers=None, return_exceptions=False):
+    """Executa as tarefas em paralelo e retorna um dicionário chave -> resultado.
+
+    `tasks` é um dicionário de chave -> função sem argumentos (por exemplo um
+    `functools.partial`). Com `return_exceptions=True`, a exceção de uma
+    tarefa que falhou é devolvida no lugar do resultado em vez de propagada.
+    Cada tarefa roda com o contexto de quem chamou (`instrumentation.propagate`),
+    então as medições em andamento também contabilizam o que ela faz.
+    """
+    if not tasks:
+        return {}
+
+    max_workers = min(max_workers or MAX_CONCURRENCY, len(tasks))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {key: executor.submit(propagate(task)) for key, task in tasks.items()}
+
+    results = {}
+    for key, future in futures.items():
+        try:
+            results[key] = future.result()
+        except Exception as e:
+            if not return_exceptions:
+                raise
+            results[key] = e
+    return results
@@ -0,0 +1,175 @@
+"""Figuras do Plotly guardadas em cache pelos dados de entrada, com os dados reduzidos no servidor.
+
+Montar uma figura (principalmente com o `plotly.express`) custa dezenas de
+milissegundos, e as páginas remontam todas as figuras a cada rerun. Com
+`cached_figure`, a figura é montada uma vez para cada combinação de dados e
+parâmetros (identificada por um hash do conteúdo, como no registro de
+modelos de `utils.models`) e fica em um LRU em memória, compartilhado entre
+as sessões. O `st.plotly_chart` ainda converte a figura para JSON em cada
+execução, então os construtores abaixo também reduzem o que vai para o
+navegador:
+
+- `histogram_figure` agrupa os valores em faixas no servidor e envia só as
+  contagens, em vez de todos os valores;
+- `box_figure` envia só os quartis, as cercas e os pontos discrepantes;
+- `downsample` reduz séries longas com o LTTB (Largest-Triangle-Three-Buckets),
+  que mantém os picos e vales da linha com no máximo `MAX_LINE_POINTS` pontos.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from plotly.colors import qualitative
+
+from utils.instrumentation import instrument, note
+from utils.models import hash_data, make_key
+
+MAX_FIGURES = int(os.environ.get("NBA_MAX_FIGURES", 256))
+MAX_LINE_POINTS = int(os.environ.get("NBA_MAX_LINE_POINTS", 500))
+
+_figures = OrderedDict()
+_lock = threading.Lock()
+
+
+def _hash_part(part):
+    """Hash do conteúdo de uma parte da chave (DataFrame, Series ou array); outros valores entram pelo `repr`."""
+    if isinstance(part, pd.DataFrame):
+        return hash_data(part)
+    if isinstance(part, pd.Series):
+        return hash_data(part.to_frame(name=str(part.name)))
+    if isinstance(part, np.ndarray):
+        digest = hashlib.sha1(f"{part.dtype}{part.shape}".encode("utf-8"))
+        digest.update(np.ascontiguousarray(part).tobytes())
+        return digest.hexdigest()
+    if isinstance(part, (list, tuple)):
+        return tuple(_hash_part(item) for item in part)
+    if isinstance(part, dict):
+        return tuple((key, _hash_part(value)) for key, value in part.items())
+    return repr(part)
+
+
+@instrument()
+def cached_figure(name, build, *args, **kwargs):
+    """Retorna `build(*args, **kwargs)`, montada só na primeira vez para esses dados e parâmetros.
+
+    `name` identifica o gráfico (as funções definidas nas páginas são
+    recriadas a cada rerun, então não servem de chave). A figura devolvida é
+    compartilhada; não a altere depois de obtê-la.
+    """
+    key = make_key(name, _hash_part(args), _hash_part(kwargs))
+    with _lock:
+        if key in _figures:
+            _figures.move_to_end(key)
+            note(hits=1)
+            return _figures[key]
+
+    note(misses=1)
+    figure = build(*args, **kwargs)
+    with _lock:
+        _figures[key] = figure
+        _figures.move_to_end(key)
+        while len(_figures) > MAX_FIGURES:
+            _figures.popitem(last=False)
+    return figure
+
+
+def clear():
+    """Descarta as figuras guardadas."""
+    with _lock:
+        _figures.clear()
+
+
+def _as_float(values):
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype("datetime64[ns]").astype(np.int64).astype(float)
+    if not np.issubdtype(values.dtype, np.number):
+        # Eixo de texto (datas como texto, categorias): os pontos ficam igualmente espaçados
+        return np.arange(len(values), dtype=float)
+    return values.astype(float)
+
+
+def lttb_indices(x, y, max_points=MAX_LINE_POINTS):
+    """Posições dos pontos escolhidos pelo LTTB para desenhar a série com no máximo `max_points` pontos."""
+    n = len(x)
+    if max_points >= n or max_points < 3:
+        return np.arange(n)
+    x = _as_float(x)
+    y = _as_float(y)
+
+    # O primeiro e o último ponto ficam; os demais são divididos em max_points - 2 faixas
+    edges = np.linspace(1, n - 1, max_points - 1).astype(int)
+    selected = np.empty(max_points, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(max_points - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        # Ponto médio da faixa seguinte (a última faixa usa o último ponto)
+        next_stop = edges[bucket + 2] if bucket + 2 < len(edges) else n
+        next_x = x[stop:next_stop].mean()
+        next_y = np.nanmean(y[stop:next_stop]) if not np.isnan(y[stop:next_stop]).all() else y[previous]
+        # Escolhe o ponto da faixa que forma o maior triângulo com o escolhido antes e a média da seguinte
+        area = np.abs((x[previous] - next_x) * (y[start:stop] - y[previous]) - (x[previous] - x[start:stop]) * (next_y - y[previous]))
+        previous = start + int(np.argmax(np.nan_to_num(area, nan=-1.0)))
+        selected[bucket + 1] = previous
+    return selected
+
+
+def downsample(df, x, y, max_points=MAX_LINE_POINTS):
+    """Linhas de `df` escolhidas pelo LTTB para a série `y` em função de `x`."""
+    if len(df) <= max_points:
+        return df
+    return df.iloc[lttb_indices(df[x].to_numpy(), df[y].to_numpy(), max_points)]
+
+
+def histogram_figure(values, nbins=10, title=None, x_title=None, histnorm=None, name=None):
+    """Histograma com as faixas calculadas no servidor (`histnorm="probability density"` normaliza a área)."""
+    values = pd.Series(values).dropna().to_numpy(dtype=float)
+    counts, edges = np.histogram(values, bins=nbins)
+    if histnorm == "probability density" and counts.sum() > 0:
+        counts = counts / (counts.sum() * np.diff(edges))
+
+    figure = go.Figure(go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=counts,
+        width=np.diff(edges),
+        name=name or x_title or "",
+        customdata=np.column_stack([edges[:-1], edges[1:]]),
+        hovertemplate="%{customdata[0]:.1f} a %{customdata[1]:.1f}: %{y}<extra></extra>",
+    ))
+    figure.update_layout(
+        title=title,
+        xaxis_title=x_title,
+        yaxis_title="Densidade" if histnorm == "probability density" else "Frequência",
+        bargap=0.02,
+    )
+    return figure
+
+
+def _box_trace(name, values, color):
+    values = pd.Series(values).dropna().to_numpy(dtype=float)
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+    box = go.Box(
+        name=name, x=[name], q1=[q1], median=[median], q3=[q3], mean=[values.mean()],
+        lowerfence=[inside.min()], upperfence=[inside.max()], marker_color=color,
+    )
+    outliers = values[(values < inside.min()) | (values > inside.max())]
+    return box, go.Scatter(x=[name] * len(outliers), y=outliers, mode="markers", marker_color=color, showlegend=False, name=name)
+
+
+def box_figure(columns, title=None):
+    """Box plot de cada série de `columns` ({nome: valores}) com as estatísticas calculadas no servidor."""
+    figure = go.Figure()
+    for position, (name, values) in enumerate(columns.items()):
+        if pd.Series(values).dropna().empty:
+            continue
+        for trace in _box_trace(name, values, qualitative.Plotly[position % len(qualitative.Plotly)]):
+            figure.add_trace(trace)
+    figure.update_layout(title=title)
+    return figure
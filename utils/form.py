@@ -0,0 +1,179 @@
+"""Sequências de vitórias/derrotas e forma recente dos times, calculadas uma vez por temporada.
+
+A tabela de forma é calculada de uma vez para os 30 times a partir da tabela
+de jogos da temporada regular de `utils.games`, ordenada por time e por data
+(e não pela ordem em que a API devolve os jogos). Tudo é feito com operações
+vetorizadas sobre a tabela inteira, em O(n):
+
+- `GAME_NUMBER`: número do jogo do time na temporada;
+- `STREAK`: sequência atual depois do jogo (positiva para vitórias,
+  negativa para derrotas);
+- `CUM_WINS` e `CUM_PLUS_MINUS`: somas acumuladas (no time) de vitórias e do
+  saldo de pontos (`PLUS_MINUS`), das quais sai a janela móvel de qualquer tamanho
+  (`rolling_form`) por diferença, sem reagrupar a tabela.
+
+O resumo por time (sequência atual, maiores sequências e últimos 10 jogos)
+é calculado junto com a tabela da temporada (`get_form_summary`). Para os
+gráficos de um time em um período, `team_form` aplica o mesmo cálculo só
+aos jogos do time (como os de `utils.games.get_team_games_range`, que lê só
+as linhas do time do armazenamento), sem carregar as temporadas da liga.
+"""
+import numpy as np
+import pandas as pd
+
+from utils import games as games_store
+from utils.games import regular_season_games
+from utils.instrumentation import instrument
+
+# Tamanho padrão da janela móvel (o "Últimos 10 Jogos" da classificação)
+WINDOW = 10
+
+FORM_COLUMNS = [
+    "TEAM_ABBREVIATION", "GAME_ID", "GAME_DATE", "MATCHUP", "WL", "PTS", "PLUS_MINUS",
+    "GAME_NUMBER", "STREAK", "CUM_WINS", "CUM_PLUS_MINUS",
+]
+
+
+def _team_codes(games):
+    """Código inteiro do time de cada linha (sem converter as siglas categóricas para texto)."""
+    return pd.factorize(games["TEAM_ABBREVIATION"])[0]
+
+
+def _team_bounds(codes):
+    """Início e fim (exclusivo) de cada intervalo contíguo de linhas de um mesmo time."""
+    if len(codes) == 0:
+        return np.array([], dtype=int), np.array([], dtype=int)
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    return starts, np.append(starts[1:], len(codes))
+
+
+def _team_starts(codes):
+    """Posição do primeiro jogo do time de cada linha."""
+    starts, stops = _team_bounds(codes)
+    return np.repeat(starts, stops - starts)
+
+
+def _window_sums(cumulative, starts, window):
+    """Somas dos últimos `window` valores de cada linha, sem passar do início do time, e quantos valores entraram."""
+    positions = np.arange(len(cumulative))
+    lower = np.maximum(positions - window + 1, starts)
+    # As somas acumuladas recomeçam em cada time: desconta o acumulado até a linha anterior à janela
+    before = np.where(lower > starts, cumulative[np.maximum(lower - 1, 0)], 0)
+    return cumulative - before, positions - lower + 1
+
+
+def _team_cumsum(values, starts):
+    """Soma acumulada que recomeça no primeiro jogo de cada time."""
+    cumulative = np.cumsum(values)
+    # Desconta o acumulado dos times anteriores (zero para o primeiro time da tabela)
+    return cumulative - np.where(starts > 0, cumulative[np.maximum(starts - 1, 0)], 0)
+
+
+def compute_form(games):
+    """Tabela de forma (número do jogo, sequência e somas acumuladas) de todos os times de `games`."""
+    # Ordena por time e data; jogos na mesma data (só nos dados ampliados dos benchmarks) mantêm a ordem de entrada
+    codes = _team_codes(games)
+    order = np.lexsort((games["GAME_DATE"].to_numpy(), codes))
+    codes = codes[order]
+    win = games["WIN"].to_numpy(dtype=bool)[order]
+    positions = np.arange(len(order))
+    starts = _team_starts(codes)
+
+    # Uma sequência recomeça quando muda o time ou o resultado
+    new_run = positions == starts
+    new_run[1:] |= win[1:] != win[:-1]
+    streak = positions - np.maximum.accumulate(np.where(new_run, positions, 0)) + 1
+
+    form = games[FORM_COLUMNS[:7]].take(order).reset_index(drop=True)
+    form["GAME_NUMBER"] = positions - starts + 1
+    form["STREAK"] = np.where(win, streak, -streak)
+    form["CUM_WINS"] = _team_cumsum(win.astype(int), starts)
+    form["CUM_PLUS_MINUS"] = _team_cumsum(np.nan_to_num(games["PLUS_MINUS"].to_numpy(dtype=float)[order]), starts)
+    return form
+
+
+def rolling_form(form, window=WINDOW):
+    """Acrescenta a % de vitórias e o saldo médio de pontos nos últimos `window` jogos de cada linha."""
+    starts = _team_starts(_team_codes(form))
+    wins, count = _window_sums(form["CUM_WINS"].to_numpy(), starts, window)
+    plus_minus, _ = _window_sums(form["CUM_PLUS_MINUS"].to_numpy(), starts, window)
+    return form.assign(ROLLING_WIN_PCT=wins / count, ROLLING_PLUS_MINUS=plus_minus / count, ROLLING_GAMES=count)
+
+
+def streak_runs(form):
+    """Uma linha por sequência (vitórias ou derrotas seguidas): início, fim, jogos e `STREAK` ao final dela."""
+    streak = form["STREAK"].to_numpy()
+    # Uma sequência termina onde a seguinte recomeça em ±1 (ou na última linha)
+    ends = np.flatnonzero(np.append(np.abs(streak[1:]) == 1, True))
+    starts = ends - np.abs(streak[ends]) + 1
+    dates = form["GAME_DATE"].to_numpy()
+    return pd.DataFrame({
+        "START_DATE": dates[starts],
+        "END_DATE": dates[ends],
+        "GAMES": np.abs(streak[ends]),
+        "STREAK": streak[ends],
+    })
+
+
+def _format_streak(streak):
+    return f"{'W' if streak > 0 else 'L'}{abs(streak)}"
+
+
+def summarize_form(form, window=WINDOW):
+    """Resumo por time: sequência atual, maiores sequências de vitórias e derrotas e últimos `window` jogos."""
+    columns = ["Current_Streak", "Longest_Win_Streak", "Longest_Loss_Streak", "Last_10"]
+    if form.empty:
+        return pd.DataFrame(columns=columns, index=pd.Index([], name="TEAM_ABBREVIATION"))
+
+    # Cada time é um intervalo contíguo: os resumos saem das bordas dos intervalos, sem agrupar
+    starts, stops = _team_bounds(_team_codes(form))
+    last = stops - 1
+    streak = form["STREAK"].to_numpy()
+    wins, count = _window_sums(form["CUM_WINS"].to_numpy(), np.repeat(starts, stops - starts), window)
+
+    summary = pd.DataFrame({
+        "Current_Streak": [_format_streak(value) for value in streak[last]],
+        "Longest_Win_Streak": np.maximum(np.maximum.reduceat(streak, starts), 0),
+        "Longest_Loss_Streak": np.maximum(-np.minimum.reduceat(streak, starts), 0),
+        "Last_10": [f"{won}-{played - won}" for won, played in zip(wins[last], count[last])],
+    }, index=pd.Index(form["TEAM_ABBREVIATION"].to_numpy()[starts].astype(str), name="TEAM_ABBREVIATION"))
+    return summary
+
+
+def build_form(games):
+    """Tabela de forma da temporada, com os intervalos de cada time e o resumo por time."""
+    form = compute_form(regular_season_games(games))
+    starts, stops = _team_bounds(_team_codes(form))
+    teams = form["TEAM_ABBREVIATION"].to_numpy()[starts].astype(str)
+    return {
+        "form": form,
+        "teams": {team: slice(start, stop) for team, start, stop in zip(teams, starts, stops)},
+        "summary": summarize_form(form),
+    }
+
+
+# Os jogos novos mudam as sequências dos times que jogaram; como o cálculo é O(n), a tabela é refeita
+games_store.register_derived("form", build_form)
+
+
+@instrument()
+def team_form(team_games, window=WINDOW):
+    """Forma jogo a jogo, com a janela móvel de `window` jogos, a partir dos jogos de um time.
+
+    Com a coluna `SEASON` (várias temporadas), as sequências e as janelas
+    recomeçam em cada temporada, como na tabela de cada temporada.
+    """
+    games = regular_season_games(team_games)
+    if "SEASON" not in games.columns or games.empty:
+        return rolling_form(compute_form(games), window)
+    frames = [
+        rolling_form(compute_form(season_games), window).assign(SEASON=season)
+        for season, season_games in games.groupby("SEASON", sort=False, observed=True)
+    ]
+    return pd.concat(frames, ignore_index=True)
+
+
+@instrument()
+def get_form_summary(season):
+    """Resumo da forma de todos os times na temporada (indexado pela sigla do time)."""
+    return games_store.get_derived("form", season)["summary"]
@@ -0,0 +1,151 @@
+"""Ajuste único dos GAMs (PoissonGAM e LinearGAM) usados na seção GAMLSS.
+
+Para cada jogador × estatística, `fit_gam_bundle` ajusta os modelos uma única
+vez e calcula tudo o que os gráficos da página leem: a previsão do próximo
+jogo, as curvas preditas, os coeficientes, a matriz de confusão e a curva ROC.
+As combinações são ajustadas em paralelo (em um pool de threads nas páginas e
+de processos no aquecimento pela linha de comando) e os resultados ficam no
+registro de modelos, identificados pelo hash dos dados.
+
+O pygam e o scikit-learn só são importados dentro de `fit_gam_bundle`, então
+carregar os dados dos jogadores (ou ler modelos já ajustados do registro)
+não paga a importação dessas bibliotecas.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from utils import models as model_registry
+from utils.fetch import fetch_all
+from utils.instrumentation import instrument
+from utils.sync import get_player_game_log
+
+MAX_PROCESSES = int(os.environ.get("NBA_MAX_PROCESSES", os.cpu_count() or 1))
+# Processos só fora do servidor do Streamlit: lá, um fork pode copiar um lock já travado por
+# outra thread e travar o filho, e o spawn executaria a página de novo (ela é o `__main__`)
+MP_CONTEXT = multiprocessing.get_context("spawn")
+
+# Estatísticas modeladas na seção GAMLSS
+STATS = ['PTS', 'REB', 'AST']
+
+
+def fit_gam_bundle(y):
+    """Ajusta os GAMs de uma série de jogos e retorna os resultados usados nos gráficos."""
+    from pygam import LinearGAM, PoissonGAM
+    from sklearn.metrics import auc, confusion_matrix, roc_curve
+    from sklearn.model_selection import train_test_split
+
+    y = pd.Series(y).reset_index(drop=True)
+    X = np.arange(len(y)).reshape(-1, 1)  # Índice do jogo como variável preditora
+
+    # Modelos de treino/teste, usados na previsão do próximo jogo
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    x_next = np.array([[len(y)]])
+    pred_poisson = PoissonGAM().fit(X_train, y_train).predict(x_next)[0]
+    pred_linear = LinearGAM().fit(X_train, y_train).predict(x_next)[0]
+
+    # Modelos com todos os jogos, usados nos gráficos
+    gam_poisson = PoissonGAM().fit(X, y)
+    gam_linear = LinearGAM().fit(X, y)
+    y_pred_poisson = gam_poisson.predict(X)
+
+    mean = y.mean()
+    prob_above_mean = (y > mean).mean()
+    y_true = (y > mean).astype(int)  # 1 se acima da média, 0 caso contrário
+    fpr, tpr, _ = roc_curve(y_true, y_pred_poisson)
+
+    return {
+        "prediction": {
+            "Poisson Prediction": pred_poisson,
+            "Linear Prediction": pred_linear,
+            "Mean": mean,
+            "Median": y.median(),
+            "Mode": y.mode()[0],
+            "Min": y.min(),
+            "Max": y.max(),
+            "P(Above Mean)": prob_above_mean,
+            "P(Below Mean)": 1 - prob_above_mean
+        },
+        "y_pred_poisson": y_pred_poisson,
+        "y_pred_linear": gam_linear.predict(X),
+        "coef_poisson": gam_poisson.coef_,
+        "coef_linear": gam_linear.coef_,
+        "confusion_matrix": confusion_matrix(y_true, (y_pred_poisson > mean).astype(int)),
+        "fpr": fpr,
+        "tpr": tpr,
+        "auc": auc(fpr, tpr),
+    }
+
+
+def _key_parts(key, y):
+    return ("gam", *key, model_registry.hash_data(pd.Series(y).to_frame()))
+
+
+@instrument()
+def fit_gam_bundles(series, max_workers=None, processes=False):
+    """Retorna os resultados de `fit_gam_bundle` para cada série de `series`.
+
+    `series` é um dicionário de chave (por exemplo `(jogador, estatística)`) ->
+    valores. Apenas as séries sem resultado no registro são ajustadas, em
+    paralelo em um pool de threads, ou de processos com `processes=True`
+    (só fora das páginas, como em `utils.warmup`).
+    """
+    missing = [key for key, y in series.items() if not model_registry.contains(_key_parts(key, y))]
+
+    fitted = {}
+    if len(missing) > 1:
+        max_workers = min(max_workers or MAX_PROCESSES, len(missing))
+        executor_class = partial(ProcessPoolExecutor, mp_context=MP_CONTEXT) if processes else ThreadPoolExecutor
+        with executor_class(max_workers=max_workers) as executor:
+            fitted = dict(zip(missing, executor.map(fit_gam_bundle, [series[key] for key in missing])))
+
+    # Séries já ajustadas acima não são ajustadas de novo; as demais vêm do registro
+    return {
+        key: model_registry.get_or_fit(
+            _key_parts(key, y),
+            partial(fitted.pop, key) if key in fitted else partial(fit_gam_bundle, y),
+        )
+        for key, y in series.items()
+    }
+
+
+@instrument()
+def load_player_stats(players, seasons):
+    """Junta as estatísticas de cada jogador nas temporadas.
+
+    Retorna `({jogador: DataFrame}, [(id do jogador, temporada, erro)])`; as
+    temporadas com erro ficam de fora dos dados.
+    """
+    # Os logs de todos os jogadores × temporadas são buscados em paralelo
+    logs = fetch_all({
+        (player_id, season): partial(get_player_game_log, player_id, season)
+        for player_id in players.values()
+        for season in seasons
+    }, return_exceptions=True)
+
+    data = {}
+    errors = []
+    for player, player_id in players.items():
+        frames = []
+        for season in seasons:
+            log = logs[(player_id, season)]
+            if isinstance(log, Exception):
+                errors.append((player_id, season, log))
+                continue
+            frames.append(log[STATS])
+        data[player] = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    return data, errors
+
+
+def player_stat_series(data):
+    """Séries `(jogador, estatística) -> valores` usadas em `fit_gam_bundles`."""
+    return {
+        (player, stat): df[stat]
+        for player, df in data.items()
+        if not df.empty
+        for stat in STATS
+    }
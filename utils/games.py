@@ -0,0 +1,283 @@
+"""Armazenamento em memória das tabelas de jogos da liga por temporada.
+
+Cada temporada é carregada uma única vez por processo (pela sincronização
+incremental de `utils.sync`), é convertida para os tipos compactos de
+`utils.schema`, recebe as colunas de `utils.enrich` (`IS_HOME`, `OPPONENT`,
+`WIN`, `POINTS_ALLOWED`) e é mantida ordenada por
+`TEAM_ABBREVIATION` e `GAME_ID`. Os jogos de um time são entregues como fatias contíguas (views)
+dessa tabela, então trocar de time em um selectbox não faz uma nova chamada
+à API.
+
+A temporada atual é sincronizada de novo depois de `REFRESH_SECONDS`; só os
+jogos novos (ou que estavam em andamento) são buscados, só eles são
+normalizados e enriquecidos, e são intercalados na tabela já ordenada. Os
+agregados derivados registrados com `register_derived` são atualizados a
+partir deles.
+"""
+import logging
+import threading
+import time
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from utils.cache import CURRENT_SEASON_TTL
+from utils.enrich import enrich_games
+from utils.fetch import fetch_all
+from utils.instrumentation import instrument, note
+from utils.schema import COUNT_COLUMNS, ID_COLUMNS, memory_report, memory_usage, normalize_games
+from utils.seasons import is_past_season
+from utils.sync import read_games, sync_league_games
+from utils.teams import nba_teams
+
+logger = logging.getLogger(__name__)
+
+REFRESH_SECONDS = CURRENT_SEASON_TTL
+
+# Temporada -> {"games": DataFrame, "teams": {sigla: slice}, "game_ids": Index, "derived": {...},
+#              "memory": {...}, "synced_at": float}
+_seasons = {}
+_lock = threading.Lock()
+# Um lock por temporada, para que temporadas diferentes possam ser baixadas em paralelo
+_season_locks = {}
+
+# Nome -> (build(games), update(anterior, games, novos_jogos) ou None)
+_derived = {}
+
+
+def register_derived(name, build, update=None):
+    """Registra um agregado calculado a partir da tabela da temporada.
+
+    `build(games)` calcula o agregado do zero. Se `update(previous, games,
+    new_games)` for informado, ele é usado quando chegam jogos novos em vez
+    de recalcular tudo.
+    """
+    _derived[name] = (build, update)
+
+
+def regular_season_games(games):
+    """Jogos já realizados da temporada regular dos 30 times da NBA (como no TeamGameLog)."""
+    # O primeiro dígito do SEASON_ID indica o tipo da temporada (2 = temporada regular)
+    mask = (
+        games["SEASON_ID"].astype(str).str.startswith("2")
+        & games["TEAM_ABBREVIATION"].isin(nba_teams.keys())
+        & games["WL"].notnull()
+    )
+    return games[mask]
+
+
+def _season_entry(games, memory):
+    """Entrada da temporada para a tabela já ordenada, com os índices por time e por jogo."""
+    # Como a tabela está ordenada por time, os jogos de cada time ocupam um intervalo contíguo
+    abbreviations = games["TEAM_ABBREVIATION"].to_numpy()
+    team_list = pd.unique(abbreviations)
+    starts = abbreviations.searchsorted(team_list, side="left")
+    stops = abbreviations.searchsorted(team_list, side="right")
+    team_slices = {team: slice(start, stop) for team, start, stop in zip(team_list, starts, stops)}
+
+    return {
+        "games": games,
+        "teams": team_slices,
+        "game_ids": pd.Index(games["GAME_ID"]),
+        "derived": {},
+        "memory": memory,
+    }
+
+
+def _build_season(games):
+    """Normaliza, enriquece e ordena a tabela da temporada e monta os índices por time e por jogo."""
+    raw_games = games
+    games = enrich_games(normalize_games(games))
+    games = games.sort_values(["TEAM_ABBREVIATION", "GAME_ID"], kind="stable").reset_index(drop=True)
+    return _season_entry(games, memory_report(raw_games, games))
+
+
+def _sort_keys(games):
+    """Chave inteira na ordem de (`TEAM_ABBREVIATION`, `GAME_ID`), pelos códigos das categorias."""
+    game_codes = games["GAME_ID"].cat.codes.to_numpy(np.int64)
+    return games["TEAM_ABBREVIATION"].cat.codes.to_numpy(np.int64) * len(games["GAME_ID"].cat.categories) + game_codes
+
+
+def _merge_games(games, new_games):
+    """Intercala os jogos novos (já normalizados e enriquecidos) na tabela ordenada da temporada.
+
+    Linhas de `games` com o mesmo jogo e time de uma linha nova (jogos que
+    estavam em andamento) são substituídas.
+    """
+    keys = ["GAME_ID", "TEAM_ID"]
+    replaced = pd.MultiIndex.from_frame(games[keys]).isin(pd.MultiIndex.from_frame(new_games[keys]))
+    if replaced.any():
+        games = games[~replaced]
+
+    # As duas tabelas passam a usar as mesmas categorias, para que os códigos sejam comparáveis
+    categories = {
+        name: games[name].cat.categories.union(new_games[name].astype("category").cat.categories)
+        for name in games.columns
+        if isinstance(games[name].dtype, pd.CategoricalDtype) and name in new_games
+    }
+    games = games.assign(**{
+        # Só as colunas com categorias novas são recodificadas
+        name: games[name].cat.set_categories(values)
+        for name, values in categories.items()
+        if len(values) != len(games[name].cat.categories)
+    })
+    new_games = new_games.assign(**{
+        name: new_games[name].astype("category").cat.set_categories(values) for name, values in categories.items()
+    })
+
+    # Posição de cada jogo novo na tabela ordenada (depois das linhas iguais, como no sort estável)
+    new_keys = _sort_keys(new_games)
+    new_order = np.argsort(new_keys, kind="stable")
+    positions = np.searchsorted(_sort_keys(games), new_keys[new_order], side="right")
+    order = np.insert(np.arange(len(games)), positions, len(games) + new_order)
+
+    merged = pd.concat([games, new_games], ignore_index=True).take(order).reset_index(drop=True)
+    # Colunas inteiras que estavam em float32 por causa de jogos em andamento voltam aos tipos do schema
+    floats = [name for name in ID_COLUMNS + COUNT_COLUMNS if name in merged and merged[name].dtype == np.float32]
+    return merged.assign(**normalize_games(merged[floats])) if floats else merged
+
+
+def _apply_new_games(entry, new_games):
+    """Intercala os jogos novos na tabela da temporada e atualiza os agregados já calculados."""
+    # A memória antes da conversão é estimada somando a dos jogos novos, sem reler a temporada crua
+    before_bytes = entry["memory"]["before_bytes"] + memory_usage(new_games)
+    new_games = enrich_games(normalize_games(new_games))
+    games = _merge_games(entry["games"], new_games)
+    after_bytes = memory_usage(games)
+    updated = _season_entry(games, {
+        "rows": len(games),
+        "before_bytes": before_bytes,
+        "after_bytes": after_bytes,
+        "ratio": before_bytes / after_bytes if after_bytes else None,
+    })
+    # Jogos que já estavam na tabela voltaram atualizados (estavam em andamento): somar de novo contaria duas vezes
+    replaced = new_games["GAME_ID"].isin(entry["game_ids"]).any()
+    for name, previous in entry["derived"].items():
+        build, update = _derived[name]
+        if update and not replaced:
+            updated["derived"][name] = update(previous, updated["games"], new_games)
+        else:
+            updated["derived"][name] = build(updated["games"])
+    return updated
+
+
+def _is_stale(entry, season):
+    return not is_past_season(season) and time.time() - entry["synced_at"] > REFRESH_SECONDS
+
+
+def _load_season(season):
+    """Retorna a entrada da temporada, sincronizando apenas quando necessário."""
+    entry = _seasons.get(season)
+    if entry is not None and not _is_stale(entry, season):
+        note(hits=1)
+        return entry
+
+    with _lock:
+        season_lock = _season_locks.setdefault(season, threading.Lock())
+
+    with season_lock:
+        # Outra thread pode ter carregado a temporada enquanto esperávamos o lock
+        entry = _seasons.get(season)
+        if entry is not None and not _is_stale(entry, season):
+            note(hits=1)
+            return entry
+
+        note(misses=1)
+        try:
+            games, new_games = sync_league_games(season)
+        except Exception:
+            if entry is None:
+                raise
+            # Sem conseguir atualizar, os dados já carregados continuam valendo
+            logger.warning("Falha ao sincronizar a temporada %s", season, exc_info=True)
+            entry["synced_at"] = time.time()
+            return entry
+
+        if entry is None or not new_games.empty:
+            entry = _build_season(games) if entry is None else _apply_new_games(entry, new_games)
+            memory = entry["memory"]
+            logger.info(
+                "Temporada %s: %d linhas, %.1f MB -> %.1f MB",
+                season, memory["rows"], memory["before_bytes"] / 1e6, memory["after_bytes"] / 1e6,
+            )
+        entry["synced_at"] = time.time()
+        _seasons[season] = entry
+    return entry
+
+
+@instrument()
+def get_season_games(season):
+    """Retorna a tabela de jogos de toda a liga na temporada."""
+    return _load_season(season)["games"]
+
+
+def prefetch_seasons(seasons):
+    """Carrega em paralelo as temporadas ainda não carregadas.
+
+    Falhas são ignoradas aqui; elas aparecem na chamada seguinte de
+    `get_season_games`/`get_team_games`, onde a página já trata o erro.
+    """
+    missing = [season for season in seasons if season not in _seasons]
+    fetch_all({season: partial(_load_season, season) for season in missing}, return_exceptions=True)
+
+
+def get_memory_report():
+    """Memória das tabelas das temporadas já carregadas, antes e depois da conversão de tipos (uma linha por temporada).
+
+    Não carrega nenhuma temporada: serve para o painel de depuração mostrar o
+    que o processo mantém em memória.
+    """
+    columns = ["season", "rows", "before_bytes", "after_bytes", "ratio"]
+    return pd.DataFrame(
+        [{"season": season, **entry["memory"]} for season, entry in sorted(_seasons.items())], columns=columns,
+    )
+
+
+def get_derived(name, season):
+    """Retorna um agregado registrado com `register_derived` para a temporada."""
+    entry = _load_season(season)
+    if name not in entry["derived"]:
+        build, _ = _derived[name]
+        entry["derived"][name] = build(entry["games"])
+    return entry["derived"][name]
+
+
+@instrument()
+def get_team_games(team_abbreviation, season):
+    """Retorna os jogos de um time na temporada como uma fatia da tabela da liga."""
+    entry = _load_season(season)
+    team_slice = entry["teams"].get(team_abbreviation)
+    if team_slice is None:
+        return entry["games"].iloc[0:0]
+    return entry["games"].iloc[team_slice]
+
+
+@instrument()
+def get_team_games_range(team_abbreviation, seasons):
+    """Retorna os jogos de um time em várias temporadas, com a coluna `SEASON`.
+
+    Temporadas já carregadas usam a fatia da tabela em memória; as demais são
+    lidas do armazenamento local apenas com as linhas do time, sem carregar a
+    temporada inteira.
+    """
+    frames = {}
+    for season in seasons:
+        entry = _seasons.get(season)
+        if entry is not None and not _is_stale(entry, season):
+            frames[season] = get_team_games(team_abbreviation, season).assign(SEASON=season)
+
+    missing = [season for season in seasons if season not in frames]
+    if missing:
+        stored = read_games("league_games", missing, filters=[("TEAM_ABBREVIATION", "in", [team_abbreviation])])
+        if not stored.empty:
+            for season, games in stored.groupby("SEASON", sort=False):
+                games = games.sort_values("GAME_ID", kind="stable")
+                frames[season] = enrich_games(normalize_games(games))
+
+    frames = [frames[season] for season in seasons if season in frames]
+    if not frames:
+        return pd.DataFrame()
+    # Categorias diferentes entre temporadas viram texto no concat; normalizar de novo refaz as categorias
+    return normalize_games(pd.concat(frames, ignore_index=True))
+
@@ -0,0 +1,137 @@
+"""Orçamento de tempo de importação de cada página.
+
+Cada página é executada em um interpretador novo, com o `AppTest` do
+Streamlit, e o tempo gasto importando módulos durante a execução é medido
+com `python -X importtime`. A importação do Streamlit e do pandas, paga por
+qualquer página, fica de fora. Além do tempo, é verificado quais bibliotecas
+pesadas (`HEAVY_MODULES`) a página carregou: cada página só pode carregar as
+que constam em `HEAVY_ALLOWED` (por exemplo, quem abre 🏀 Times NBA não paga
+pelo pygam).
+
+Uso:
+
+    python -m utils.import_budget ["Times NBA" ...]
+
+Sem argumentos, mede todas as páginas; com argumentos, só as páginas cujo
+nome contém algum deles. As páginas buscam dados normalmente, então convém
+rodar com os caches aquecidos (`python -m utils.warmup`) ou com
+`NBA_DATA_SOURCE=snapshot`.
+"""
+import argparse
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+PAGES = [ROOT / "Charlotte❤️Hornets.py", *sorted((ROOT / "pages").glob("*.py"))]
+
+HEAVY_MODULES = ["sklearn", "scipy", "pygam", "plotly.figure_factory"]
+
+# Bibliotecas pesadas que cada página pode carregar; as demais páginas não carregam nenhuma
+HEAVY_ALLOWED = {
+    "📈 GAMLSS.py": {"pygam", "sklearn", "scipy"},
+    "📈 Modelos Estatísticos.py": {"scipy"},
+    "📈 Regressão Linear.py": {"sklearn", "scipy"},
+    "📈 Regressão Logística.py": {"sklearn", "scipy"},
+}
+
+# Tempo máximo de importação (em segundos) de cada página, sem contar o Streamlit e o pandas
+DEFAULT_BUDGET = 1.0
+BUDGETS = {
+    "📈 GAMLSS.py": 3.0,
+    "📈 Modelos Estatísticos.py": 2.0,
+    "📈 Regressão Linear.py": 2.0,
+    "📈 Regressão Logística.py": 2.0,
+}
+
+MARKER = "import_budget: início da página"
+
+# Executado no interpretador novo: importa o Streamlit e o pandas, marca o início e roda a página
+_RUNNER = """
+import json, sys
+import pandas
+from streamlit.testing.v1 import AppTest
+sys.stderr.write({marker!r} + "\\n")
+sys.stderr.flush()
+app = AppTest.from_file(sys.argv[1], default_timeout=float(sys.argv[2])).run()
+print(json.dumps({{
+    "modules": [name for name in {heavy!r} if name in sys.modules],
+    "exceptions": [str(e.value) for e in app.exception],
+}}))
+"""
+
+_IMPORT_LINE = re.compile(r"^import time:\s+\d+ \|\s+(\d+) \| (\S.*)$")
+
+
+def _import_seconds(stderr):
+    """Soma o tempo das importações de primeiro nível registradas depois do marcador."""
+    total = 0
+    started = False
+    for line in stderr.splitlines():
+        if line == MARKER:
+            started = True
+            continue
+        match = _IMPORT_LINE.match(line) if started else None
+        if match:
+            total += int(match.group(1))
+    return total / 1e6
+
+
+def measure(page, timeout=600):
+    """Executa a página; retorna `(segundos importando, bibliotecas pesadas, exceções)`."""
+    runner = _RUNNER.format(marker=MARKER, heavy=HEAVY_MODULES)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", runner, str(page), str(timeout)],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "falha ao executar a página")
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    return _import_seconds(result.stderr), set(report["modules"]), report["exceptions"]
+
+
+def check(page, seconds, modules):
+    """Problemas da página em relação ao orçamento (lista vazia se estiver dentro dele)."""
+    problems = []
+    budget = BUDGETS.get(page.name, DEFAULT_BUDGET)
+    if seconds > budget:
+        problems.append(f"acima do orçamento de {budget:.1f}s")
+    extra = modules - HEAVY_ALLOWED.get(page.name, set())
+    if extra:
+        problems.append(f"importa {', '.join(sorted(extra))}")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mede o tempo de importação de cada página.")
+    parser.add_argument("pages", nargs="*", help="trechos do nome das páginas a medir (padrão: todas)")
+    parser.add_argument("--timeout", type=float, default=600, help="tempo máximo de execução de cada página")
+    args = parser.parse_args(argv)
+
+    pages = [page for page in PAGES if not args.pages or any(name in page.name for name in args.pages)]
+    if not pages:
+        print(f"Nenhuma página corresponde a: {', '.join(args.pages)}")
+        return 1
+    width = max(len(page.stem) for page in pages)
+    failures = 0
+    for page in pages:
+        try:
+            seconds, modules, exceptions = measure(page, args.timeout)
+        except Exception as e:
+            failures += 1
+            print(f"{page.stem:<{width}}  {'-':>8}  erro: {e}")
+            continue
+        problems = check(page, seconds, modules)
+        if exceptions:
+            problems.append(f"{len(exceptions)} exceção(ões) na página")
+        failures += bool(problems)
+        status = "ok" if not problems else "; ".join(problems)
+        print(f"{page.stem:<{width}}  {seconds:7.2f}s  {', '.join(sorted(modules)) or '-':<30}  {status}")
+    print(f"{len(pages)} páginas ({failures} fora do orçamento)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,209 @@
+"""Medição das funções de dados e de modelos das páginas.
+
+O decorador `instrument` registra, para cada chamada, o tempo de relógio, os
+acertos e as faltas de cache, os bytes baixados do stats.nba.com e a
+quantidade de linhas devolvidas. Os acertos, faltas e bytes são anotados
+pelas camadas de baixo (`note`, chamada pelo cache de respostas, pelo
+registro de modelos, pelo armazenamento em memória das temporadas e pelo
+acesso ao nba_api) e somados em todas as chamadas medidas em andamento,
+inclusive nas tarefas executadas em paralelo por `utils.fetch.fetch_all`
+(que as envolve com `propagate`).
+Assim, `get_player_data` mostra os bytes que as suas chamadas ao nba_api
+baixaram.
+
+Os registros mais recentes ficam em memória (`get_records`, `summarize`) e
+podem ser exportados em JSON Lines (`export_jsonl`). Com a variável de
+ambiente `NBA_METRICS_LOG`, cada registro também é acrescentado a esse
+arquivo assim que a chamada termina.
+"""
+import contextvars
+import functools
+import itertools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+METRICS_LOG = os.environ.get("NBA_METRICS_LOG")
+MAX_RECORDS = int(os.environ.get("NBA_METRICS_MAX_RECORDS", 2000))
+
+_records = deque(maxlen=MAX_RECORDS)
+_sequence = itertools.count(1)
+_lock = threading.Lock()
+
+# Registros das chamadas medidas em andamento no contexto atual (da mais externa para a mais interna)
+_active = contextvars.ContextVar("instrumentation_active", default=())
+# Sessão do Streamlit repassada às threads de `propagate`, que não têm o contexto do Streamlit
+_session = contextvars.ContextVar("instrumentation_session", default=None)
+
+
+def current_session():
+    """Id da sessão do Streamlit que executa o código atual, ou None fora do Streamlit."""
+    session = _session.get()
+    if session is not None:
+        return session
+    # Só consulta o Streamlit se ele já estiver carregado (por exemplo, fora do `python -m utils.warmup`)
+    if "streamlit" not in sys.modules:
+        return None
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx is not None else None
+
+
+def propagate(task):
+    """Envolve `task` para rodar em outra thread com as medições em andamento e a sessão atual."""
+    context = contextvars.copy_context()
+    context.run(_session.set, current_session())
+    return functools.partial(context.run, task)
+
+
+def count_rows(result):
+    """Linhas do resultado: de um DataFrame/Series ou somadas nos DataFrames de listas, tuplas e dicionários."""
+    if isinstance(result, (pd.DataFrame, pd.Series)):
+        return len(result)
+    if isinstance(result, dict):
+        result = list(result.values())
+    if isinstance(result, (list, tuple)):
+        counts = [count for count in map(count_rows, result) if count is not None]
+        return sum(counts) if counts else None
+    return None
+
+
+def note(hits=0, misses=0, bytes_fetched=0):
+    """Soma acertos/faltas de cache e bytes baixados nas chamadas medidas em andamento."""
+    records = _active.get()
+    if not records:
+        return
+    with _lock:
+        for record in records:
+            record["hits"] += hits
+            record["misses"] += misses
+            record["bytes"] += bytes_fetched
+
+
+def _write_log(record):
+    try:
+        with _lock, open(METRICS_LOG, "a", encoding="utf-8") as file:
+            file.write(json.dumps(record, default=str) + "\n")
+    except OSError:
+        logger.warning("Falha ao gravar métricas em %s", METRICS_LOG, exc_info=True)
+
+
+def _default_name(func):
+    module = func.__module__
+    if module == "__main__":
+        # Funções definidas nas páginas: usa o nome do arquivo da página
+        module = Path(func.__code__.co_filename).stem
+    return f"{module.removeprefix('utils.')}.{func.__qualname__}"
+
+
+def instrument(name=None):
+    """Decorador que registra tempo, cache, bytes e linhas de cada chamada da função."""
+
+    def decorator(func):
+        record_name = name or _default_name(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            parents = _active.get()
+            record = {
+                "seq": next(_sequence),
+                "name": record_name,
+                "session": parents[-1]["session"] if parents else current_session(),
+                "parent": parents[-1]["seq"] if parents else None,
+                "started_at": time.time(),
+                "hits": 0,
+                "misses": 0,
+                "bytes": 0,
+            }
+            token = _active.set(parents + (record,))
+            start = time.perf_counter()
+            error = None
+            result = None
+            try:
+                result = func(*args, **kwargs)
+                return result
+            except Exception as e:
+                error = e
+                raise
+            finally:
+                record["seconds"] = time.perf_counter() - start
+                _active.reset(token)
+                record["rows"] = count_rows(result)
+                record["error"] = None if error is None else f"{type(error).__name__}: {error}"
+                with _lock:
+                    _records.append(record)
+                if METRICS_LOG:
+                    _write_log(record)
+
+        return wrapper
+
+    return decorator
+
+
+def last_sequence():
+    """Maior número entre os registros guardados; use com `get_records(since=...)`."""
+    # As chamadas externas terminam (e são guardadas) depois das internas, então o último não é o maior
+    with _lock:
+        return max((record["seq"] for record in _records), default=0)
+
+
+def get_records(since=0, session=None):
+    """Registros guardados em memória, do mais antigo para o mais recente.
+
+    `since` ignora os registros com número menor ou igual a ele e `session`
+    mantém apenas os de uma sessão do Streamlit.
+    """
+    with _lock:
+        records = [dict(record) for record in _records]
+    return [
+        record for record in records
+        if record["seq"] > since and (session is None or record["session"] == session)
+    ]
+
+
+def summarize(records):
+    """Resumo por função: chamadas, tempo total/médio/p95, cache, bytes e linhas."""
+    columns = ["name", "calls", "seconds", "mean_seconds", "p95_seconds", "hits", "misses", "bytes", "rows", "errors"]
+    if not records:
+        return pd.DataFrame(columns=columns)
+    df = pd.DataFrame(records)
+    summary = df.groupby("name").agg(
+        calls=("seq", "size"),
+        seconds=("seconds", "sum"),
+        mean_seconds=("seconds", "mean"),
+        p95_seconds=("seconds", lambda seconds: seconds.quantile(0.95)),
+        hits=("hits", "sum"),
+        misses=("misses", "sum"),
+        bytes=("bytes", "sum"),
+        rows=("rows", "sum"),
+        errors=("error", "count"),
+    )
+    return summary.reset_index().sort_values("seconds", ascending=False)[columns]
+
+
+def to_jsonl(records):
+    """Registros em JSON Lines (um objeto por linha)."""
+    return "".join(json.dumps(record, default=str) + "\n" for record in records)
+
+
+def export_jsonl(path, records=None):
+    """Grava os registros (por padrão, todos os guardados em memória) em JSON Lines."""
+    records = get_records() if records is None else records
+    Path(path).write_text(to_jsonl(records), encoding="utf-8")
+    return len(records)
+
+
+def clear():
+    """Descarta os registros guardados em memória."""
+    with _lock:
+        _records.clear()
@@ -0,0 +1,130 @@
+"""Regressão linear com vários alvos resolvida em forma fechada.
+
+Os modelos de PTS, AST e REB usam a mesma matriz `X`, então os três alvos são
+resolvidos juntos em uma única chamada de mínimos quadrados. Para muitos
+jogadores de uma vez, as somas de cada jogador (as equações normais
+centradas, como faz o `LinearRegression` do scikit-learn) são acumuladas em
+pilhas e todos os sistemas são resolvidos em uma única operação.
+
+A divisão treino/teste é a mesma do `train_test_split(test_size=0.2,
+random_state=42)`, que só depende da quantidade de jogos; ela é reproduzida
+aqui com o NumPy para que as páginas que só usam a regressão linear não
+precisem importar o scikit-learn.
+"""
+import math
+from functools import lru_cache
+
+import numpy as np
+
+
+@lru_cache(maxsize=None)
+def _train_positions(n):
+    # Mesmo embaralhamento do ShuffleSplit: os primeiros ceil(20%) vão para o teste
+    n_test = math.ceil(0.2 * n)
+    if n_test >= n:
+        raise ValueError(f"Com {n} linha(s) o conjunto de treino fica vazio")
+    return np.random.RandomState(42).permutation(n)[n_test:]
+
+
+def train_mask(n):
+    """Máscara das linhas de treino para um conjunto com `n` linhas."""
+    mask = np.zeros(n, dtype=bool)
+    mask[_train_positions(n)] = True
+    return mask
+
+
+def fit_multi_target(X, Y):
+    """Ajusta todos os alvos (colunas de `Y`) de uma vez; retorna `(intercepto, coeficientes)`.
+
+    `coeficientes` tem uma linha por variável e uma coluna por alvo.
+    """
+    X_mean = X.mean(axis=0)
+    Y_mean = Y.mean(axis=0)
+    coef, *_ = np.linalg.lstsq(X - X_mean, Y - Y_mean, rcond=None)
+    return Y_mean - X_mean @ coef, coef
+
+
+def train_test_fit(X, Y):
+    """Divide em treino/teste, ajusta todos os alvos juntos e avalia no teste.
+
+    Retorna o intercepto, os coeficientes e, para o conjunto de teste, os
+    valores reais, as previsões, o MAE e o R² de cada alvo.
+    """
+    train = train_mask(len(X))
+    intercept, coef = fit_multi_target(X[train], Y[train])
+    Y_pred, mae, r2 = evaluate(X[~train], Y[~train], intercept, coef)
+    return {
+        "intercept": intercept,
+        "coef": coef,
+        "Y_test": Y[~train],
+        "Y_pred": Y_pred,
+        "mae": mae,
+        "r2": r2,
+    }
+
+
+def _r2(ss_res, ss_tot):
+    # Mesma convenção do r2_score: alvo constante no teste dá 1 se o erro for zero e 0 caso contrário
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r2 = 1 - ss_res / ss_tot
+    return np.where(ss_tot == 0, np.where(ss_res == 0, 1.0, 0.0), r2)
+
+
+def evaluate(X_test, Y_test, intercept, coef):
+    """Previsões, MAE e R² de cada alvo no conjunto de teste."""
+    Y_pred = intercept + X_test @ coef
+    mae = np.abs(Y_test - Y_pred).mean(axis=0)
+    ss_res = ((Y_test - Y_pred) ** 2).sum(axis=0)
+    ss_tot = ((Y_test - Y_test.mean(axis=0)) ** 2).sum(axis=0)
+    return Y_pred, mae, _r2(ss_res, ss_tot)
+
+
+def fit_grouped(groups, X, Y):
+    """Ajusta um modelo de vários alvos por grupo (por exemplo, por jogador), todos de uma vez.
+
+    `groups` precisa estar ordenado (linhas de cada grupo contíguas). Cada grupo
+    é dividido em treino/teste como no `train_test_split`. Retorna os grupos,
+    a quantidade de jogos, os interceptos (grupos × alvos), os coeficientes
+    (grupos × variáveis × alvos), o MAE e o R² (grupos × alvos).
+    """
+    keys, counts = np.unique(groups, return_counts=True)
+    codes = np.repeat(np.arange(len(keys)), counts)
+    train = np.concatenate([train_mask(n) for n in counts])
+
+    # Somas por grupo nas linhas de treino, acumuladas em pilhas
+    n_train = np.bincount(codes[train], minlength=len(keys)).astype(np.float64)
+    X_sum = np.zeros((len(keys), X.shape[1]))
+    Y_sum = np.zeros((len(keys), Y.shape[1]))
+    np.add.at(X_sum, codes[train], X[train])
+    np.add.at(Y_sum, codes[train], Y[train])
+    X_mean = X_sum / n_train[:, None]
+    Y_mean = Y_sum / n_train[:, None]
+
+    Xc = X[train] - X_mean[codes[train]]
+    Yc = Y[train] - Y_mean[codes[train]]
+    XtX = np.zeros((len(keys), X.shape[1], X.shape[1]))
+    XtY = np.zeros((len(keys), X.shape[1], Y.shape[1]))
+    np.add.at(XtX, codes[train], Xc[:, :, None] * Xc[:, None, :])
+    np.add.at(XtY, codes[train], Xc[:, :, None] * Yc[:, None, :])
+
+    # A pseudo-inversa dá a solução de norma mínima quando alguma variável é constante
+    coef = np.linalg.pinv(XtX, rcond=1e-10) @ XtY
+    intercept = Y_mean - np.einsum("gf,gft->gt", X_mean, coef)
+
+    # Métricas de cada grupo nas linhas de teste
+    test = ~train
+    test_codes = codes[test]
+    Y_test = Y[test]
+    Y_pred = intercept[test_codes] + np.einsum("nf,nft->nt", X[test], coef[test_codes])
+    n_test = np.bincount(test_codes, minlength=len(keys)).astype(np.float64)[:, None]
+
+    abs_error = np.zeros_like(intercept)
+    sq_error = np.zeros_like(intercept)
+    Y_test_sum = np.zeros_like(intercept)
+    np.add.at(abs_error, test_codes, np.abs(Y_test - Y_pred))
+    np.add.at(sq_error, test_codes, (Y_test - Y_pred) ** 2)
+    np.add.at(Y_test_sum, test_codes, Y_test)
+    sq_total = np.zeros_like(intercept)
+    np.add.at(sq_total, test_codes, (Y_test - (Y_test_sum / n_test)[test_codes]) ** 2)
+
+    return keys, counts, intercept, coef, abs_error / n_test, _r2(sq_error, sq_total)
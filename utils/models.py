@@ -0,0 +1,105 @@
+"""Registro de modelos treinados, para que reruns do Streamlit não retreinem.
+
+Cada resultado de treino (modelo ajustado e suas métricas) é identificado por
+uma chave com o tipo do modelo, o jogador, as temporadas, as variáveis, o
+alvo e um hash dos dados usados. Os resultados ficam em um LRU em memória e
+são serializados em disco, então sobrevivem também a reinícios do app.
+"""
+import hashlib
+import logging
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import pandas as pd
+
+from utils.cache import unique_tmp_path
+from utils.instrumentation import note
+
+logger = logging.getLogger(__name__)
+
+MODELS_DIR = Path(os.environ.get("NBA_MODELS_DIR", Path(__file__).resolve().parent.parent / ".cache" / "models"))
+MAX_MEMORY_MODELS = int(os.environ.get("NBA_MAX_MEMORY_MODELS", 128))
+
+_memory = OrderedDict()
+_lock = threading.Lock()
+
+
+def hash_data(df):
+    """Calcula um hash do conteúdo (valores e colunas) de um DataFrame."""
+    digest = hashlib.sha1(",".join(map(str, df.columns)).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def make_key(*parts):
+    """Gera a chave do registro a partir das partes que identificam o treino."""
+    return hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()
+
+
+def _remember(key, value):
+    with _lock:
+        _memory[key] = value
+        _memory.move_to_end(key)
+        while len(_memory) > MAX_MEMORY_MODELS:
+            _memory.popitem(last=False)
+
+
+def _path(key):
+    return MODELS_DIR / f"{key}.pkl"
+
+
+def contains(key_parts):
+    """Indica se já existe um resultado (em memória ou em disco) para `key_parts`."""
+    key = make_key(*key_parts)
+    with _lock:
+        if key in _memory:
+            return True
+    return _path(key).exists()
+
+
+def get_or_fit(key_parts, fit):
+    """Retorna o resultado em cache para `key_parts` ou executa `fit()` e guarda o resultado."""
+    key = make_key(*key_parts)
+
+    with _lock:
+        if key in _memory:
+            _memory.move_to_end(key)
+            note(hits=1)
+            return _memory[key]
+
+    path = _path(key)
+    try:
+        with open(path, "rb") as file:
+            result = pickle.load(file)
+    except FileNotFoundError:
+        result = None
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        logger.warning("Modelo em disco inválido: %s; treinando novamente", path, exc_info=True)
+        result = None
+
+    if result is None:
+        note(misses=1)
+        result = fit()
+        MODELS_DIR.mkdir(parents=True, exist_ok=True)
+        # Duas sessões (ou uma página e o aquecimento) podem treinar a mesma chave ao mesmo tempo
+        tmp_path = unique_tmp_path(path)
+        with open(tmp_path, "wb") as file:
+            pickle.dump(result, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    else:
+        note(hits=1)
+
+    _remember(key, result)
+    return result
+
+
+def clear(memory_only=False):
+    """Esvazia o registro em memória e, opcionalmente, os modelos em disco."""
+    with _lock:
+        _memory.clear()
+    if not memory_only:
+        for path in MODELS_DIR.glob("*.pkl"):
+            path.unlink(missing_ok=True)
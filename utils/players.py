@@ -0,0 +1,15 @@
+"""Jogadores do Charlotte Hornets analisados nas páginas (nome -> ID na NBA API)."""
+
+# Jogadores das páginas de jogadores e de regressão
+hornets_players = {
+    "LaMelo Ball": 1630163,
+    "Brandon Miller": 1641706,
+    "Moussa Diabate": 1631217
+}
+
+# Jogadores da seção GAMLSS de Modelos Estatísticos
+gamlss_players = {
+    "LaMelo Ball": 1630163,
+    "Moussa Diabate": 1631217,
+    "Brandon Miller": 1641705
+}
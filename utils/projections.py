@@ -0,0 +1,134 @@
+"""Projeções em lote das regressões lineares dos jogadores.
+
+Em vez de treinar jogador por jogador a cada carregamento de página, os logs
+de todos os jogadores vêm de uma única tabela (`LeagueGameFinder` por
+jogador, uma chamada por temporada), os modelos MIN/FGA/TOV -> PTS/AST/REB de
+todos os jogadores são ajustados juntos, em forma fechada (`utils.linear`), e
+uma grade de entradas hipotéticas é pontuada para todos eles em uma única
+operação matricial. O resultado é uma tabela longa (jogador × alvo × ponto da
+grade) que pode ser filtrada com `query_projections`.
+"""
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from utils.instrumentation import instrument
+from utils.linear import fit_grouped
+from utils.schema import normalize_games
+from utils.sync import read_games
+
+FEATURES = ["MIN", "FGA", "TOV"]
+TARGETS = ["PTS", "AST", "REB"]
+
+# Com menos jogos que isso, a divisão treino/teste não deixa dados para avaliar o modelo
+MIN_GAMES = 10
+
+
+@instrument()
+def get_league_player_games(seasons, team_abbreviations=None, player_ids=None):
+    """Logs de jogos de todos os jogadores (ou dos times/jogadores pedidos) nas temporadas."""
+    filters = []
+    if team_abbreviations:
+        filters.append(("TEAM_ABBREVIATION", "in", list(team_abbreviations)))
+    if player_ids:
+        filters.append(("PLAYER_ID", "in", [int(player_id) for player_id in player_ids]))
+    columns = ["PLAYER_ID", "PLAYER_NAME", "TEAM_ABBREVIATION", "GAME_ID", "GAME_DATE", *FEATURES, *TARGETS]
+    games = read_games("league_player_games", seasons, filters=filters or None, columns=columns)
+    return normalize_games(games)
+
+
+def _player_order(games):
+    """Ordem das linhas para o ajuste: por jogador e, dentro dele, na mesma ordem dos logs das páginas.
+
+    A divisão treino/teste depende da posição de cada jogo, então as linhas de
+    cada jogador seguem a ordem de `utils.regression.load_player_data`:
+    temporadas na ordem em que aparecem (a ordem pedida em
+    `get_league_player_games`) e, em cada uma, do jogo mais recente para o
+    mais antigo (como o PlayerGameLog).
+    """
+    seasons = pd.factorize(games["SEASON"])[0] if "SEASON" in games else np.zeros(len(games), dtype=int)
+    dates = pd.to_datetime(games["GAME_DATE"]).to_numpy().astype(np.int64)
+    game_ids = pd.factorize(games["GAME_ID"], sort=True)[0]
+    # O np.lexsort ordena pela última chave primeiro; datas e jogos negativos ficam em ordem decrescente
+    return np.lexsort((-game_ids, -dates, seasons, games["PLAYER_ID"].to_numpy()))
+
+
+def _fit_all(games):
+    games = games.take(_player_order(games))
+    player_ids, counts, intercept, coef, mae, r2 = fit_grouped(
+        games["PLAYER_ID"].to_numpy(),
+        games[FEATURES].to_numpy(np.float64),
+        games[TARGETS].to_numpy(np.float64),
+    )
+
+    # Uma linha por jogador × alvo
+    n_players, n_targets = intercept.shape
+    models = pd.DataFrame({
+        "PLAYER_ID": np.repeat(player_ids, n_targets),
+        "GAMES": np.repeat(counts, n_targets),
+        "TARGET": np.tile(TARGETS, n_players),
+        "INTERCEPT": intercept.ravel(),
+    })
+    for i, feature in enumerate(FEATURES):
+        models[f"COEF_{feature}"] = coef[:, i, :].ravel()
+    models["MAE"] = mae.ravel()
+    models["R2"] = r2.ravel()
+    return models
+
+
+@instrument()
+def fit_player_models(games):
+    """Ajusta os modelos de todos os jogadores com pelo menos `MIN_GAMES` jogos.
+
+    Retorna uma linha por jogador × alvo com o intercepto, os coeficientes,
+    o MAE e o R² no conjunto de teste.
+    """
+    games = games.dropna(subset=FEATURES + TARGETS)
+    games = games[games.groupby("PLAYER_ID", observed=True)["PLAYER_ID"].transform("size") >= MIN_GAMES]
+    models = _fit_all(games) if not games.empty else pd.DataFrame()
+    if models.empty:
+        return models
+
+    names = games.drop_duplicates("PLAYER_ID").set_index("PLAYER_ID")["PLAYER_NAME"].astype(str)
+    return models.assign(PLAYER_NAME=models["PLAYER_ID"].map(names))
+
+
+def make_grid(**values):
+    """Grade com todas as combinações dos valores de cada variável (ex.: `MIN=[20, 30]`)."""
+    missing = [feature for feature in FEATURES if feature not in values]
+    if missing:
+        raise ValueError(f"Valores ausentes na grade: {missing}")
+    return pd.DataFrame(list(itertools.product(*(values[feature] for feature in FEATURES))), columns=FEATURES)
+
+
+@instrument()
+def score_grid(models, grid):
+    """Pontua a grade para todos os modelos de uma vez.
+
+    Retorna uma linha por modelo (jogador × alvo) × ponto da grade, com a
+    previsão em `PREDICTION`.
+    """
+    coefs = models[[f"COEF_{feature}" for feature in FEATURES]].to_numpy()
+    # (modelos × variáveis) @ (variáveis × pontos da grade) = (modelos × pontos da grade)
+    predictions = models["INTERCEPT"].to_numpy()[:, None] + coefs @ grid[FEATURES].to_numpy(np.float64).T
+
+    n_models, n_points = predictions.shape
+    projections = models[["PLAYER_ID", "PLAYER_NAME", "TARGET"]].iloc[np.repeat(np.arange(n_models), n_points)]
+    projections = projections.reset_index(drop=True)
+    for feature in FEATURES:
+        projections[feature] = np.tile(grid[feature].to_numpy(), n_models)
+    projections["PREDICTION"] = predictions.ravel()
+    return projections
+
+
+def query_projections(projections, player_name=None, target=None, **features):
+    """Filtra a tabela de projeções por jogador, alvo e valores das variáveis."""
+    mask = np.ones(len(projections), dtype=bool)
+    if player_name is not None:
+        mask &= (projections["PLAYER_NAME"] == player_name).to_numpy()
+    if target is not None:
+        mask &= (projections["TARGET"] == target).to_numpy()
+    for feature, value in features.items():
+        mask &= (projections[feature] == value).to_numpy()
+    return projections[mask]
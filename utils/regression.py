@@ -0,0 +1,96 @@
+"""Dados e treinos das páginas de regressão linear e logística.
+
+As funções ficam fora das páginas para que o aquecimento dos caches
+(`utils.warmup`) treine exatamente os mesmos modelos, com as mesmas chaves no
+registro, que as páginas leem depois.
+"""
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from utils import models as model_registry
+from utils.fetch import fetch_all
+from utils.instrumentation import instrument
+from utils.linear import train_test_fit
+from utils.sync import get_player_game_log
+
+# Variáveis independentes (features) e dependentes (targets) das páginas
+FEATURES = ["MIN", "FGA", "TOV"]  # Tempo de quadra, arremessos tentados e turnovers
+TARGETS = ["PTS", "AST", "REB"]   # Pontos, assistências e rebotes
+
+
+@instrument()
+def load_player_data(player_id, seasons):
+    """Junta os logs do jogador nas temporadas; retorna `(dados, {temporada: erro})`."""
+    # As temporadas são buscadas em paralelo
+    logs = fetch_all({
+        season: partial(get_player_game_log, player_id, season)
+        for season in seasons
+    }, return_exceptions=True)
+
+    all_data = []
+    errors = {}
+    for season in seasons:
+        log = logs[season]
+        if isinstance(log, Exception):
+            errors[season] = log
+            continue
+        all_data.append(log[FEATURES + TARGETS])
+
+    if all_data:
+        return pd.concat(all_data, ignore_index=True), errors
+    return pd.DataFrame(), errors
+
+
+@instrument()
+def train_linear(df, feature_cols, target_cols):
+    """Treina a regressão linear de todos os alvos em um único ajuste."""
+    X = df[feature_cols].to_numpy(np.float64)
+    Y = df[target_cols].to_numpy(np.float64)
+
+    # Divisão treino/teste igual à do train_test_split(test_size=0.2, random_state=42)
+    return train_test_fit(X, Y)
+
+
+@instrument()
+def train_logistic(df, feature_cols, target_col):
+    """Treina a regressão logística de um alvo (1 se acima da média, 0 se abaixo)."""
+    # O scikit-learn só é importado quando algum modelo precisa ser treinado
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.model_selection import train_test_split
+
+    X = df[feature_cols]
+    y = (df[target_col] > df[target_col].mean()).astype(int)
+
+    # Divisão treino/teste
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+
+    model = LogisticRegression()
+    model.fit(X_train, y_train)
+
+    y_pred = model.predict(X_test)
+    y_pred_prob = model.predict_proba(X_test)[:, 1]
+
+    return model, X_test, y_test, y_pred, y_pred_prob
+
+
+def get_linear_fit(player_name, seasons, df, features=FEATURES, targets=TARGETS):
+    """Resultado de `train_linear`, reaproveitado do registro quando os dados não mudaram."""
+    data_hash = model_registry.hash_data(df)
+    return model_registry.get_or_fit(
+        ("linear", player_name, tuple(seasons), tuple(features), tuple(targets), data_hash),
+        partial(train_linear, df, features, targets),
+    )
+
+
+def get_logistic_fits(player_name, seasons, df, features=FEATURES, targets=TARGETS):
+    """Resultados de `train_logistic` para cada alvo, reaproveitados do registro."""
+    data_hash = model_registry.hash_data(df)
+    return {
+        target: model_registry.get_or_fit(
+            ("logistic", player_name, tuple(seasons), tuple(features), target, data_hash),
+            partial(train_logistic, df, features, target),
+        )
+        for target in targets
+    }
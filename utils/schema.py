@@ -0,0 +1,71 @@
+"""Tipos compactos para as tabelas de jogos da liga (por time e por jogador).
+
+Os quadros do `LeagueGameFinder` chegam com textos em colunas `object` e
+estatísticas em int64/float64. Na entrada do armazenamento em memória
+(`utils.games`) eles são convertidos para:
+
+- `category` nas colunas de time, jogo, confronto, resultado e temporada;
+- `datetime64` em `GAME_DATE`;
+- int16/float32 nas estatísticas (int32 nos IDs de time e de jogador).
+
+Os tipos são fixos (e não "o menor que couber") para que lotes incrementais
+da mesma temporada tenham sempre o mesmo schema.
+"""
+import numpy as np
+import pandas as pd
+
+CATEGORY_COLUMNS = ["SEASON", "SEASON_ID", "PLAYER_NAME", "TEAM_ABBREVIATION", "TEAM_NAME", "GAME_ID", "MATCHUP", "WL"]
+DATE_COLUMNS = ["GAME_DATE"]
+ID_COLUMNS = ["TEAM_ID", "PLAYER_ID"]
+COUNT_COLUMNS = [
+    "MIN", "PTS", "FGM", "FGA", "FG3M", "FG3A", "FTM", "FTA",
+    "OREB", "DREB", "REB", "AST", "STL", "BLK", "TOV", "PF",
+]
+FLOAT_COLUMNS = ["FG_PCT", "FG3_PCT", "FT_PCT", "PLUS_MINUS"]
+
+
+def _to_integer(column, dtype):
+    """Converte para inteiro; com valores ausentes, cai para float32."""
+    column = pd.to_numeric(column)
+    if column.isna().any():
+        return column.astype(np.float32)
+    return column.astype(dtype)
+
+
+def normalize_games(games):
+    """Retorna `games` com os tipos compactos do schema (colunas ausentes são ignoradas)."""
+    columns = {}
+    for name in CATEGORY_COLUMNS:
+        if name in games and not isinstance(games[name].dtype, pd.CategoricalDtype):
+            # Categorias ordenadas lexicograficamente, como os textos originais
+            columns[name] = games[name].astype("category")
+    for name in DATE_COLUMNS:
+        if name in games and not pd.api.types.is_datetime64_any_dtype(games[name]):
+            columns[name] = pd.to_datetime(games[name], format="mixed")
+    for name in ID_COLUMNS:
+        if name in games:
+            columns[name] = _to_integer(games[name], np.int32)
+    for name in COUNT_COLUMNS:
+        if name in games:
+            columns[name] = _to_integer(games[name], np.int16)
+    for name in FLOAT_COLUMNS:
+        if name in games:
+            columns[name] = pd.to_numeric(games[name]).astype(np.float32)
+    return games.assign(**columns)
+
+
+def memory_usage(frame):
+    """Memória ocupada pelo DataFrame, em bytes (inclui o conteúdo dos textos)."""
+    return int(frame.memory_usage(deep=True).sum())
+
+
+def memory_report(before, after):
+    """Resumo da memória antes e depois da normalização."""
+    before_bytes = memory_usage(before)
+    after_bytes = memory_usage(after)
+    return {
+        "rows": len(after),
+        "before_bytes": before_bytes,
+        "after_bytes": after_bytes,
+        "ratio": before_bytes / after_bytes if after_bytes else None,
+    }
@@ -0,0 +1,41 @@
+"""Funções auxiliares para lidar com as temporadas da NBA ("2024-25")."""
+import os
+from datetime import date
+
+# Primeira temporada oferecida nos seletores de período das páginas
+FIRST_SEASON = os.environ.get("NBA_FIRST_SEASON", "2014-15")
+
+# Período selecionado por padrão nas páginas
+DEFAULT_SEASONS = ("2023-24", "2024-25")
+
+
+def season_start_year(season):
+    """Retorna o ano de início de uma temporada no formato "2024-25"."""
+    return int(str(season)[:4])
+
+
+def format_season(start_year):
+    """Monta a temporada no formato "2024-25" a partir do ano de início."""
+    return f"{start_year}-{str(start_year + 1)[-2:]}"
+
+
+def current_season(today=None):
+    """Retorna a temporada em andamento; a temporada regular começa em outubro."""
+    today = today or date.today()
+    year = today.year if today.month >= 10 else today.year - 1
+    return format_season(year)
+
+
+def is_past_season(season, today=None):
+    """Indica se a temporada já terminou (seus dados não mudam mais)."""
+    return season_start_year(season) < season_start_year(current_season(today))
+
+
+def season_range(first, last):
+    """Lista as temporadas de `first` até `last`, inclusive."""
+    return [format_season(year) for year in range(season_start_year(first), season_start_year(last) + 1)]
+
+
+def available_seasons(today=None):
+    """Temporadas disponíveis para análise, de `FIRST_SEASON` até a temporada atual."""
+    return season_range(FIRST_SEASON, current_season(today))
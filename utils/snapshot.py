@@ -0,0 +1,198 @@
+"""Fonte de dados offline que responde às chamadas do nba_api a partir dos CSVs em `EDA/`.
+
+`EDA/all_nba_games_2023_2025.csv` tem o mesmo formato do `LeagueGameFinder` e
+`EDA/jogos_charlotte_hornets.csv` o mesmo formato do `PlayerGameLog`. Os
+demais endpoints (e o `LeagueGameFinder` por jogador, com os jogadores do
+Charlotte Hornets) são derivados dessas duas tabelas quando possível. Os CSVs
+só são lidos na primeira chamada e com os tipos das colunas já definidos
+(por exemplo, `GAME_ID` como texto para não perder os zeros à esquerda).
+"""
+import inspect
+from functools import lru_cache
+from pathlib import Path
+
+import pandas as pd
+from nba_api.stats.static import players, teams
+
+from utils.enrich import enrich_games
+from utils.seasons import season_start_year
+
+EDA_DIR = Path(__file__).resolve().parent.parent / "EDA"
+LEAGUE_GAMES_CSV = EDA_DIR / "all_nba_games_2023_2025.csv"
+PLAYER_GAMES_CSV = EDA_DIR / "jogos_charlotte_hornets.csv"
+
+_STATS_DTYPES = {
+    "MIN": "int64", "PTS": "int64", "FGM": "int64", "FGA": "int64", "FG_PCT": "float64",
+    "FG3M": "int64", "FG3A": "int64", "FG3_PCT": "float64", "FTM": "int64", "FTA": "int64",
+    "FT_PCT": "float64", "OREB": "int64", "DREB": "int64", "REB": "int64", "AST": "int64",
+    "STL": "int64", "BLK": "int64", "TOV": "int64", "PF": "int64",
+}
+
+LEAGUE_GAMES_DTYPES = {
+    "SEASON_ID": "str", "TEAM_ID": "int64", "TEAM_ABBREVIATION": "str", "TEAM_NAME": "str",
+    "GAME_ID": "str", "GAME_DATE": "str", "MATCHUP": "str", "WL": "str",
+    **_STATS_DTYPES,
+    "PLUS_MINUS": "float64",
+}
+
+PLAYER_GAMES_DTYPES = {
+    "SEASON_ID": "str", "Player_ID": "int64", "Game_ID": "str", "GAME_DATE": "str",
+    "MATCHUP": "str", "WL": "str",
+    **_STATS_DTYPES,
+    "PLUS_MINUS": "int64", "VIDEO_AVAILABLE": "int64",
+}
+
+LEAGUE_PLAYER_GAMES_COLUMNS = [
+    "SEASON_ID", "PLAYER_ID", "PLAYER_NAME", "TEAM_ID", "TEAM_ABBREVIATION", "TEAM_NAME", "GAME_ID",
+    "GAME_DATE", "MATCHUP", "WL", "MIN", "PTS", "FGM", "FGA", "FG_PCT", "FG3M", "FG3A", "FG3_PCT",
+    "FTM", "FTA", "FT_PCT", "OREB", "DREB", "REB", "AST", "STL", "BLK", "TOV", "PF", "PLUS_MINUS",
+]
+
+TEAM_GAME_LOG_COLUMNS = [
+    "Team_ID", "Game_ID", "GAME_DATE", "MATCHUP", "WL", "W", "L", "W_PCT", "MIN", "FGM", "FGA",
+    "FG_PCT", "FG3M", "FG3A", "FG3_PCT", "FTM", "FTA", "FT_PCT", "OREB", "DREB", "REB", "AST",
+    "STL", "BLK", "TOV", "PF", "PTS",
+]
+
+
+class SnapshotUnavailable(LookupError):
+    """A chamada não pode ser respondida com os dados dos snapshots."""
+
+
+@lru_cache(maxsize=None)
+def league_games():
+    """Tabela de jogos da liga (formato do `LeagueGameFinder`)."""
+    return pd.read_csv(LEAGUE_GAMES_CSV, dtype=LEAGUE_GAMES_DTYPES)
+
+
+@lru_cache(maxsize=None)
+def player_games():
+    """Logs de jogos dos jogadores do Charlotte Hornets (formato do `PlayerGameLog`)."""
+    return pd.read_csv(PLAYER_GAMES_CSV, dtype=PLAYER_GAMES_DTYPES)
+
+
+def _filter_season(frame, season, regular_season_only=False):
+    # SEASON_ID tem o tipo da temporada no primeiro dígito e o ano de início nos demais ("22023")
+    if season:
+        frame = frame[frame["SEASON_ID"].str[1:] == str(season_start_year(season))]
+    if regular_season_only:
+        frame = frame[frame["SEASON_ID"].str[0] == "2"]
+    return frame
+
+
+def _filter_date_from(frame, date_from):
+    # Os endpoints recebem as datas no formato MM/DD/YYYY
+    if date_from:
+        dates = pd.to_datetime(frame["GAME_DATE"], format="mixed")
+        frame = frame[dates >= pd.to_datetime(date_from, format="%m/%d/%Y")]
+    return frame
+
+
+def _league_player_games():
+    # Os logs dos jogadores no formato do LeagueGameFinder com player_or_team_abbreviation="P"
+    games = player_games().rename(columns={"Player_ID": "PLAYER_ID", "Game_ID": "GAME_ID"})
+    team_by_abbreviation = {team["abbreviation"]: team for team in teams.get_teams()}
+    abbreviations = games["MATCHUP"].str.split(" ").str[0]
+    names = {player_id: (players.find_player_by_id(player_id) or {}).get("full_name") for player_id in games["PLAYER_ID"].unique()}
+    return games.assign(
+        PLAYER_NAME=games["PLAYER_ID"].map(names),
+        TEAM_ID=abbreviations.map(lambda abbreviation: team_by_abbreviation[abbreviation]["id"]),
+        TEAM_ABBREVIATION=abbreviations,
+        TEAM_NAME=abbreviations.map(lambda abbreviation: team_by_abbreviation[abbreviation]["full_name"]),
+        GAME_DATE=pd.to_datetime(games["GAME_DATE"], format="%b %d, %Y").dt.strftime("%Y-%m-%d"),
+        PLUS_MINUS=games["PLUS_MINUS"].astype("float64"),
+    )[LEAGUE_PLAYER_GAMES_COLUMNS]
+
+
+def _league_game_finder(season_nullable=None, team_id_nullable=None, date_from_nullable=None,
+                        player_or_team_abbreviation="T"):
+    if player_or_team_abbreviation == "P":
+        games = _filter_season(_league_player_games(), season_nullable)
+    else:
+        games = _filter_season(league_games(), season_nullable)
+    if team_id_nullable:
+        games = games[games["TEAM_ID"] == int(team_id_nullable)]
+    return [_filter_date_from(games, date_from_nullable).reset_index(drop=True)]
+
+
+def _player_game_log(player_id, season=None, date_from_nullable=None):
+    games = _filter_season(player_games(), season)
+    # Assim como a API, um jogador sem jogos na temporada resulta em uma tabela vazia
+    games = games[games["Player_ID"] == int(player_id)]
+    return [_filter_date_from(games, date_from_nullable).reset_index(drop=True)]
+
+
+def _team_game_log(team_id, season=None):
+    games = _filter_season(league_games(), season, regular_season_only=True)
+    games = games[games["TEAM_ID"] == int(team_id)].sort_values("GAME_DATE")
+
+    log = games.rename(columns={"TEAM_ID": "Team_ID", "GAME_ID": "Game_ID"})
+    log["GAME_DATE"] = pd.to_datetime(log["GAME_DATE"]).dt.strftime("%b %d, %Y").str.upper()
+    log["W"] = (log["WL"] == "W").cumsum()
+    log["L"] = (log["WL"] == "L").cumsum()
+    log["W_PCT"] = (log["W"] / (log["W"] + log["L"])).round(3)
+
+    # O TeamGameLog devolve os jogos do mais recente para o mais antigo
+    return [log[TEAM_GAME_LOG_COLUMNS].iloc[::-1].reset_index(drop=True)]
+
+
+def _player_career_stats(player_id):
+    games = player_games()
+    games = games[games["Player_ID"] == int(player_id)]
+    if games.empty:
+        raise SnapshotUnavailable(f"Jogador {player_id} não está no snapshot")
+
+    stats = list(_STATS_DTYPES)
+    totals = games.groupby("SEASON_ID", as_index=False).agg(GP=("Game_ID", "size"), **{stat: (stat, "sum") for stat in stats})
+    totals["SEASON_ID"] = totals["SEASON_ID"].map(lambda season_id: f"{season_id[1:]}-{str(int(season_id[1:]) + 1)[-2:]}")
+    totals.insert(0, "PLAYER_ID", int(player_id))
+    totals.insert(2, "LEAGUE_ID", "00")
+    return [totals]
+
+
+def _league_standings(season=None):
+    # Importado aqui porque utils.standings depende (via utils.games) deste módulo
+    from utils.standings import calculate_standings
+
+    games = _filter_season(league_games(), season)
+    if season is None:
+        games = games[games["SEASON_ID"].str[1:] == games["SEASON_ID"].str[1:].max()]
+
+    standings = calculate_standings(enrich_games(games))
+    standings["TeamID"] = standings["TEAM_ABBREVIATION"].map(games.drop_duplicates("TEAM_ABBREVIATION").set_index("TEAM_ABBREVIATION")["TEAM_ID"])
+    standings["Conference"] = standings["Conference"].map({"Leste": "East", "Oeste": "West"})
+    standings["L10"] = standings["Last_10"]
+    standings["HOME"] = standings["Home_Wins"].astype(str) + "-" + standings["Home_Losses"].astype(str)
+    standings["ROAD"] = standings["Away_Wins"].astype(str) + "-" + standings["Away_Losses"].astype(str)
+    standings = standings.rename(columns={
+        "TEAM_NAME": "TeamName", "Conference_Rank": "PlayoffRank", "Wins": "WINS", "Losses": "LOSSES", "Win_Percentage": "WinPCT",
+    })
+    columns = ["TeamID", "TeamName", "Conference", "PlayoffRank", "WINS", "LOSSES", "WinPCT", "HOME", "ROAD", "L10"]
+    return [standings[columns].sort_values(["Conference", "PlayoffRank"]).reset_index(drop=True)]
+
+
+def _common_player_info(player_id):
+    raise SnapshotUnavailable("Os snapshots não têm as informações cadastrais dos jogadores")
+
+
+ENDPOINTS = {
+    "leaguegamefinder": _league_game_finder,
+    "playergamelog": _player_game_log,
+    "teamgamelog": _team_game_log,
+    "playercareerstats": _player_career_stats,
+    "leaguestandings": _league_standings,
+    "commonplayerinfo": _common_player_info,
+}
+
+
+def get_data_frames(endpoint, **params):
+    """Responde à chamada do endpoint usando os snapshots em `EDA/`."""
+    try:
+        handler = ENDPOINTS[endpoint]
+    except KeyError:
+        raise SnapshotUnavailable(f"Endpoint sem snapshot: {endpoint}") from None
+    try:
+        inspect.signature(handler).bind(**params)
+    except TypeError as e:
+        raise SnapshotUnavailable(f"Parâmetros não suportados pelo snapshot de {endpoint}: {e}") from None
+    return handler(**params)
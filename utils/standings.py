@@ -0,0 +1,92 @@
+"""Classificação materializada da temporada, calculada a partir da tabela de jogos da liga.
+
+A tabela é calculada uma vez por temporada com operações vetorizadas sobre
+as colunas `WIN` e `IS_HOME` de `utils.enrich` e fica guardada junto da
+temporada em `utils.games`. Quando chegam jogos novos, as contagens são
+somadas apenas com esses jogos e os últimos 10 jogos (de `utils.form`) são
+recalculados só para os times que jogaram.
+"""
+import pandas as pd
+
+from utils import games as games_store
+from utils.form import compute_form, summarize_form
+from utils.games import regular_season_games
+from utils.instrumentation import instrument
+from utils.teams import eastern_conference_teams, nba_teams
+
+COUNT_COLUMNS = ["Wins", "Losses", "Home_Wins", "Home_Losses", "Away_Wins", "Away_Losses"]
+
+
+def _counts(games):
+    win = games["WIN"]
+    loss = games["WL"] == "L"
+    home = games["IS_HOME"]
+    flags = pd.DataFrame({
+        "TEAM_ABBREVIATION": games["TEAM_ABBREVIATION"].astype(str),
+        "Wins": win,
+        "Losses": loss,
+        "Home_Wins": win & home,
+        "Home_Losses": loss & home,
+        "Away_Wins": win & ~home,
+        "Away_Losses": loss & ~home,
+    })
+    return flags.groupby("TEAM_ABBREVIATION")[COUNT_COLUMNS].sum()
+
+
+def _last_10(games):
+    return summarize_form(compute_form(games))["Last_10"]
+
+
+def _finish(counts, last_10):
+    standings = counts.astype(int)
+    standings["Win_Percentage"] = standings["Wins"] / (standings["Wins"] + standings["Losses"])
+    standings["Last_10"] = last_10.reindex(standings.index)
+    standings["Conference"] = ["Leste" if team in eastern_conference_teams else "Oeste" for team in standings.index]
+    standings["Conference_Rank"] = (
+        standings.groupby("Conference")["Win_Percentage"].rank(method="first", ascending=False).astype(int)
+    )
+    standings.insert(0, "TEAM_NAME", standings.index.map(nba_teams))
+
+    standings = standings.sort_values(by="Win_Percentage", ascending=False, kind="stable")
+    return standings.rename_axis("TEAM_ABBREVIATION").reset_index()
+
+
+def calculate_standings(games):
+    """Calcula a classificação (vitórias, derrotas, casa/fora, últimos 10 e posição na conferência)."""
+    games = regular_season_games(games)
+    return _finish(_counts(games), _last_10(games))
+
+
+def update_standings(previous, games, new_games):
+    """Atualiza a classificação com os jogos novos, sem reagrupar a temporada inteira."""
+    new_games = regular_season_games(new_games)
+    if new_games.empty:
+        return previous
+
+    previous = previous.set_index("TEAM_ABBREVIATION")
+    counts = previous[COUNT_COLUMNS].add(_counts(new_games), fill_value=0)
+
+    # Os últimos 10 jogos só mudam para os times que jogaram
+    teams = new_games["TEAM_ABBREVIATION"].astype(str).unique()
+    games = regular_season_games(games)
+    last_10 = previous["Last_10"].reindex(counts.index)
+    last_10.update(_last_10(games[games["TEAM_ABBREVIATION"].isin(teams)]))
+    return _finish(counts, last_10)
+
+
+games_store.register_derived("standings", calculate_standings, update_standings)
+
+
+@instrument()
+def get_standings(season):
+    """Retorna a classificação materializada da temporada."""
+    return games_store.get_derived("standings", season)
+
+
+def get_team_standings(team_abbreviation, season):
+    """Retorna a linha da classificação de um time (ou None se ele não tiver jogos)."""
+    standings = get_standings(season)
+    team_standings = standings[standings["TEAM_ABBREVIATION"] == team_abbreviation]
+    if team_standings.empty:
+        return None
+    return team_standings.iloc[0]
@@ -0,0 +1,81 @@
+"""Resumos exibidos nas páginas: totais e médias dos times e estatísticas dos jogadores.
+
+As funções recebem as tabelas já carregadas (de `utils.games` ou dos logs dos
+jogadores) e não fazem chamadas ao nba_api, então podem ser medidas fora do
+Streamlit (veja `benchmarks/`).
+"""
+import pandas as pd
+
+from utils.instrumentation import instrument
+from utils.teams import nba_teams
+
+
+@instrument()
+def calculate_team_totals(team_games):
+    """Vitórias e derrotas do time, no total, em casa e fora."""
+    if team_games.empty:
+        return {}
+
+    wins = team_games['WIN']
+    losses = team_games['WL'] == 'L'
+    home = team_games['IS_HOME']
+
+    totals = {
+        "Total Wins": wins.sum(),
+        "Total Home Wins": (wins & home).sum(),
+        "Total Away Wins": (wins & ~home).sum(),
+        "Total Losses": losses.sum(),
+        "Total Home Losses": (losses & home).sum(),
+        "Total Away Losses": (losses & ~home).sum(),
+    }
+    return totals
+
+
+@instrument()
+def calculate_team_stats(team_games):
+    """Médias por jogo, cestas de 3 e derrotas em casa/fora do time."""
+    if team_games.empty:
+        return {}
+
+    stats = {
+        "Points per Game": team_games['PTS'].mean(),
+        "Assists per Game": team_games['AST'].mean(),
+        "Rebounds per Game": team_games['REB'].mean(),
+        "3-Point Field Goals Made": team_games['FG3M'].sum(),
+        "Total Home Losses": ((team_games['WL'] == 'L') & team_games['IS_HOME']).sum(),
+        "Total Away Losses": ((team_games['WL'] == 'L') & ~team_games['IS_HOME']).sum()
+    }
+    return stats
+
+
+@instrument()
+def calculate_team_points_averages(games):
+    """Média de pontos marcados e sofridos de cada um dos 30 times na tabela da liga."""
+    # Uma única agregação sobre a tabela da liga, apenas para os 30 times da NBA
+    games = games[games['TEAM_ABBREVIATION'].isin(nba_teams.keys())]
+    team_averages = (
+        games.groupby('TEAM_ABBREVIATION', sort=False, observed=True)
+        .agg(**{"Avg Points Scored": ('PTS', 'mean'), "Avg Points Allowed": ('POINTS_ALLOWED', 'mean')})
+    )
+
+    # Manter a ordem e os nomes da lista de times
+    team_averages = team_averages.reindex([team for team in nba_teams if team in team_averages.index])
+    team_averages.insert(0, "Team", team_averages.index.map(nba_teams))
+    return team_averages.reset_index(drop=True)
+
+
+@instrument()
+def calculate_statistics(df):
+    """Média, mediana, moda e desvio padrão de pontos, rebotes e assistências do jogador."""
+    statistics = []
+    for column in ["Pontos", "Rebotes", "Assistências"]:
+        # Sem jogos na temporada (log vazio) não há moda
+        mode = df[column].mode()
+        statistics.append({
+            "Estatística": column,
+            "Média": round(df[column].mean(), 2),
+            "Mediana": round(df[column].median(), 2),
+            "Moda": int(mode.iloc[0]) if not mode.empty else None,
+            "Desvio Padrão": round(df[column].std(), 2)
+        })
+    return pd.DataFrame(statistics)
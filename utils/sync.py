@@ -0,0 +1,258 @@
+"""Sincronização incremental dos logs de jogos em um armazenamento local.
+
+Os jogos da liga (`LeagueGameFinder` por time e por jogador) e os logs dos
+jogadores (`PlayerGameLog`) são gravados em Parquet, particionados por temporada (e por
+jogador), em `NBA_STORE_DIR`. Cada partição guarda em `_sync.json` a maior
+`GAME_DATE`/`GAME_ID` já armazenada; as sincronizações seguintes pedem à API
+apenas os jogos a partir dessa data (`date_from_nullable`) e acrescentam só as
+linhas novas. Linhas já armazenadas que voltam com outros valores (jogos que
+estavam em andamento, sem `WL` e com pontos parciais) são substituídas.
+Temporadas encerradas são marcadas como completas e não são mais
+consultadas.
+
+`read_games` lê várias temporadas de uma vez abrindo apenas as partições
+pedidas e aplicando os filtros (time, jogador...) na leitura do Parquet, sem
+carregar as demais linhas na memória.
+"""
+import json
+import os
+import threading
+import time
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from utils.api import DATA_SOURCE, get_data_frames
+from utils.cache import CURRENT_SEASON_TTL, unique_tmp_path
+from utils.enrich import enrich_games
+from utils.fetch import fetch_all
+from utils.instrumentation import instrument, note
+from utils.seasons import is_past_season
+
+STORE_DIR = Path(os.environ.get("NBA_STORE_DIR", Path(__file__).resolve().parent.parent / ".cache" / "store")) / DATA_SOURCE
+
+# Acima dessa quantidade de arquivos, a partição é compactada em um único arquivo
+MAX_PARTS = 20
+
+DATASETS = {
+    "league_games": {
+        "endpoint": "leaguegamefinder",
+        "season_param": "season_nullable",
+        "key_columns": ["GAME_ID", "TEAM_ID"],
+        "game_id": "GAME_ID",
+        "date_format": "%Y-%m-%d",
+    },
+    # Todos os jogos de todos os jogadores da temporada, em uma única chamada
+    "league_player_games": {
+        "endpoint": "leaguegamefinder",
+        "season_param": "season_nullable",
+        "params": {"player_or_team_abbreviation": "P"},
+        "key_columns": ["GAME_ID", "PLAYER_ID"],
+        "game_id": "GAME_ID",
+        "date_format": "%Y-%m-%d",
+    },
+    "player_games": {
+        "endpoint": "playergamelog",
+        "season_param": "season",
+        "key_columns": ["Game_ID", "Player_ID"],
+        "game_id": "Game_ID",
+        "date_format": "%b %d, %Y",
+    },
+}
+
+_lock = threading.Lock()
+_partition_locks = {}
+
+
+def partition_dir(dataset, season, player_id=None):
+    """Diretório da partição de um conjunto de dados."""
+    path = STORE_DIR / dataset / f"season={season}"
+    if player_id is not None:
+        path = path / f"player_id={player_id}"
+    return path
+
+
+def _partition_lock(path):
+    with _lock:
+        return _partition_locks.setdefault(path, threading.Lock())
+
+
+def read_state(path):
+    """Estado da sincronização de uma partição (ou None se nunca sincronizada)."""
+    try:
+        with open(path / "_sync.json", encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_state(path, state):
+    # O lock da partição só vale no processo; o aquecimento pode gravar o mesmo estado ao mesmo tempo
+    tmp_path = unique_tmp_path(path / "_sync.json")
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump(state, file)
+    os.replace(tmp_path, path / "_sync.json")
+
+
+def read_partition(path):
+    """Lê todas as linhas armazenadas em uma partição."""
+    parts = sorted(path.glob("part-*.parquet"))
+    if not parts:
+        return pd.DataFrame()
+    return pd.concat([pd.read_parquet(part) for part in parts], ignore_index=True)
+
+
+def _rewrite(path, rows):
+    """Troca todos os arquivos da partição por um único arquivo com `rows`."""
+    parts = sorted(path.glob("part-*.parquet"))
+    rows.to_parquet(path / f"part-{time.time_ns()}.parquet", index=False)
+    for part in parts:
+        part.unlink()
+
+
+def _append(path, rows):
+    rows.to_parquet(path / f"part-{time.time_ns()}.parquet", index=False)
+
+    if len(list(path.glob("part-*.parquet"))) > MAX_PARTS:
+        _rewrite(path, read_partition(path))
+
+
+def _keys(rows, key_columns):
+    return pd.MultiIndex.from_frame(rows[key_columns].astype(str))
+
+
+def _same_values(old, new):
+    """Máscara das linhas (alinhadas) de `old` e `new` com os mesmos valores em todas as colunas."""
+    same = np.ones(len(new), dtype=bool)
+    for column in new.columns:
+        old_values, new_values = old[column], new[column]
+        if pd.api.types.is_numeric_dtype(old_values) and pd.api.types.is_numeric_dtype(new_values):
+            # Colunas inteiras lidas junto com partes que tinham valores ausentes voltam como float
+            old_values, new_values = old_values.astype(float), new_values.astype(float)
+        else:
+            old_values, new_values = old_values.astype(str), new_values.astype(str)
+        same &= ((old_values.to_numpy() == new_values.to_numpy()) | (old_values.isna() & new_values.isna()).to_numpy())
+    return same
+
+
+def _changed_rows(stored, fetched, key_columns):
+    """Linhas de `fetched` que ainda não estão em `stored` ou que voltaram com outros valores."""
+    if stored.empty or fetched.empty:
+        return fetched
+    positions = _keys(stored, key_columns).get_indexer(_keys(fetched, key_columns))
+    found = positions >= 0
+    columns = [column for column in fetched.columns if column in stored.columns]
+    changed = ~found
+    changed[found] = ~_same_values(
+        stored[columns].iloc[positions[found]].reset_index(drop=True),
+        fetched.loc[found, columns].reset_index(drop=True),
+    )
+    return fetched[changed]
+
+
+def sync(dataset, season, player_id=None):
+    """Sincroniza a partição e retorna `(todas as linhas, linhas novas ou atualizadas)`."""
+    config = DATASETS[dataset]
+    path = partition_dir(dataset, season, player_id)
+
+    with _partition_lock(path):
+        state = read_state(path)
+        stored = read_partition(path) if state is not None else pd.DataFrame()
+        if state is not None and state["complete"]:
+            note(hits=1)
+            return stored, stored.iloc[0:0]
+
+        params = {config["season_param"]: season, **config.get("params", {})}
+        if player_id is not None:
+            params["player_id"] = player_id
+        if state is not None and state["max_game_date"]:
+            # Pedir a partir da última data armazenada; jogos repetidos desse dia sem mudanças são descartados abaixo
+            last_date = pd.Timestamp(state["max_game_date"])
+            params["date_from_nullable"] = last_date.strftime("%m/%d/%Y")
+
+        fetched = get_data_frames(config["endpoint"], **params)[0]
+        new_rows = _changed_rows(stored, fetched, config["key_columns"])
+
+        path.mkdir(parents=True, exist_ok=True)
+        if stored.empty:
+            # Mesmo sem jogos, a primeira gravação guarda as colunas da tabela
+            _append(path, new_rows)
+            stored = new_rows.reset_index(drop=True)
+        elif not new_rows.empty:
+            replaced = _keys(stored, config["key_columns"]).isin(_keys(new_rows, config["key_columns"]))
+            stored = pd.concat([stored[~replaced], new_rows], ignore_index=True)
+            if replaced.any():
+                # As linhas antigas dos jogos atualizados saem da partição
+                _rewrite(path, stored)
+            else:
+                _append(path, new_rows)
+
+        max_game_date = None
+        max_game_id = None
+        if not stored.empty:
+            max_game_date = pd.to_datetime(stored["GAME_DATE"], format=config["date_format"]).max().strftime("%Y-%m-%d")
+            max_game_id = str(stored[config["game_id"]].max())
+        _write_state(path, {
+            "max_game_date": max_game_date,
+            "max_game_id": max_game_id,
+            "synced_at": time.time(),
+            "complete": is_past_season(season),
+        })
+        return stored, new_rows
+
+
+def ensure_synced(dataset, season, player_id=None):
+    """Sincroniza a partição se ela ainda não estiver atualizada, sem carregá-la na memória."""
+    state = read_state(partition_dir(dataset, season, player_id))
+    if state is not None and (state["complete"] or time.time() - state["synced_at"] < CURRENT_SEASON_TTL):
+        note(hits=1)
+        return
+    sync(dataset, season, player_id)
+
+
+@instrument()
+def read_games(dataset, seasons, player_ids=None, filters=None, columns=None):
+    """Lê do armazenamento as linhas das temporadas (e jogadores) pedidos.
+
+    As partições que faltam são sincronizadas em paralelo antes da leitura.
+    `filters` segue o formato do `pyarrow.parquet.read_table`, por exemplo
+    `[("TEAM_ABBREVIATION", "in", ["CHA"])]`.
+    """
+    partitions = [(season, player_id) for season in seasons for player_id in (player_ids or [None])]
+    fetch_all({partition: partial(ensure_synced, dataset, *partition) for partition in partitions})
+
+    frames = []
+    for season, player_id in partitions:
+        for part in sorted(partition_dir(dataset, season, player_id).glob("part-*.parquet")):
+            # Partições vazias guardam só as colunas, sem tipos confiáveis para filtrar
+            if pq.read_metadata(part).num_rows == 0:
+                continue
+            frame = pq.read_table(part, columns=columns, filters=filters).to_pandas()
+            frames.append(frame.assign(SEASON=season))
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(frames, ignore_index=True)
+
+
+def sync_league_games(season):
+    """Sincroniza os jogos da liga na temporada; retorna `(todos, novos)`."""
+    return sync("league_games", season)
+
+
+@instrument()
+def get_player_game_log(player_id, season):
+    """Retorna o log de jogos do jogador na temporada, sincronizando apenas os jogos novos.
+
+    O log já vem com as colunas `IS_HOME`, `OPPONENT` e `WIN` de `utils.enrich`.
+    """
+    games, _ = sync("player_games", season, player_id)
+    if games.empty:
+        return enrich_games(games, points_allowed=False) if "MATCHUP" in games else games
+
+    # Mesma ordem do PlayerGameLog: do jogo mais recente para o mais antigo
+    dates = pd.to_datetime(games["GAME_DATE"], format=DATASETS["player_games"]["date_format"])
+    games = games.iloc[dates.argsort(kind="stable")[::-1]].reset_index(drop=True)
+    return enrich_games(games, points_allowed=False)
@@ -0,0 +1,131 @@
+"""Tabela de jogos paginada, com filtros e ordenação feitos no servidor.
+
+O `st.dataframe` envia a tabela inteira para o navegador; com várias
+temporadas da liga isso são dezenas de milhares de linhas por rerun. Aqui a
+tabela é filtrada (por time, período, resultado e adversário), ordenada e
+cortada no servidor, e só a página visível é enviada. A memória do navegador
+e o tráfego pelo websocket ficam do tamanho de uma página, qualquer que seja
+a quantidade de temporadas carregadas.
+
+`filter_games` e `page_rows` não dependem do Streamlit; `show_paginated_table`
+desenha os controles e a página.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils.instrumentation import instrument
+
+PAGE_SIZES = [25, 50, 100]
+
+
+@instrument()
+def filter_games(games, date_column=None, date_range=None, **selections):
+    """Linhas de `games` no período `date_range` (início, fim) cujas colunas estão nos valores de `selections`.
+
+    `selections` é `{coluna: valores aceitos}`; colunas sem valores escolhidos
+    não filtram.
+    """
+    mask = np.ones(len(games), dtype=bool)
+    if date_column is not None and date_range:
+        dates = games[date_column]
+        start, end = date_range
+        if start is not None:
+            mask &= (dates >= pd.Timestamp(start)).to_numpy()
+        if end is not None:
+            # O fim é inclusivo: qualquer horário do último dia entra
+            mask &= (dates < pd.Timestamp(end) + pd.Timedelta(days=1)).to_numpy()
+    for column, values in selections.items():
+        if values:
+            mask &= games[column].isin(values).to_numpy()
+    return games if mask.all() else games[mask]
+
+
+def _sort_keys(values):
+    """Chaves numéricas para ordenar a coluna; categorias são ordenadas pelo texto, não pela ordem das categorias."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        categories = values.cat.categories
+        rank = np.argsort(np.argsort(categories.astype(str)))
+        codes = values.cat.codes.to_numpy()
+        # Valores ausentes (código -1) ficam no fim
+        return np.where(codes >= 0, rank[codes], len(categories))
+    return values.to_numpy()
+
+
+@instrument()
+def page_rows(games, sort_by=None, descending=False, page=1, page_size=PAGE_SIZES[0]):
+    """Página `page` (a partir de 1) da tabela ordenada por `sort_by`; retorna `(linhas, total de linhas, páginas)`.
+
+    Só as linhas da página são copiadas: a ordenação calcula as posições e a
+    página é tirada delas.
+    """
+    total = len(games)
+    pages = max(math.ceil(total / page_size), 1)
+    page = min(max(page, 1), pages)
+    if sort_by is None:
+        positions = np.arange(total)
+    else:
+        positions = pd.Series(_sort_keys(games[sort_by])).sort_values(
+            ascending=not descending, kind="stable", na_position="last",
+        ).index.to_numpy()
+    window = positions[(page - 1) * page_size:page * page_size]
+    return games.iloc[window], total, pages
+
+
+def _options(games, column):
+    values = games[column]
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # Só as categorias presentes na tabela
+        return sorted(str(value) for value in values.cat.remove_unused_categories().cat.categories)
+    return sorted(values.dropna().astype(str).unique())
+
+
+def show_paginated_table(games, key, filters=None, date_column=None, sort_by=None, descending=True, columns=None):
+    """Mostra `games` paginada, com filtros e ordenação feitos no servidor.
+
+    `filters` é `{coluna: rótulo}` das colunas filtradas por valores (time,
+    resultado, adversário); `date_column` habilita o filtro de período e é a
+    ordenação padrão. `columns` limita as colunas exibidas. `key` separa o
+    estado de tabelas diferentes da mesma página.
+    """
+    filters = filters or {}
+    sort_by = sort_by or date_column
+
+    with st.expander("🔎 Filtros", expanded=False):
+        selections = {
+            column: st.multiselect(label, _options(games, column), key=f"{key}_filter_{column}")
+            for column, label in filters.items()
+        }
+        date_range = None
+        if date_column is not None and not games.empty:
+            first, last = games[date_column].min().date(), games[date_column].max().date()
+            chosen = st.date_input("Período", value=(first, last), min_value=first, max_value=last, key=f"{key}_dates")
+            # Enquanto só a data inicial foi escolhida, o período fica aberto no fim
+            chosen = tuple(chosen) if isinstance(chosen, (list, tuple)) else (chosen,)
+            date_range = (chosen[0] if chosen else None, chosen[1] if len(chosen) > 1 else None)
+
+    filtered = filter_games(games, date_column=date_column, date_range=date_range, **selections)
+
+    visible_columns = list(columns or games.columns)
+    col1, col2, col3 = st.columns([2, 1, 1])
+    sort_by = col1.selectbox(
+        "Ordenar por", visible_columns,
+        index=visible_columns.index(sort_by) if sort_by in visible_columns else 0, key=f"{key}_sort",
+    )
+    descending = col2.toggle("Decrescente", value=descending, key=f"{key}_descending")
+    page_size = col3.selectbox("Linhas por página", PAGE_SIZES, key=f"{key}_page_size")
+
+    # Com menos linhas (filtros novos), a página guardada pode não existir mais
+    pages = max(math.ceil(len(filtered) / page_size), 1)
+    page_key = f"{key}_page"
+    if st.session_state.get(page_key, 1) > pages:
+        st.session_state[page_key] = pages
+    page = st.number_input("Página", min_value=1, max_value=pages, step=1, key=page_key)
+
+    rows, total, pages = page_rows(filtered, sort_by, descending, page, page_size)
+    st.dataframe(rows[visible_columns], use_container_width=True, hide_index=True)
+    first_row = (page - 1) * page_size + 1 if total else 0
+    st.caption(f"Linhas {first_row}–{first_row + len(rows) - 1 if total else 0} de {total} (página {page} de {pages})")
+    return filtered
@@ -0,0 +1,148 @@
+"""Aquecimento dos caches antes do primeiro acesso ao app.
+
+Percorre as dependências de dados das páginas (jogos da liga, logs dos
+jogadores, estatísticas de carreira, logs do Charlotte Hornets) e os
+modelos treinados a partir delas (regressões, GAMs, Gumbel e projeções em
+lote), preenchendo o cache de respostas, o armazenamento local e o registro
+de modelos em disco. Assim o primeiro visitante depois de um deploy encontra
+tudo pronto, como nos acessos seguintes.
+
+Uso:
+
+    python -m utils.warmup [--seasons 2023-24 2024-25] [--workers 4]
+
+Os dados são buscados primeiro (com no máximo `--workers` tarefas ao mesmo
+tempo, respeitando o limite de requisições de `utils.fetch`) e os modelos
+depois. Ao final é exibido o tempo de cada artefato.
+"""
+import argparse
+import logging
+import sys
+import time
+from functools import partial
+
+import pandas as pd
+from nba_api.stats.static import teams
+
+from utils import extremes, regression
+from utils.api import get_data_frames
+from utils.fetch import MAX_CONCURRENCY, fetch_all
+from utils.gam import fit_gam_bundles, load_player_stats, player_stat_series
+from utils.players import gamlss_players, hornets_players
+from utils.projections import fit_player_models, get_league_player_games
+from utils.seasons import DEFAULT_SEASONS
+from utils.snapshot import SnapshotUnavailable
+from utils.sync import ensure_synced
+
+HORNETS_ABBREVIATION = "CHA"
+
+
+def _timed(task):
+    """Executa a tarefa e retorna `(segundos, erro ou None)`."""
+    start = time.perf_counter()
+    try:
+        task()
+        error = None
+    except Exception as e:
+        error = e
+    return time.perf_counter() - start, error
+
+
+def _hornets_game_logs(seasons):
+    team_id = teams.find_team_by_abbreviation(HORNETS_ABBREVIATION)["id"]
+    return pd.concat([get_data_frames("teamgamelog", team_id=team_id, season=season)[0] for season in seasons])
+
+
+def data_artifacts(seasons):
+    """Tarefas que preenchem o cache de respostas e o armazenamento local."""
+    team_id = teams.find_team_by_abbreviation(HORNETS_ABBREVIATION)["id"]
+    # Os logs servem às regressões (elenco) e aos GAMs; carreira e informações só aparecem para o elenco
+    player_ids = sorted(set(hornets_players.values()) | set(gamlss_players.values()))
+    artifacts = {}
+    for season in seasons:
+        artifacts[f"jogos da liga {season}"] = partial(ensure_synced, "league_games", season)
+        artifacts[f"jogos dos jogadores da liga {season}"] = partial(ensure_synced, "league_player_games", season)
+        artifacts[f"teamgamelog {HORNETS_ABBREVIATION} {season}"] = partial(get_data_frames, "teamgamelog", team_id=team_id, season=season)
+        for player_id in player_ids:
+            artifacts[f"log do jogador {player_id} {season}"] = partial(ensure_synced, "player_games", season, player_id)
+    for player_id in sorted(hornets_players.values()):
+        artifacts[f"carreira do jogador {player_id}"] = partial(get_data_frames, "playercareerstats", player_id=player_id)
+        artifacts[f"informações do jogador {player_id}"] = partial(get_data_frames, "commonplayerinfo", player_id=player_id)
+    return artifacts
+
+
+def _regressions(player_name, player_id, seasons):
+    player_df, _ = regression.load_player_data(player_id, seasons)
+    if player_df.empty:
+        raise LookupError(f"Nenhum dado para {player_name}")
+    regression.get_linear_fit(player_name, seasons, player_df)
+    regression.get_logistic_fits(player_name, seasons, player_df)
+
+
+def _gams(seasons):
+    data, _ = load_player_stats(gamlss_players, seasons)
+    # Fora do servidor do Streamlit, os GAMs podem ser ajustados em processos
+    fit_gam_bundles(player_stat_series(data), processes=True)
+
+
+def _hornets_gumbel(seasons):
+    game_logs = _hornets_game_logs(seasons)
+    for stat in extremes.STATS:
+        extremes.get_gumbel_fit(HORNETS_ABBREVIATION, stat, seasons, game_logs[stat].to_numpy())
+
+
+def _projections(seasons):
+    fit_player_models(get_league_player_games(seasons))
+
+
+def model_artifacts(seasons):
+    """Tarefas que treinam os modelos das páginas e os gravam no registro."""
+    artifacts = {
+        f"regressões de {player_name}": partial(_regressions, player_name, player_id, seasons)
+        for player_name, player_id in hornets_players.items()
+    }
+    artifacts["GAMs (GAMLSS)"] = partial(_gams, seasons)
+    artifacts[f"Gumbel {HORNETS_ABBREVIATION}"] = partial(_hornets_gumbel, seasons)
+    artifacts["Gumbel de todos os times"] = partial(extremes.fit_league, seasons, processes=True)
+    artifacts["projeções em lote"] = partial(_projections, seasons)
+    return artifacts
+
+
+def run(artifacts, max_workers):
+    """Executa as tarefas em paralelo; retorna `{nome: (segundos, erro ou None)}`."""
+    return fetch_all({name: partial(_timed, task) for name, task in artifacts.items()}, max_workers=max_workers)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Preenche os caches de dados e de modelos do app.")
+    parser.add_argument("--seasons", nargs="+", default=list(DEFAULT_SEASONS), help="temporadas a aquecer (ex.: 2023-24)")
+    parser.add_argument("--workers", type=int, default=MAX_CONCURRENCY, help="tarefas executadas ao mesmo tempo")
+    parser.add_argument("--skip-models", action="store_true", help="aquece só os dados, sem treinar os modelos")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    start = time.perf_counter()
+    results = run(data_artifacts(args.seasons), args.workers)
+    if not args.skip_models:
+        # Os modelos são treinados depois, com os dados já em cache
+        results.update(run(model_artifacts(args.seasons), args.workers))
+
+    width = max(len(name) for name in results)
+    failures = skipped = 0
+    for name, (seconds, error) in sorted(results.items(), key=lambda item: item[1][0], reverse=True):
+        if error is None:
+            status = "ok"
+        elif isinstance(error, SnapshotUnavailable):
+            # Sem rede, os dados que os CSVs não cobrem não têm o que aquecer (as páginas avisam)
+            status = f"ignorado: {error}"
+            skipped += 1
+        else:
+            status = f"erro: {error}"
+            failures += 1
+        print(f"{name:<{width}}  {seconds:8.2f}s  {status}")
+    print(f"{len(results)} artefatos em {time.perf_counter() - start:.2f}s ({failures} com erro, {skipped} ignorados)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())